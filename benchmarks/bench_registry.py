@@ -0,0 +1,67 @@
+# ruff: noqa: INP001, Benchmarks are standalone scripts
+# ruff: noqa: T201, Results are printed
+"""Benchmark memory use and subset selection time of a 10k-device registry.
+
+Selection through the tag index is compared with scanning a list of records.
+Run with `python benchmarks/bench_registry.py`.
+"""
+
+from __future__ import annotations
+
+import time
+import tracemalloc
+from typing import Callable
+
+from aiopixooapi.registry import DeviceRegistry
+
+DEVICES = 10_000
+ROUNDS = 1000
+QUERIES = (
+    {"model": "pixoo64"},
+    {"location": "site-3"},
+    {"location": "site-3", "floor": "7"},
+    {"location": "site-3", "floor": "7", "group": "group-2"},
+)
+
+
+def _build() -> DeviceRegistry:
+    """Return a registry of devices spread over sites, floors, groups and models."""
+    registry = DeviceRegistry()
+    for i in range(DEVICES):
+        registry.add(
+            f"10.{i // 65536}.{i // 256 % 256}.{i % 256}",
+            location=f"site-{i % 10}",
+            floor=i // 10 % 20,
+            group=f"group-{i % 7}",
+            model="pixoo64" if i % 4 else "pixoo16",
+        )
+    return registry
+
+
+def _time(func: Callable[[], object]) -> float:
+    """Return the time per call in microseconds."""
+    started = time.perf_counter()
+    for _ in range(ROUNDS):
+        func()
+    return (time.perf_counter() - started) / ROUNDS * 1e6
+
+
+def _main() -> None:
+    tracemalloc.start()
+    registry = _build()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{DEVICES} devices: {size / 1024 / 1024:.2f} MiB, {size / DEVICES:.0f} bytes per device\n")
+
+    records = list(registry)
+    print(f"{'query':<56}{'hosts':>7}{'index us':>11}{'scan us':>11}")
+    for query in QUERIES:
+        wanted = {(key, str(value)) for key, value in query.items()}
+        hosts = registry.select(**query)
+        indexed = _time(lambda query=query: registry.select(**query))
+        scanned = _time(lambda wanted=wanted: [r.host for r in records if wanted.issubset(r.tags)])
+        print(f"{query!s:<56}{len(hosts):>7}{indexed:>11.1f}{scanned:>11.1f}")
+
+
+if __name__ == "__main__":
+    _main()
@@ -0,0 +1,86 @@
+# ruff: noqa: INP001, Benchmarks are standalone scripts
+# ruff: noqa: T201, Results are printed
+"""Benchmark query time of the catalog search index against a linear scan.
+
+Run with `python benchmarks/bench_search.py`.
+"""
+
+from __future__ import annotations
+
+import random
+import time
+from typing import Callable
+
+from aiopixooapi.search import CatalogIndex, tokenize
+
+ENTRIES = 50_000
+ROUNDS = 200
+STEMS = ("clock", "weather", "game", "cat", "stock", "pixel", "retro", "neon", "anime", "space", "music", "sport")
+SUFFIXES = ("", "s", "er", "ing", "y", "ish", "ware", "time")
+QUERIES = (
+    {"query": "neon", "prefix": False},
+    {"query": "weather clo"},
+    {"query": "retro pixel"},
+    {"query": "space12", "dial_type": "Game"},
+    {"query": "clock", "limit": 20},
+    {"query": "weather clo", "limit": 20},
+    {"query": "c", "limit": 20},
+)
+
+
+def _time(func: Callable[[], object]) -> float:
+    """Return the time per call in microseconds."""
+    started = time.perf_counter()
+    for _ in range(ROUNDS):
+        func()
+    return (time.perf_counter() - started) / ROUNDS * 1e6
+
+
+def _main() -> None:
+    generator = random.Random(1)  # noqa: S311, Benchmark data
+    # A few common words and a long tail of rarer ones, as in real dial names
+    words = [f"{stem}{suffix}" for stem in STEMS for suffix in SUFFIXES]
+    words += [f"{generator.choice(STEMS)}{n}" for n in range(5000)]
+    weights = [1 / (rank + 1) for rank in range(len(words))]
+    dials = [
+        (
+            {"ClockId": i, "Name": " ".join(generator.choices(words, weights, k=3))},
+            generator.choice(("Social", "Game", "Financial", "Holiday")),
+        )
+        for i in range(ENTRIES)
+    ]
+    index = CatalogIndex()
+    started = time.perf_counter()
+    for dial, dial_type in dials:
+        index.add_dial(dial_type, dial)
+    print(f"Indexed {ENTRIES} dials in {time.perf_counter() - started:.2f} s\n")
+
+    print(f"{'query':<48}{'hits':>7}{'index us':>11}{'scan us':>11}")
+    for query in QUERIES:
+        words = tokenize(query["query"])
+        hits = index.search(**query)
+
+        def scan(words: list[str] = words, dial_type: str | None = query.get("dial_type")) -> list:
+            result = []
+            for dial, kind in dials:
+                tokens = tokenize(dial["Name"])
+                if (dial_type is None or kind == dial_type) and all(
+                    word in tokens for word in words[:-1]
+                ) and any(token.startswith(words[-1]) for token in tokens):
+                    result.append(dial)
+            return result
+
+        indexed = _time(lambda query=query: index.search(**query))
+        scanned = _time_once(scan)
+        print(f"{query!s:<48}{len(hits):>7}{indexed:>11.1f}{scanned:>11.1f}")
+
+
+def _time_once(func: Callable[[], object]) -> float:
+    """Return the time of a single call in microseconds, for slow baselines."""
+    started = time.perf_counter()
+    func()
+    return (time.perf_counter() - started) * 1e6
+
+
+if __name__ == "__main__":
+    _main()
@@ -0,0 +1,68 @@
+# ruff: noqa: INP001, Benchmarks are standalone scripts
+# ruff: noqa: T201, Results are printed
+"""Benchmark frame broadcast throughput of a sharded fleet by number of worker processes.
+
+Stand-in device servers run in separate processes and answer on every loopback address, so each
+simulated device has its own host. Run with `python benchmarks/bench_sharding.py`.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import base64
+import multiprocessing
+import os
+import time
+
+from aiohttp import web
+
+from aiopixooapi.commands import FrameCommand
+from aiopixooapi.sharding import ShardedFleet
+
+DEVICES = 1000
+ROUNDS = 5
+SERVERS = 4
+PORT = 18081
+HOSTS = [f"127.0.{i // 250}.{i % 250 + 1}" for i in range(DEVICES)]
+
+
+def _serve(port: int) -> None:
+    """Run a device stand-in answering every command with success."""
+
+    async def post(request: web.Request) -> web.Response:
+        await request.read()
+        return web.json_response({"error_code": 0})
+
+    app = web.Application(client_max_size=1024 * 1024)
+    app.router.add_post("/post", post)
+    web.run_app(app, host="0.0.0.0", port=port, reuse_port=True, print=None, access_log=None)  # noqa: S104
+
+
+async def _measure(workers: int) -> float:
+    """Return the frames delivered per second with the given number of workers."""
+    frame = FrameCommand(1, 64, 0, 1, 100, pic_data=base64.b64encode(os.urandom(64 * 64 * 3)).decode())
+    async with ShardedFleet(HOSTS, workers=workers, port=PORT, concurrency=256) as fleet:
+        await fleet.gather("get_all_settings")  # Open the connections
+        started = time.perf_counter()
+        delivered = 0
+        for _ in range(ROUNDS):
+            delivered += sum([result.ok async for result in fleet.broadcast_command(frame)])
+        return delivered / (time.perf_counter() - started)
+
+
+async def _main() -> None:
+    print(f"{'workers':<10}{'frames/s':>12}")
+    for workers in sorted({1, 2, 4, os.cpu_count() or 1}):
+        print(f"{workers:<10}{await _measure(workers):>12.0f}")
+
+
+if __name__ == "__main__":
+    servers = [multiprocessing.Process(target=_serve, args=(PORT,), daemon=True) for _ in range(SERVERS)]
+    for server in servers:
+        server.start()
+    time.sleep(1)
+    try:
+        asyncio.run(_main())
+    finally:
+        for server in servers:
+            server.terminate()
@@ -0,0 +1,69 @@
+# ruff: noqa: INP001, Benchmarks are standalone scripts
+# ruff: noqa: T201, Results are printed
+"""Benchmark the per-request CPU overhead of the transports.
+
+A stand-in device server runs in a separate process so that only the client side is measured.
+Run with `python benchmarks/bench_transport.py`.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import base64
+import multiprocessing
+import os
+import time
+
+from aiohttp import web
+
+from aiopixooapi.pixoo64 import Pixoo64
+from aiopixooapi.transport import AiohttpTransport, StreamTransport, Transport
+
+REQUESTS = 2000
+FRAME = base64.b64encode(os.urandom(64 * 64 * 3)).decode()
+
+
+def _serve(port: int) -> None:
+    """Run a device stand-in answering every command with success."""
+
+    async def post(request: web.Request) -> web.Response:
+        await request.read()
+        return web.json_response({"error_code": 0})
+
+    app = web.Application()
+    app.router.add_post("/post", post)
+    web.run_app(app, host="127.0.0.1", port=port, print=None, access_log=None)
+
+
+async def _measure(transport: Transport, port: int, *, frame: bool) -> tuple[float, float]:
+    """Return the wall-clock and CPU time per request in microseconds."""
+    async with Pixoo64("127.0.0.1", port, transport=transport) as pixoo:
+        await pixoo.set_brightness(50)  # Open the connection
+        wall, cpu = time.perf_counter(), time.process_time()
+        for _ in range(REQUESTS):
+            if frame:
+                await pixoo.send_animation_frame(1, 64, 0, 1, 100, FRAME)
+            else:
+                await pixoo.set_brightness(50)
+        wall, cpu = time.perf_counter() - wall, time.process_time() - cpu
+    await transport.close()
+    return wall / REQUESTS * 1e6, cpu / REQUESTS * 1e6
+
+
+async def _main(port: int) -> None:
+    print(f"{'transport':<18}{'command':<16}{'wall us/req':>14}{'cpu us/req':>14}")
+    for name, factory in (("AiohttpTransport", AiohttpTransport), ("StreamTransport", StreamTransport)):
+        for command, frame in (("set_brightness", False), ("SendHttpGif", True)):
+            wall, cpu = await _measure(factory(), port, frame=frame)
+            print(f"{name:<18}{command:<16}{wall:>14.1f}{cpu:>14.1f}")
+
+
+if __name__ == "__main__":
+    PORT = 18080
+    server = multiprocessing.Process(target=_serve, args=(PORT,), daemon=True)
+    server.start()
+    time.sleep(1)
+    try:
+        asyncio.run(_main(PORT))
+    finally:
+        server.terminate()
@@ -4,6 +4,16 @@ __version__ = "0.1.0"
 
 from .divoom import Divoom
 from .exceptions import PixooCommandError, PixooConnectionError, PixooError
+from .fleet import PixooFleet
 from .pixoo64 import Pixoo64
+from .registry import DeviceRegistry
 
-__all__ = ["Divoom", "Pixoo64", "PixooCommandError", "PixooConnectionError", "PixooError"]
+__all__ = [
+    "DeviceRegistry",
+    "Divoom",
+    "Pixoo64",
+    "PixooCommandError",
+    "PixooConnectionError",
+    "PixooError",
+    "PixooFleet",
+]
@@ -0,0 +1,349 @@
+"""Asset pipeline for files referenced by the Divoom online API.
+
+`AssetCache` stores files on disk under the SHA-256 digest of their content, so a file referenced by
+several gallery items is stored once, and evicts the least recently used files once the cache grows
+beyond its size limit. `AssetPipeline` fetches files over the transport of a `Divoom` client with
+bounded concurrency, serves cached files without fetching them again, and decodes images into
+`FrameCommand` animations for `Pixoo64`.
+
+Decoding requires Pillow (`pip install aiopixooapi[images]`) and handles standard image formats such
+as GIF and PNG.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import base64
+import hashlib
+import io
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import aiohttp
+
+from .commands import MAX_PIC_NUM, FrameCommand
+from .exceptions import PixooConnectionError, PixooError
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+    from .divoom import Divoom
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_FILE_URL = "https://f.divoom-gz.com/{}"
+DEFAULT_MAX_SIZE = 256 * 1024 * 1024  # Bytes kept on disk before the least recently used files are evicted
+DEFAULT_ASSET_CONCURRENCY = 8
+DEFAULT_FRAME_SPEED = 100  # Milliseconds per frame when the image does not specify a duration
+HTTP_OK = 200
+HTTP_MULTIPLE_CHOICES = 300
+
+
+class AssetCache:
+    """Content-addressed on-disk cache of files, with least-recently-used eviction by total size.
+
+    Files are stored as `objects/<digest>` and each reference (a FileId or URL) as a small file under
+    `refs/` naming the digest of its content. Access times are kept in the modification time of the
+    objects, so the eviction order survives restarts. The methods are blocking and thread-safe, so
+    they can be run in an executor.
+    """
+
+    def __init__(self, directory: str | os.PathLike[str], max_size: int = DEFAULT_MAX_SIZE) -> None:
+        """Initialize the cache, creating the directory if needed.
+
+        Args:
+            directory: Directory to store the files in.
+            max_size: Maximum total size of the stored files in bytes (default: 256 MiB).
+
+        """
+        self.directory = Path(directory)
+        self.max_size = max_size
+        self._objects = self.directory / "objects"
+        self._refs = self.directory / "refs"
+        self._objects.mkdir(parents=True, exist_ok=True)
+        self._refs.mkdir(parents=True, exist_ok=True)
+        # Digest -> (last access, size), loaded once so eviction does not walk the directory
+        self._index: dict[str, tuple[float, int]] = {}
+        for path in self._objects.iterdir():
+            if path.suffix != ".tmp":
+                stat = path.stat()
+                self._index[path.name] = (stat.st_mtime, stat.st_size)
+        self._size = sum(size for _, size in self._index.values())
+        self._lock = threading.Lock()
+
+    @property
+    def size(self) -> int:
+        """Return the total size of the stored files in bytes."""
+        return self._size
+
+    def __len__(self) -> int:
+        """Return the number of stored files."""
+        return len(self._index)
+
+    def _ref_path(self, ref: str) -> Path:
+        """Return the path of the file recording the digest of a reference."""
+        return self._refs / hashlib.sha256(ref.encode()).hexdigest()
+
+    def path(self, ref: str) -> Path | None:
+        """Return the stored file of a reference, or None if it is not cached.
+
+        Args:
+            ref: FileId or URL the file was stored under.
+
+        Returns:
+            Path of the file, which is marked as recently used.
+
+        """
+        try:
+            digest = self._ref_path(ref).read_text()
+        except FileNotFoundError:
+            return None
+        with self._lock:
+            if digest not in self._index:
+                return None
+            path = self._objects / digest
+            now = time.time()
+            try:
+                os.utime(path, (now, now))
+            except FileNotFoundError:
+                self._forget(digest)
+                return None
+            self._index[digest] = (now, self._index[digest][1])
+        return path
+
+    def get(self, ref: str) -> bytes | None:
+        """Return the content of a reference, or None if it is not cached."""
+        path = self.path(ref)
+        if path is None:
+            return None
+        try:
+            return path.read_bytes()
+        except FileNotFoundError:  # Evicted by another thread in the meantime
+            return None
+
+    def put(self, ref: str, data: bytes) -> Path:
+        """Store the content of a reference, evicting the least recently used files if needed.
+
+        Args:
+            ref: FileId or URL to store the file under.
+            data: Content of the file.
+
+        Returns:
+            Path of the stored file.
+
+        """
+        digest = hashlib.sha256(data).hexdigest()
+        path = self._objects / digest
+        with self._lock:
+            if digest not in self._index:
+                self._write(path, data)
+                self._size += len(data)
+            self._index[digest] = (time.time(), len(data))
+            self._write(self._ref_path(ref), digest.encode())
+            self._evict(keep=digest)
+        return path
+
+    @staticmethod
+    def _write(path: Path, data: bytes) -> None:
+        """Write a file atomically, so readers never see a partial file."""
+        temporary = path.with_suffix(".tmp")
+        temporary.write_bytes(data)
+        temporary.replace(path)
+
+    def _forget(self, digest: str) -> None:
+        """Drop a file from the index."""
+        _, size = self._index.pop(digest)
+        self._size -= size
+
+    def _evict(self, keep: str) -> None:
+        """Remove the least recently used files until the cache fits its maximum size."""
+        if self._size <= self.max_size:
+            return
+        for digest, _ in sorted(self._index.items(), key=lambda item: item[1][0]):
+            if self._size <= self.max_size:
+                break
+            if digest == keep:
+                continue
+            self._forget(digest)
+            (self._objects / digest).unlink(missing_ok=True)
+            logger.debug("Evicted %s from the asset cache", digest)
+        # References to evicted files are dropped lazily, when `path` finds their object missing
+
+    def clear(self) -> None:
+        """Remove every stored file and reference."""
+        with self._lock:
+            for directory in (self._objects, self._refs):
+                for path in directory.iterdir():
+                    path.unlink(missing_ok=True)
+            self._index.clear()
+            self._size = 0
+
+
+class AssetPipeline:
+    """Fetches, caches and decodes the files referenced by the Divoom online API.
+
+    Files are fetched over the transport of the Divoom client, with at most `concurrency` requests at
+    once. A file is fetched at most once: cached files are read from disk, and concurrent requests
+    for the same file wait for a single download. Only successful (2xx) responses are cached, and
+    the cache is read and written in the default executor, off the event loop.
+    """
+
+    def __init__(
+            self,
+            divoom: Divoom,
+            cache: AssetCache,
+            *,
+            concurrency: int = DEFAULT_ASSET_CONCURRENCY,
+            file_url: str = DEFAULT_FILE_URL,
+            timeout: float = 30,
+    ) -> None:
+        """Initialize the pipeline.
+
+        Args:
+            divoom: Client whose transport the files are fetched with.
+            cache: Cache to store the files in.
+            concurrency: Maximum number of files fetched at once (default: 8).
+            file_url: URL template of a file, formatted with its FileId (default: the Divoom file server).
+            timeout: Request timeout in seconds (default: 30).
+
+        """
+        self.divoom = divoom
+        self.cache = cache
+        self.concurrency = concurrency
+        self.file_url = file_url
+        self.timeout = aiohttp.ClientTimeout(total=timeout)
+        self._semaphore: asyncio.Semaphore | None = None
+        self._downloads: dict[str, asyncio.Future[bytes]] = {}
+
+    def url_for(self, ref: str) -> str:
+        """Return the URL of a reference: URLs are used as-is, FileIds are formatted into `file_url`."""
+        return ref if "://" in ref else self.file_url.format(ref)
+
+    async def fetch(self, ref: str) -> bytes:
+        """Return the content of a file, from the cache or fetched and cached.
+
+        Args:
+            ref: FileId or URL of the file.
+
+        Returns:
+            The content of the file.
+
+        Raises:
+            PixooConnectionError: If the file cannot be fetched.
+
+        """
+        download = self._downloads.get(ref)
+        if download is None:
+            download = asyncio.ensure_future(self._load(ref))
+            self._downloads[ref] = download
+            download.add_done_callback(lambda _: self._downloads.pop(ref, None))
+        return await asyncio.shield(download)
+
+    async def _load(self, ref: str) -> bytes:
+        """Read a file from the cache, or fetch it within the concurrency limit and store it in the cache."""
+        loop = asyncio.get_running_loop()
+        data = await loop.run_in_executor(None, self.cache.get, ref)
+        if data is not None:
+            return data
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.concurrency)
+        async with self._semaphore:
+            if self.divoom.transport is None:
+                await self.divoom.connect()
+            url = self.url_for(ref)
+            try:
+                response = await self.divoom.transport.get(url, timeout=self.timeout)
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                msg = f"Failed to fetch {url}: {e}"
+                raise PixooConnectionError(msg) from e
+        # Transports that do not follow redirects return the 3xx response itself, which is not the file
+        if not HTTP_OK <= response.status < HTTP_MULTIPLE_CHOICES:
+            msg = f"Failed to fetch {url}: HTTP {response.status}"
+            raise PixooConnectionError(msg)
+        await loop.run_in_executor(None, self.cache.put, ref, response.body)
+        return response.body
+
+    async def fetch_many(self, refs: Iterable[str]) -> dict[str, bytes | PixooError]:
+        """Fetch several files concurrently, within the concurrency limit.
+
+        Args:
+            refs: FileIds or URLs of the files.
+
+        Returns:
+            The content of each file, or the error raised while fetching it.
+
+        """
+        unique = list(dict.fromkeys(refs))
+        results = await asyncio.gather(*(self.fetch(ref) for ref in unique), return_exceptions=True)
+        for result in results:
+            if isinstance(result, BaseException) and not isinstance(result, PixooError):
+                raise result
+        return dict(zip(unique, results))
+
+    async def frames(self, ref: str, pic_id: int = 1, size: int = 64) -> list[FrameCommand]:
+        """Return a file decoded into the frames of an animation for `Pixoo64.send_command`.
+
+        Args:
+            ref: FileId or URL of an image file.
+            pic_id: Animation ID of the frames (default: 1); they can be resent under another ID
+                with `pic_id` of `Pixoo64.send_command`.
+            size: Width and height of the frames in pixels: 16, 32 or 64 (default: 64).
+
+        Returns:
+            The frames, at most 58, ordered by PicOffset.
+
+        Raises:
+            ImportError: If Pillow is not installed.
+            PixooConnectionError: If the file cannot be fetched.
+            PixooError: If the file is not an image Pillow can decode.
+
+        """
+        data = await self.fetch(ref)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, decode_frames, data, pic_id, size)
+
+
+def decode_frames(data: bytes, pic_id: int = 1, size: int = 64) -> list[FrameCommand]:
+    """Decode an image into the frames of an animation.
+
+    Args:
+        data: Content of an image file, e.g. a GIF or PNG.
+        pic_id: Animation ID of the frames (default: 1).
+        size: Width and height of the frames in pixels: 16, 32 or 64 (default: 64).
+
+    Returns:
+        The frames, at most 58, ordered by PicOffset. Frames beyond the limit of the device are dropped.
+
+    Raises:
+        ImportError: If Pillow is not installed.
+        PixooError: If the data is not an image Pillow can decode.
+
+    """
+    try:
+        from PIL import Image, ImageSequence, UnidentifiedImageError  # noqa: PLC0415
+    except ImportError as e:
+        msg = "Decoding images requires Pillow: pip install aiopixooapi[images]"
+        raise ImportError(msg) from e
+
+    try:
+        image = Image.open(io.BytesIO(data))
+        images = []
+        for frame in ImageSequence.Iterator(image):
+            if len(images) == MAX_PIC_NUM - 1:
+                break
+            pixels = frame.convert("RGB").resize((size, size), Image.Resampling.NEAREST).tobytes()
+            images.append((pixels, frame.info.get("duration") or DEFAULT_FRAME_SPEED))
+    except (UnidentifiedImageError, OSError) as e:
+        msg = f"Failed to decode image: {e}"
+        raise PixooError(msg) from e
+
+    # The device plays every frame of an animation at the same speed
+    speed = int(images[0][1])
+    return [
+        FrameCommand(len(images), size, offset, pic_id, speed, pic_data=base64.b64encode(pixels).decode())
+        for offset, (pixels, _) in enumerate(images)
+    ]
@@ -5,37 +5,110 @@ from __future__ import annotations
 import asyncio
 import json
 import logging
-from typing import TYPE_CHECKING, Any
+import time
+from typing import TYPE_CHECKING, Any, ClassVar
 
 if TYPE_CHECKING:
     import types
+    from collections.abc import AsyncIterator, Mapping
+
+    from .transport import TransportResponse
 
 import aiohttp
 from typing_extensions import Self
 
-from .exceptions import PixooCommandError, PixooConnectionError
+from .exceptions import PixooCommandError, PixooConnectionError, PixooError
+from .jsonstream import ArrayItemParser
+from .latency import RttEstimator
+from .transport import AiohttpTransport, StaleConnectionError, Transport
 
 logger = logging.getLogger(__name__)
 
+ADAPTIVE_MIN_SAMPLES = 3  # Samples required before a command uses an adaptive timeout
+
 
 class BasePixoo:
     """Base class for handling common Pixoo API functionality.
 
     This class provides methods for connecting to the Pixoo API, making requests,
-    and managing the aiohttp session.
+    and managing the transport (an aiohttp session by default).
     """
 
-    def __init__(self, base_url: str, timeout: int = 10) -> None:
+    # Commands or endpoints that can be sent twice with the same effect as once
+    idempotent_commands: ClassVar[frozenset[str]] = frozenset()
+
+    def __init__(  # noqa: PLR0913
+            self,
+            base_url: str,
+            timeout: float | aiohttp.ClientTimeout = 10,
+            *,
+            timeouts: Mapping[str, aiohttp.ClientTimeout] | None = None,
+            adaptive_timeout: bool = False,
+            min_timeout: float = 0.5,
+            idle_timeout: float | None = None,
+            warm_up_connections: int = 0,
+            retry_on_disconnect: bool = True,
+            transport: Transport | None = None,
+    ) -> None:
         """Initialize the base Pixoo API class.
 
         Args:
             base_url: Base URL for API requests.
-            timeout: Request timeout in seconds (default: 10).
+            timeout: Default request timeout, in seconds or as an aiohttp.ClientTimeout (default: 10).
+            timeouts: Timeout profiles per command or endpoint, overriding the default timeout.
+            adaptive_timeout: Derive the timeout of commands without a profile from their measured
+                round-trip times, bounded by min_timeout and the default timeout (default: False).
+            min_timeout: Lower bound for adaptive timeouts in seconds (default: 0.5).
+            idle_timeout: Discard pooled connections that have been idle for longer than this many
+                seconds instead of reusing them (default: None, aiohttp's keep-alive timeout).
+            warm_up_connections: Number of connections to open with concurrent pings on connect (default: 0).
+            retry_on_disconnect: Retry a request once when the server closed the connection before
+                responding, as happens with keep-alive connections dropped while idle. Only requests
+                the transport reports as never sent, or `idempotent_commands`, are retried (default: True).
+            transport: Transport to send requests with, which may be shared with other clients and is
+                not closed by `close` (default: a dedicated AiohttpTransport using idle_timeout).
 
         """
         self.base_url = base_url
         self.timeout = timeout
-        self._session: aiohttp.ClientSession | None = None
+        self.timeouts = dict(timeouts or {})
+        self.adaptive_timeout = adaptive_timeout
+        self.min_timeout = min_timeout
+        self.idle_timeout = idle_timeout
+        self.warm_up_connections = warm_up_connections
+        self.retry_on_disconnect = retry_on_disconnect
+        self._default_timeout = (
+            timeout if isinstance(timeout, aiohttp.ClientTimeout) else aiohttp.ClientTimeout(total=timeout)
+        )
+        self._rtt: dict[str, RttEstimator] = {}
+        self._transport = transport
+        self._owns_transport = transport is None
+
+    @property
+    def rtt_estimators(self) -> dict[str, RttEstimator]:
+        """Return the round-trip time estimators, keyed by command or endpoint."""
+        return self._rtt
+
+    def _timeout_for(self, key: str) -> aiohttp.ClientTimeout:
+        """Return the timeout to use for a command or endpoint.
+
+        Args:
+            key: The command or endpoint.
+
+        Returns:
+            The configured profile, the adaptive timeout, or the default timeout.
+
+        """
+        profile = self.timeouts.get(key)
+        if profile is not None:
+            return profile
+        if self.adaptive_timeout:
+            estimator = self._rtt.get(key)
+            if estimator is not None and estimator.samples >= ADAPTIVE_MIN_SAMPLES:
+                upper = self._default_timeout.total or estimator.rto
+                total = min(max(estimator.rto, self.min_timeout), upper)
+                return aiohttp.ClientTimeout(total=total)
+        return self._default_timeout
 
     async def __aenter__(self) -> Self:
         """Async context manager entry."""
@@ -51,61 +124,240 @@ class BasePixoo:
         """Async context manager exit."""
         await self.close()
 
-    async def connect(self) -> None:
-        """Create aiohttp session."""
-        if self._session is None:
-            self._session = aiohttp.ClientSession(
-                headers={"Content-Type": "application/json"},
-                raise_for_status=True,
-            )
-            logger.debug("Created new aiohttp session")
+    @property
+    def transport(self) -> Transport | None:
+        """Return the transport, or None before the client is connected."""
+        return self._transport
+
+    async def connect(self, warm_up_connections: int | None = None) -> None:
+        """Start the transport.
+
+        Args:
+            warm_up_connections: Number of connections to open with concurrent pings, so the first
+                requests do not pay connection setup (default: the value given on construction).
+
+        """
+        if self._transport is None:
+            self._transport = AiohttpTransport(idle_timeout=self.idle_timeout)
+        await self._transport.start()
+
+        if warm_up_connections is None:
+            warm_up_connections = self.warm_up_connections
+        if warm_up_connections > 0:
+            await self._warm_up(warm_up_connections)
+
+    async def _warm_up(self, connections: int) -> None:
+        """Open connections ahead of use by sending concurrent pings; failures are only logged."""
+        results = await asyncio.gather(*(self.ping() for _ in range(connections)), return_exceptions=True)
+        for result in results:
+            if isinstance(result, PixooError):
+                logger.warning("Failed to warm up connection to %s: %s", self.base_url, result)
+            elif isinstance(result, BaseException):
+                raise result
+
+    async def ping(self) -> dict[str, Any]:
+        """Make a lightweight request to the API, also used to warm up connections.
+
+        By default a GET request is sent to the base URL, which opens a connection whatever the API
+        answers. Subclasses override this with a cheap API call.
 
-    async def _make_request(self, endpoint: str, data: dict[str, Any] | None = None) -> dict[str, Any]:
+        Returns:
+            Response dictionary, empty by default.
+
+        Raises:
+            PixooCommandError: If the API returns an error or invalid response.
+            PixooConnectionError: If the request fails.
+
+        """
+        if self._transport is None:
+            await self.connect()
+        try:
+            await self._transport.get(self.base_url, timeout=self._default_timeout)
+        except aiohttp.ClientResponseError:
+            pass  # Any answer means the connection is open
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            msg = f"Failed to connect to API: {e}"
+            raise PixooConnectionError(msg) from e
+        except NotImplementedError as e:
+            msg = f"Cannot ping {self.base_url}: {e}"
+            raise PixooCommandError(msg) from e
+        return {}
+
+    async def _make_request(
+            self,
+            endpoint: str,
+            data: dict[str, Any] | None = None,
+            *,
+            command: str | None = None,
+    ) -> dict[str, Any]:
         """Make a request to the API.
 
         Args:
             endpoint: API endpoint.
             data: Optional request payload.
+            command: Command name used to select timeouts and record latency (default: the endpoint).
+
+        Returns:
+            Response dictionary.
+
+        Raises:
+            PixooCommandError: If the API returns an error or invalid response.
+            PixooConnectionError: If the request fails.
+
+        """
+        body = json.dumps(data, separators=(",", ":")).encode() if data is not None else b""
+        return await self._make_raw_request(endpoint, body, command=command)
+
+    async def _make_raw_request(
+            self,
+            endpoint: str,
+            body: bytes,
+            *,
+            command: str | None = None,
+    ) -> dict[str, Any]:
+        """Make a request to the API with an already serialized payload.
+
+        Args:
+            endpoint: API endpoint.
+            body: Serialized JSON request payload.
+            command: Command name used to select timeouts and record latency (default: the endpoint).
+
+        Returns:
+            Response dictionary.
+
+        Raises:
+            PixooCommandError: If the API returns an error or invalid response.
+            PixooConnectionError: If the request fails.
+
+        """
+        if self._transport is None:
+            await self.connect()
+
+        key = command or endpoint
+        try:
+            try:
+                return await self._post(endpoint, body, key)
+            except aiohttp.ServerDisconnectedError as err:
+                if not self._can_retry(key, err):
+                    raise
+                logger.debug("Connection to %s closed before responding to %s, retrying", self.base_url, key)
+                return await self._post(endpoint, body, key)
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            if isinstance(e, asyncio.TimeoutError) and key in self._rtt:
+                self._rtt[key].backoff()
+            logger.exception("Error making request to %s", endpoint)
+            msg = f"Failed to connect to API: {e}"
+            raise PixooConnectionError(msg) from e
+
+    def _can_retry(self, key: str, error: aiohttp.ServerDisconnectedError) -> bool:
+        """Return whether a request can be sent again after the connection was closed before responding.
+
+        A device may have acted on a request it did not answer, so only requests that never reached it
+        (a stale reused connection) or idempotent commands are retried.
+        """
+        return self.retry_on_disconnect and (
+            isinstance(error, StaleConnectionError) or key in self.idempotent_commands
+        )
+
+    async def _post(self, endpoint: str, body: bytes, key: str) -> dict[str, Any]:
+        """Post a request and decode the response, recording its round-trip time under the key."""
+        return self._decode_response((await self._send(endpoint, body, key)).body)
+
+    async def _send(
+            self,
+            endpoint: str,
+            body: bytes,
+            key: str,
+            headers: Mapping[str, str] | None = None,
+    ) -> TransportResponse:
+        """Post a request, recording its round-trip time under the key, and return the raw response."""
+        started = time.monotonic()
+        response = await self._transport.post(
+            f"{self.base_url}/{endpoint}", body, timeout=self._timeout_for(key), headers=headers,
+        )
+        self._rtt.setdefault(key, RttEstimator()).add_sample(time.monotonic() - started)
+        return response
+
+    @staticmethod
+    def _decode_response(body: bytes) -> dict[str, Any]:
+        """Decode a response body and check it for an API error.
+
+        Args:
+            body: Raw response body.
 
         Returns:
             Response dictionary.
 
+        Raises:
+            PixooCommandError: If the API returns an error or invalid response.
+
+        """
+        try:
+            result = json.loads(body)
+        except json.JSONDecodeError as json_err:
+            text = body.decode(errors="replace")
+            logger.exception("Failed to parse JSON from response: %s", text)
+            msg = f"Failed to parse JSON from response: {text}"
+            raise PixooCommandError(
+                msg,
+            ) from json_err
+        return BasePixoo._check_result(result)
+
+    @staticmethod
+    def _check_result(result: dict[str, Any]) -> dict[str, Any]:
+        """Return a decoded response, raising PixooCommandError if it reports an API error."""
+        if result.get("error_code", 0) != 0:
+            msg = f"API returned error: {result}"
+            raise PixooCommandError(msg)
+        return result
+
+    async def _stream_items(
+            self,
+            endpoint: str,
+            data: dict[str, Any],
+            list_key: str,
+    ) -> AsyncIterator[Any]:
+        """Make a request and yield the items of an array in the response as they are received.
+
+        The response is decoded incrementally, so only the item being received is held in memory
+        rather than the whole response.
+
+        Args:
+            endpoint: API endpoint.
+            data: Request payload.
+            list_key: Name of the array member of the response (e.g. "DialList").
+
+        Yields:
+            The items of the array, in order.
+
         Raises:
             PixooCommandError: If the API returns an error or invalid response.
             PixooConnectionError: If the request fails.
 
         """
-        if self._session is None:
+        if self._transport is None:
             await self.connect()
 
+        parser = ArrayItemParser(list_key)
+        body = json.dumps(data, separators=(",", ":")).encode()
+        chunks = self._transport.post_chunks(f"{self.base_url}/{endpoint}", body, timeout=self._timeout_for(endpoint))
         try:
-            async with self._session.post(
-                    f"{self.base_url}/{endpoint}",
-                    json=data,
-                    timeout=self.timeout,
-            ) as response:
-                text = await response.text()
-                try:
-                    result = json.loads(text)
-                except json.JSONDecodeError as json_err:
-                    logger.exception("Failed to parse JSON from response: %s", text)
-                    msg = f"Failed to parse JSON from response: {text}"
-                    raise PixooCommandError(
-                        msg,
-                    ) from json_err
-                if result.get("error_code", 0) != 0:
-                    msg = f"API returned error: {result}"
-                    raise PixooCommandError(msg)
-                return result
+            async for chunk in chunks:
+                for item in parser.feed(chunk):
+                    yield item
+            self._check_result(parser.close())
         except (aiohttp.ClientError, asyncio.TimeoutError) as e:
             logger.exception("Error making request to %s", endpoint)
             msg = f"Failed to connect to API: {e}"
             raise PixooConnectionError(msg) from e
+        except ValueError as e:
+            msg = f"Failed to parse JSON from response to {endpoint}: {e}"
+            raise PixooCommandError(msg) from e
+        finally:
+            await chunks.aclose()
 
     async def close(self) -> None:
-        """Close the aiohttp session."""
-        if self._session:
-            await self._session.close()
-            await asyncio.sleep(0)  # Graceful shutdown
-            self._session = None
-            logger.debug("Closed aiohttp session")
+        """Close the transport, unless it was given on construction."""
+        if self._transport is not None and self._owns_transport:
+            await self._transport.close()
+            self._transport = None
@@ -0,0 +1,345 @@
+"""Provides a persistent cache of the Divoom online catalog.
+
+`CatalogStore` keeps Divoom responses in an SQLite database with the time each was fetched.
+`DivoomCatalog` reads through it: fresh entries are served locally, stale entries are served
+locally while being revalidated in the background, and only missing entries wait for the API.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import logging
+import math
+import sqlite3
+import threading
+import time
+from typing import TYPE_CHECKING, Any, Callable
+
+from .divoom import DEFAULT_PAGE_CONCURRENCY, PAGE_SIZE
+from .exceptions import PixooCommandError
+from .revalidation import Revalidations
+
+if TYPE_CHECKING:
+    import os
+    from collections.abc import Awaitable, Iterable
+
+    from .divoom import Divoom
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_AGE = 6 * 3600  # Seconds a catalog entry is served without revalidation
+DEFAULT_PAGE_MAX_AGE = 24 * 3600  # Seconds a dial list page after the first is kept while page 1 is unchanged
+
+DIAL_TYPE_KEY = "Channel/GetDialType"
+FONT_LIST_KEY = "Device/GetTimeDialFontList"
+
+
+def _dial_page_key(dial_type: str, page: int) -> str:
+    """Return the store key of a dial list page."""
+    return f"Channel/GetDialList/{dial_type}/{page}"
+
+
+class CatalogEntry:
+    """A stored response with its digest and the time it was last fetched or confirmed unchanged."""
+
+    __slots__ = ("digest", "fetched", "response")
+
+    def __init__(self, response: dict[str, Any], digest: str, fetched: float) -> None:
+        """Initialize the entry.
+
+        Args:
+            response: The response dictionary.
+            digest: Digest of the serialized response.
+            fetched: Unix time the response was last fetched or confirmed unchanged.
+
+        """
+        self.response = response
+        self.digest = digest
+        self.fetched = fetched
+
+    @property
+    def age(self) -> float:
+        """Return the seconds since the entry was last fetched or confirmed unchanged."""
+        return time.time() - self.fetched
+
+
+class CatalogStore:
+    """SQLite-backed store of Divoom responses, keyed by endpoint and parameters.
+
+    The store may be used from several threads; DivoomCatalog calls it from the default executor.
+    """
+
+    def __init__(self, path: str | os.PathLike[str] = ":memory:") -> None:
+        """Initialize the store, creating the database if needed.
+
+        Args:
+            path: Database file (default: an in-memory database).
+
+        """
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(str(path), check_same_thread=False)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS catalog ("
+            "key TEXT PRIMARY KEY, body BLOB NOT NULL, digest TEXT NOT NULL, fetched REAL NOT NULL)",
+        )
+        self._db.commit()
+
+    @staticmethod
+    def _serialize(response: dict[str, Any]) -> tuple[bytes, str]:
+        """Return the stored body and digest of a response."""
+        body = json.dumps(response, separators=(",", ":"), sort_keys=True).encode()
+        return body, hashlib.blake2b(body, digest_size=16).hexdigest()
+
+    def get(self, key: str) -> CatalogEntry | None:
+        """Return the entry for a key, or None if it is not stored."""
+        with self._lock:
+            row = self._db.execute("SELECT body, digest, fetched FROM catalog WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        body, digest, fetched = row
+        return CatalogEntry(json.loads(body), digest, fetched)
+
+    def fetched(self, key: str) -> float | None:
+        """Return the time an entry was last fetched or confirmed unchanged, or None if it is not stored."""
+        with self._lock:
+            row = self._db.execute("SELECT fetched FROM catalog WHERE key = ?", (key,)).fetchone()
+        return None if row is None else row[0]
+
+    def put(self, key: str, response: dict[str, Any]) -> bool:
+        """Store a response, only rewriting it if its content changed.
+
+        Args:
+            key: The key.
+            response: The response dictionary.
+
+        Returns:
+            Whether the content differs from the stored entry.
+
+        """
+        body, digest = self._serialize(response)
+        now = time.time()
+        with self._lock:
+            cursor = self._db.execute(
+                "UPDATE catalog SET fetched = ? WHERE key = ? AND digest = ?", (now, key, digest),
+            )
+            changed = cursor.rowcount == 0
+            if changed:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO catalog (key, body, digest, fetched) VALUES (?, ?, ?, ?)",
+                    (key, body, digest, now),
+                )
+            self._db.commit()
+        return changed
+
+    def matches(self, key: str, response: dict[str, Any]) -> bool:
+        """Return whether a response has the same content as the stored entry."""
+        with self._lock:
+            row = self._db.execute("SELECT digest FROM catalog WHERE key = ?", (key,)).fetchone()
+        return row is not None and row[0] == self._serialize(response)[1]
+
+    def touch(self, keys: Iterable[str]) -> None:
+        """Mark entries as confirmed unchanged now."""
+        now = time.time()
+        with self._lock:
+            self._db.executemany("UPDATE catalog SET fetched = ? WHERE key = ?", ((now, key) for key in keys))
+            self._db.commit()
+
+    def delete(self, keys: Iterable[str]) -> None:
+        """Remove entries."""
+        with self._lock:
+            self._db.executemany("DELETE FROM catalog WHERE key = ?", ((key,) for key in keys))
+            self._db.commit()
+
+    def close(self) -> None:
+        """Close the database."""
+        with self._lock:
+            self._db.close()
+
+
+class DivoomCatalog:
+    """Divoom catalog reads served from a CatalogStore with stale-while-revalidate.
+
+    Entries younger than `max_age` are served from the store. Older entries are still served from
+    the store while a background request revalidates them, so only entries that were never stored
+    wait for the API. Store reads and writes run in the default executor, off the event loop.
+
+    A dial list is revalidated incrementally: page 1 is fetched first, and if it and TotalNum are
+    unchanged only the other pages older than `page_max_age` are fetched again. The API offers no
+    per-page validators, so otherwise every page is fetched again, but only pages whose content
+    changed are rewritten.
+    """
+
+    def __init__(
+            self,
+            divoom: Divoom,
+            store: CatalogStore,
+            *,
+            max_age: float = DEFAULT_MAX_AGE,
+            page_max_age: float = DEFAULT_PAGE_MAX_AGE,
+            concurrency: int = DEFAULT_PAGE_CONCURRENCY,
+    ) -> None:
+        """Initialize the catalog.
+
+        Args:
+            divoom: Client for the Divoom online API.
+            store: Store to read and write the catalog.
+            max_age: Seconds an entry is served without revalidation (default: 6 hours).
+            page_max_age: Seconds a dial list page after the first is kept without being fetched again
+                while page 1 is unchanged (default: 24 hours).
+            concurrency: Maximum number of dial list pages fetched at once (default: 8).
+
+        """
+        self.divoom = divoom
+        self.store = store
+        self.max_age = max_age
+        self.page_max_age = page_max_age
+        self.concurrency = concurrency
+        self._revalidations = Revalidations(logger)
+
+    async def _read(
+            self,
+            key: str,
+            load: Callable[[], tuple[float, Any] | None],
+            fetch: Callable[[], Awaitable[None]],
+    ) -> Any:  # noqa: ANN401
+        """Return a stored value, fetching it if missing and revalidating it in the background if stale."""
+        stored = await self._run(load)
+        if stored is None:
+            await fetch()
+            stored = await self._run(load)
+        elif time.time() - stored[0] > self.max_age:
+            self._revalidations.schedule(key, fetch)
+        return stored[1]
+
+    @staticmethod
+    async def _run(func: Callable[..., Any], *args: Any) -> Any:  # noqa: ANN401
+        """Run a blocking store call in the default executor."""
+        return await asyncio.get_running_loop().run_in_executor(None, func, *args)
+
+    def _put(self, key: str, response: dict[str, Any]) -> bool:
+        """Store a response, refusing one whose ReturnCode reports an API error.
+
+        Raises:
+            PixooCommandError: If the response reports an error, so it is never served as a catalog entry.
+
+        """
+        self._check(key, response)
+        return self.store.put(key, response)
+
+    @staticmethod
+    def _check(key: str, response: dict[str, Any]) -> None:
+        """Raise PixooCommandError if a response reports an API error in its ReturnCode."""
+        if response.get("ReturnCode"):
+            msg = f"API returned error for {key}: {response}"
+            raise PixooCommandError(msg)
+
+    def _load(self, key: str) -> tuple[float, dict[str, Any]] | None:
+        """Return the fetch time and response stored for a key."""
+        entry = self.store.get(key)
+        return None if entry is None else (entry.fetched, entry.response)
+
+    async def get_dial_type(self) -> dict[str, Any]:
+        """Return the dial types, as `Divoom.get_dial_type` does."""
+
+        async def fetch() -> None:
+            await self._run(self._put, DIAL_TYPE_KEY, await self.divoom.get_dial_type())
+
+        return await self._read(DIAL_TYPE_KEY, lambda: self._load(DIAL_TYPE_KEY), fetch)
+
+    async def get_font_list(self) -> dict[str, Any]:
+        """Return the fonts, as `Divoom.get_font_list` does."""
+
+        async def fetch() -> None:
+            await self._run(self._put, FONT_LIST_KEY, await self.divoom.get_font_list())
+
+        return await self._read(FONT_LIST_KEY, lambda: self._load(FONT_LIST_KEY), fetch)
+
+    async def get_dial_list(self, dial_type: str) -> list[dict[str, Any]]:
+        """Return every dial of a type, from all pages of `Divoom.get_dial_list`.
+
+        Args:
+            dial_type: The type of dial (e.g., "Social", "Game").
+
+        Returns:
+            The DialList items of every page, in order.
+
+        """
+        return await self._read(
+            _dial_page_key(dial_type, 1),
+            lambda: self._load_dial_list(dial_type),
+            lambda: self._fetch_dial_list(dial_type),
+        )
+
+    def _load_dial_list(self, dial_type: str) -> tuple[float, list[dict[str, Any]]] | None:
+        """Return the fetch time of page 1 and the dials of every stored page, or None if a page is missing."""
+        first = self.store.get(_dial_page_key(dial_type, 1))
+        if first is None:
+            return None
+        dials = list(first.response.get("DialList") or ())
+        for page in range(2, self._page_count(first.response) + 1):
+            entry = self.store.get(_dial_page_key(dial_type, page))
+            if entry is None:
+                return None
+            dials.extend(entry.response.get("DialList") or ())
+        return first.fetched, dials
+
+    @staticmethod
+    def _page_count(first_page: dict[str, Any]) -> int:
+        """Return the number of pages announced by page 1."""
+        return max(math.ceil((first_page.get("TotalNum") or 0) / PAGE_SIZE), 1)
+
+    async def _fetch_dial_list(self, dial_type: str) -> None:
+        """Fetch page 1, and the other pages if page 1 or TotalNum changed or they are older than page_max_age."""
+        first = await self.divoom.get_dial_list(dial_type, 1)
+        pages = self._page_count(first)
+        keys = [_dial_page_key(dial_type, page) for page in range(1, pages + 1)]
+        self._check(keys[0], first)
+        previous_pages, refetch = await self._run(self._plan_refetch, keys, first)
+
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def fetch_page(page: int) -> dict[str, Any]:
+            async with semaphore:
+                return await self.divoom.get_dial_list(dial_type, page)
+
+        responses = [first, *await asyncio.gather(*(fetch_page(page) for page in refetch))]
+        fetched_keys = [keys[0], *(keys[page - 1] for page in refetch)]
+        for key, response in zip(fetched_keys, responses):
+            self._check(key, response)
+        stale_keys = [_dial_page_key(dial_type, page) for page in range(pages + 1, previous_pages + 1)]
+        changed = await self._run(self._store_pages, fetched_keys, responses, stale_keys)
+        logger.debug(
+            "Refreshed %s dial list, fetched %d and changed %d of %d pages", dial_type, len(responses), changed, pages,
+        )
+
+    def _plan_refetch(self, keys: list[str], first: dict[str, Any]) -> tuple[int, list[int]]:
+        """Return the page count stored before, and the pages after the first that must be fetched again."""
+        previous = self.store.get(keys[0])
+        if previous is None:
+            return 0, list(range(2, len(keys) + 1))
+        previous_pages = self._page_count(previous.response)
+        refetch = list(range(2, len(keys) + 1))
+        if previous_pages == len(keys) and self.store.matches(keys[0], first):
+            refetch = [page for page in refetch if self._page_expired(keys[page - 1])]
+        return previous_pages, refetch
+
+    def _store_pages(self, keys: list[str], responses: list[dict[str, Any]], stale_keys: list[str]) -> int:
+        """Store fetched pages and remove pages beyond the new page count; return how many pages changed."""
+        changed = sum(self.store.put(key, response) for key, response in zip(keys, responses))
+        self.store.delete(stale_keys)
+        return changed
+
+    def _page_expired(self, key: str) -> bool:
+        """Return whether a dial list page is missing or older than page_max_age."""
+        fetched = self.store.fetched(key)
+        return fetched is None or time.time() - fetched > self.page_max_age
+
+    async def join(self) -> None:
+        """Wait for the background revalidations in progress."""
+        await self._revalidations.join()
+
+    async def close(self) -> None:
+        """Cancel the background revalidations in progress."""
+        await self._revalidations.close()
@@ -0,0 +1,107 @@
+"""Provides the `CommandCoalescer` class, which rate-limits bursts of idempotent calls."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable, Hashable
+
+logger = logging.getLogger(__name__)
+
+
+class _PendingCall:
+    """A call waiting to be flushed, together with the future shared by all its callers."""
+
+    __slots__ = ("factory", "future", "task")
+
+    def __init__(self, future: asyncio.Future, factory: Callable[[], Awaitable[Any]]) -> None:
+        self.future = future
+        self.factory = factory
+        self.task: asyncio.Task | None = None
+
+
+class CommandCoalescer:
+    """Coalesce calls per key so that at most one call per interval is executed.
+
+    Calls made while an earlier call for the same key is still waiting replace its arguments;
+    every caller of the window receives the result of the call that was finally executed.
+    Calls for the same key are executed one at a time, in submission order.
+    """
+
+    def __init__(self, interval: float) -> None:
+        """Initialize the coalescer.
+
+        Args:
+            interval: Minimum time in seconds between two executed calls for the same key.
+
+        """
+        self.interval = interval
+        self._pending: dict[Hashable, _PendingCall] = {}
+        self._locks: dict[Hashable, asyncio.Lock] = {}
+        self._last_run: dict[Hashable, float] = {}
+
+    async def submit(self, key: Hashable, factory: Callable[[], Awaitable[Any]]) -> Any:  # noqa: ANN401
+        """Schedule a call, replacing any call for the same key that has not been executed yet.
+
+        Args:
+            key: Key identifying calls that may replace each other, e.g. a command name.
+            factory: Callable returning the awaitable to execute.
+
+        Returns:
+            The result of the call executed for this window.
+
+        """
+        pending = self._pending.get(key)
+        if pending is None:
+            loop = asyncio.get_running_loop()
+            pending = _PendingCall(loop.create_future(), factory)
+            self._pending[key] = pending
+            pending.task = loop.create_task(self._flush(key, pending))
+        else:
+            logger.debug("Coalescing call for %s", key)
+            pending.factory = factory
+        return await asyncio.shield(pending.future)
+
+    async def _flush(self, key: Hashable, pending: _PendingCall) -> None:
+        """Wait for the interval to pass, then execute the latest call for the key."""
+        try:
+            await self._run(key, pending)
+        finally:
+            # A flush cancelled before or during the call cancels its callers instead of leaving them waiting
+            if not pending.future.done():
+                pending.future.cancel()
+
+    async def _run(self, key: Hashable, pending: _PendingCall) -> None:
+        """Wait for the interval, execute the call and resolve its future."""
+        loop = asyncio.get_running_loop()
+        last_run = self._last_run.get(key)
+        if last_run is not None:
+            delay = last_run + self.interval - loop.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+        else:
+            await asyncio.sleep(0)  # Let calls from the same loop iteration join the window
+
+        lock = self._locks.setdefault(key, asyncio.Lock())
+        async with lock:
+            # Calls arriving from here on open a new window
+            if self._pending.get(key) is pending:
+                del self._pending[key]
+            self._last_run[key] = loop.time()
+            try:
+                result = await pending.factory()
+            except Exception as err:  # noqa: BLE001
+                pending.future.set_exception(err)
+            else:
+                pending.future.set_result(result)
+
+    def cancel(self) -> None:
+        """Cancel all calls that have not been executed yet."""
+        for pending in self._pending.values():
+            if pending.task is not None:
+                pending.task.cancel()
+            pending.future.cancel()
+        self._pending.clear()
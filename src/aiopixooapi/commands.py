@@ -0,0 +1,251 @@
+"""Provides prevalidated, immutable Pixoo64 command objects.
+
+A command is validated and serialized once on construction; sending it with `Pixoo64.send_command`
+or batching it with `Pixoo64.run_command_list` reuses the cached body.
+"""
+
+from __future__ import annotations
+
+import json
+from types import MappingProxyType
+from typing import TYPE_CHECKING, Any, NoReturn
+
+if TYPE_CHECKING:
+    from collections.abc import Mapping
+
+    from typing_extensions import Self
+
+MAX_PIC_NUM = 59
+MAX_TEXT_ID = 19
+MIN_TEXT_WIDTH = 17
+MAX_TEXT_WIDTH = 63
+MAX_TEXT_LENGTH = 512
+MAX_FONT = 7
+
+
+class Command:
+    """An immutable device command with its JSON body serialized once."""
+
+    __slots__ = ("body", "name", "payload")
+
+    def __init__(self, name: str, payload: Mapping[str, Any] | None = None) -> None:
+        """Initialize the command.
+
+        Args:
+            name: The command to send to the device (e.g. "Channel/SetBrightness").
+            payload: Optional parameters for the command.
+
+        """
+        payload = {**(payload or {}), "Command": name}
+        self._set_body(MappingProxyType(payload), json.dumps(payload, separators=(",", ":")).encode())
+
+    @classmethod
+    def from_body(cls, body: bytes) -> Self:
+        """Rebuild a command from its serialized body, e.g. one received from another process.
+
+        The body is kept as-is rather than serialized again.
+
+        Args:
+            body: The body of a command of this class.
+
+        Returns:
+            The command.
+
+        """
+        command = object.__new__(cls)
+        command._set_body(MappingProxyType(json.loads(body)), body)
+        return command
+
+    def _set_body(self, payload: Mapping[str, Any], body: bytes) -> None:
+        """Set the name, payload and serialized body."""
+        object.__setattr__(self, "name", payload["Command"])
+        object.__setattr__(self, "payload", payload)
+        object.__setattr__(self, "body", body)
+
+    def __setattr__(self, name: str, value: object) -> NoReturn:
+        """Reject attribute assignment, commands are immutable."""
+        msg = f"{type(self).__name__} is immutable"
+        raise AttributeError(msg)
+
+    def __delattr__(self, name: str) -> NoReturn:
+        """Reject attribute deletion, commands are immutable."""
+        msg = f"{type(self).__name__} is immutable"
+        raise AttributeError(msg)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the payload, including the Command key, as a new dictionary."""
+        return dict(self.payload)
+
+    def __repr__(self) -> str:
+        """Return the command name and payload."""
+        return f"{type(self).__name__}({self.name!r}, {dict(self.payload)!r})"
+
+    def __eq__(self, other: object) -> bool:
+        """Compare serialized bodies."""
+        if not isinstance(other, Command):
+            return NotImplemented
+        return self.body == other.body
+
+    def __hash__(self) -> int:
+        """Hash the serialized body."""
+        return hash(self.body)
+
+
+class FrameCommand(Command):
+    """Draw/SendHttpGif command sending a single frame of an animation.
+
+    The body is kept split around the PicID value, so the same frame can be sent to devices with
+    different animation IDs without serializing the frame data again.
+    """
+
+    __slots__ = ("_body_head", "_body_tail", "pic_id")
+
+    def __init__(  # noqa: PLR0913
+            self, pic_num: int, pic_width: int, pic_offset: int, pic_id: int, pic_speed: int, *, pic_data: str,
+    ) -> None:
+        """Initialize the command.
+
+        Args:
+            pic_num: Total number of frames in the animation (must be < 60).
+            pic_width: Width of the frame in pixels (16, 32, or 64).
+            pic_offset: Offset of the current frame (0 to PicNum-1).
+            pic_id: Unique ID for the animation (must auto-increment).
+            pic_speed: Speed of the animation in milliseconds.
+            pic_data: Base64-encoded RGB data for the frame.
+
+        Raises:
+            ValueError: If any of the parameters are invalid.
+
+        """
+        if not (1 <= pic_num < MAX_PIC_NUM):
+            msg = f"PicNum must be between 1 and {MAX_PIC_NUM}. Got: {pic_num}"
+            raise ValueError(msg)
+        if pic_width not in (16, 32, 64):
+            msg = f"PicWidth must be one of 16, 32, or 64. Got: {pic_width}"
+            raise ValueError(msg)
+        if not (0 <= pic_offset < pic_num):
+            msg = f"PicOffset must be between 0 and PicNum-1. Got: {pic_offset}"
+            raise ValueError(msg)
+        if pic_id < 1:
+            msg = f"PicID must be greater than or equal to 1. Got: {pic_id}"
+            raise ValueError(msg)
+        if pic_speed < 0:
+            msg = f"PicSpeed must be a positive integer. Got: {pic_speed}"
+            raise ValueError(msg)
+        if not pic_data:
+            msg = "PicData must be provided."
+            raise ValueError(msg)
+
+        super().__init__(
+            "Draw/SendHttpGif",
+            {
+                "PicNum": pic_num,
+                "PicWidth": pic_width,
+                "PicOffset": pic_offset,
+                "PicID": pic_id,
+                "PicSpeed": pic_speed,
+                "PicData": pic_data,
+            },
+        )
+
+    def _set_body(self, payload: Mapping[str, Any], body: bytes) -> None:
+        """Set the name, payload and serialized body, and split the body around the PicID value."""
+        super()._set_body(payload, body)
+        pic_id = payload["PicID"]
+        head, _, tail = body.partition(b'"PicID":%d' % pic_id)
+        object.__setattr__(self, "pic_id", pic_id)
+        object.__setattr__(self, "_body_head", head + b'"PicID":')
+        object.__setattr__(self, "_body_tail", tail)
+
+    def body_for_pic_id(self, pic_id: int) -> bytes:
+        """Return the body with another PicID, reusing the serialized frame data.
+
+        Args:
+            pic_id: The animation ID to send the frame with.
+
+        Returns:
+            The serialized body.
+
+        Raises:
+            ValueError: If the PicID is invalid.
+
+        """
+        if pic_id == self.pic_id:
+            return self.body
+        if pic_id < 1:
+            msg = f"PicID must be greater than or equal to 1. Got: {pic_id}"
+            raise ValueError(msg)
+        return b"".join((self._body_head, b"%d" % pic_id, self._body_tail))
+
+
+class TextCommand(Command):
+    """Draw/SendHttpText command displaying scrolling text."""
+
+    __slots__ = ()
+
+    def __init__(  # noqa: PLR0913
+            self,
+            text_id: int,
+            x: int,
+            y: int,
+            direction: int,
+            font: int,
+            *,
+            text_width: int,
+            text_string: str,
+            speed: int,
+            color: str,
+            align: int = 1,
+    ) -> None:
+        """Initialize the command.
+
+        Args:
+            text_id: Unique ID for the text (must be < 20).
+            x: Start x position.
+            y: Start y position.
+            direction: 0 for scroll left, 1 for scroll right.
+            font: Font type (0~7).
+            text_width: Text width (16 < width < 64).
+            text_string: UTF-8 string (length < 512).
+            speed: Scroll speed in ms per step.
+            color: Font color in hex format (e.g., "#FFFF00").
+            align: Horizontal alignment (1: left, 2: middle, 3: right).
+
+        Raises:
+            ValueError: If any parameter is invalid.
+
+        """
+        if not (0 <= text_id <= MAX_TEXT_ID):
+            msg = f"TextId must be between 0 and {MAX_TEXT_ID}. Got: {text_id}"
+            raise ValueError(msg)
+        if not (MIN_TEXT_WIDTH < text_width < MAX_TEXT_WIDTH):
+            msg = f"TextWidth must be between {MIN_TEXT_WIDTH} and {MAX_TEXT_WIDTH}. Got: {text_width}"
+            raise ValueError(msg)
+        if len(text_string) >= MAX_TEXT_LENGTH:
+            msg = f"TextString length must be less than {MAX_TEXT_LENGTH}. Got: {len(text_string)}"
+            raise ValueError(msg)
+        if direction not in (0, 1):
+            msg = f"Direction must be 0 (scroll left) or 1 (scroll right). Got: {direction}"
+            raise ValueError(msg)
+        if not (0 <= font <= MAX_FONT):
+            msg = f"Font must be between 0 and {MAX_FONT}. Got: {font}"
+            raise ValueError(msg)
+        if align not in (1, 2, 3):
+            msg = f"Align must be 1 (left), 2 (middle), or 3 (right). Got: {align}"
+            raise ValueError(msg)
+
+        super().__init__(
+            "Draw/SendHttpText",
+            {
+                "TextId": text_id,
+                "x": x,
+                "y": y,
+                "dir": direction,
+                "font": font,
+                "TextWidth": text_width,
+                "TextString": text_string,
+                "speed": speed,
+                "color": color,
+                "align": align,
+            },
+        )
@@ -0,0 +1,220 @@
+"""Discovery of Pixoo64 devices on the local network.
+
+`LanDiscovery` merges the devices the Divoom cloud reports on the same LAN
+(`Divoom.get_local_device_list`) with a probe of candidate hosts and networks. Every candidate is
+sent `Channel/GetAllConf` at once, up to a concurrency cap and with a short timeout, so scanning a
+/24 takes about one timeout rather than one per address. Devices that answer are returned with a
+ready-to-use `Pixoo64` client.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import ipaddress
+import json
+import logging
+import time
+from typing import TYPE_CHECKING, Any
+
+import aiohttp
+
+from .commands import Command
+from .exceptions import PixooError
+from .pixoo64 import Pixoo64
+from .transport import AiohttpTransport, Transport
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Mapping
+
+    from .divoom import Divoom
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PROBE_TIMEOUT = 1.0
+DEFAULT_PROBE_CONCURRENCY = 256  # Enough to probe a /24 in a single round
+
+_PROBE_BODY = Command("Channel/GetAllConf").body
+
+
+def expand_candidates(candidates: Iterable[str]) -> list[str]:
+    """Expand networks in CIDR notation into their host addresses.
+
+    Args:
+        candidates: Hosts (addresses or names) and networks (e.g. "192.168.1.0/24").
+
+    Returns:
+        The hosts, without duplicates, in the order given.
+
+    """
+    hosts: dict[str, None] = {}
+    for candidate in candidates:
+        if "/" in candidate:
+            network = ipaddress.ip_network(candidate, strict=False)
+            hosts.update(dict.fromkeys(str(address) for address in network.hosts()))
+        else:
+            hosts[candidate] = None
+    return list(hosts)
+
+
+class DiscoveredDevice:
+    """A device that answered the probe, with what the cloud reported about it."""
+
+    __slots__ = ("cloud", "device_id", "host", "mac", "name", "pixoo", "rtt", "settings")
+
+    def __init__(
+            self,
+            host: str,
+            pixoo: Pixoo64,
+            settings: dict[str, Any],
+            rtt: float,
+            cloud: Mapping[str, Any] | None = None,
+    ) -> None:
+        """Initialize the device.
+
+        Args:
+            host: IP address or name of the device.
+            pixoo: Client for the device.
+            settings: The device's answer to Channel/GetAllConf.
+            rtt: Round-trip time of the probe, in seconds.
+            cloud: The device's DeviceList entry from the Divoom cloud, if it was listed.
+
+        """
+        self.host = host
+        self.pixoo = pixoo
+        self.settings = settings
+        self.rtt = rtt
+        self.cloud = cloud is not None
+        cloud = cloud or {}
+        self.name: str | None = cloud.get("DeviceName")
+        self.device_id: int | None = cloud.get("DeviceId")
+        self.mac: str | None = cloud.get("DeviceMac")
+
+    def __repr__(self) -> str:
+        """Return the host, name and probe round-trip time."""
+        return f"DiscoveredDevice({self.host!r}, name={self.name!r}, rtt={self.rtt:.3f})"
+
+
+class LanDiscovery:
+    """Finds reachable Pixoo64 devices from the Divoom cloud and a concurrent local probe.
+
+    Probes and the returned clients share one transport, which the discovery owns unless one is
+    given; `close` closes it.
+    """
+
+    def __init__(
+            self,
+            *,
+            port: int = 80,
+            probe_timeout: float = DEFAULT_PROBE_TIMEOUT,
+            concurrency: int = DEFAULT_PROBE_CONCURRENCY,
+            timeout: float = 10,
+            transport: Transport | None = None,
+    ) -> None:
+        """Initialize the discovery.
+
+        Args:
+            port: Port of the devices (default: 80).
+            probe_timeout: Seconds a candidate is given to answer the probe (default: 1).
+            concurrency: Maximum number of probes at once (default: 256).
+            timeout: Request timeout in seconds of the returned clients (default: 10).
+            transport: Transport for the probes and the clients (default: an AiohttpTransport owned by
+                the discovery, allowing `concurrency` connections).
+
+        """
+        self.port = port
+        self.probe_timeout = aiohttp.ClientTimeout(total=probe_timeout)
+        self.concurrency = concurrency
+        self.timeout = timeout
+        self._owns_transport = transport is None
+        self._transport = transport if transport is not None else AiohttpTransport(limit=concurrency)
+        self._semaphore: asyncio.Semaphore | None = None
+
+    @property
+    def transport(self) -> Transport:
+        """Return the transport shared by the probes and the clients."""
+        return self._transport
+
+    async def probe(self, host: str) -> tuple[dict[str, Any], float] | None:
+        """Send Channel/GetAllConf to a host.
+
+        Args:
+            host: IP address or name of the candidate.
+
+        Returns:
+            The settings and the round-trip time, or None if the host did not answer as a device.
+
+        """
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.concurrency)
+        async with self._semaphore:
+            started = time.monotonic()
+            try:
+                response = await self._transport.post(
+                    f"http://{host}:{self.port}/post", _PROBE_BODY, timeout=self.probe_timeout,
+                )
+                settings = json.loads(response.body)
+            except (aiohttp.ClientError, asyncio.TimeoutError, OSError, ValueError):
+                return None
+            rtt = time.monotonic() - started
+        if not isinstance(settings, dict) or settings.get("error_code", 0) != 0:
+            return None
+        return settings, rtt
+
+    @staticmethod
+    async def _cloud_devices(divoom: Divoom) -> dict[str, dict[str, Any]]:
+        """Return the devices the cloud reports on the same LAN, keyed by private IP; empty on failure."""
+        try:
+            response = await divoom.get_local_device_list()
+        except PixooError as err:
+            logger.warning("Could not fetch the device list from the Divoom cloud: %s", err)
+            return {}
+        return {
+            device["DevicePrivateIP"]: device
+            for device in response.get("DeviceList") or ()
+            if device.get("DevicePrivateIP")
+        }
+
+    async def discover(
+            self,
+            candidates: Iterable[str] = (),
+            *,
+            divoom: Divoom | None = None,
+    ) -> list[DiscoveredDevice]:
+        """Find the devices among the candidates and the devices listed by the cloud.
+
+        Args:
+            candidates: Hosts and networks in CIDR notation to probe (e.g. "192.168.1.0/24").
+            divoom: Client for the Divoom cloud, whose same-LAN device list is probed too (default: None,
+                candidates only).
+
+        Returns:
+            The devices that answered, in candidate order followed by cloud-only devices.
+
+        """
+        # Candidates are probed while the cloud answers, its other devices once it has
+        probes = {host: asyncio.ensure_future(self.probe(host)) for host in expand_candidates(candidates)}
+        try:
+            cloud = await self._cloud_devices(divoom) if divoom is not None else {}
+            for host in cloud:
+                if host not in probes:
+                    probes[host] = asyncio.ensure_future(self.probe(host))
+            results = await asyncio.gather(*probes.values())
+        finally:
+            for probe in probes.values():
+                probe.cancel()
+        devices = []
+        for host, result in zip(probes, results):
+            if result is None:
+                if host in cloud:
+                    logger.debug("Device %s listed by the cloud did not answer", host)
+                continue
+            settings, rtt = result
+            pixoo = Pixoo64(host, self.port, self.timeout, transport=self._transport)
+            devices.append(DiscoveredDevice(host, pixoo, settings, rtt, cloud.get(host)))
+        logger.debug("Discovered %d devices among %d candidates", len(devices), len(probes))
+        return devices
+
+    async def close(self) -> None:
+        """Close the transport, if the discovery created it; the returned clients stop working."""
+        if self._owns_transport:
+            await self._transport.close()
@@ -1,20 +1,208 @@
 """Provides functionality for interacting with Divoom devices."""
 
+from __future__ import annotations
+
+import asyncio
+import logging
+import math
+import time
+from typing import TYPE_CHECKING, Any
+
 from .base import BasePixoo
+from .latency import LatencyTracker
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator, Awaitable, Callable, Mapping
+
+    import aiohttp
+
+    from .httpcache import ResponseCache
+    from .transport import Transport, TransportResponse
+
+logger = logging.getLogger(__name__)
+
+PAGE_SIZE = 30  # Items per page of the list endpoints
+DEFAULT_PAGE_CONCURRENCY = 8
+HTTP_NOT_MODIFIED = 304
+HEDGE_MIN_SAMPLES = 20  # Latency samples of an endpoint required before its requests are hedged
+
+
+class HedgeStats:
+    """Counts of hedged requests: how many were sent and how many answered before the original."""
+
+    __slots__ = ("fired", "requests", "won")
+
+    def __init__(self) -> None:
+        """Initialize the counts at zero."""
+        self.requests = 0
+        self.fired = 0
+        self.won = 0
+
+    def __repr__(self) -> str:
+        """Return the counts."""
+        return f"HedgeStats(requests={self.requests}, fired={self.fired}, won={self.won})"
 
 
 class Divoom(BasePixoo):
     """Subclass for handling online Divoom API calls."""
 
-    def __init__(self, timeout: int = 10) -> None:
+    # Every endpoint only reads, so a request can always be sent again
+    idempotent_commands = frozenset({
+        "Channel/GetDialList",
+        "Channel/GetDialType",
+        "Device/GetImgLikeList",
+        "Device/GetImgUploadList",
+        "Device/GetTimeDialFontList",
+        "Device/ReturnSameLANDevice",
+    })
+
+    def __init__(  # noqa: PLR0913
+            self,
+            timeout: float | aiohttp.ClientTimeout = 10,
+            *,
+            timeouts: Mapping[str, aiohttp.ClientTimeout] | None = None,
+            adaptive_timeout: bool = False,
+            idle_timeout: float | None = None,
+            warm_up_connections: int = 0,
+            retry_on_disconnect: bool = True,
+            transport: Transport | None = None,
+            cache: ResponseCache | None = None,
+            hedge_percentile: float | None = None,
+    ) -> None:
         """Initialize the online Divoom API.
 
         Args:
-            timeout: Request timeout in seconds (default: 10).
+            timeout: Default request timeout, in seconds or as an aiohttp.ClientTimeout (default: 10).
+            timeouts: Timeout profiles per endpoint (e.g. "Channel/GetDialList"), overriding the default timeout.
+            adaptive_timeout: Derive the timeout of endpoints without a profile from their measured
+                round-trip times (default: False).
+            idle_timeout: Discard pooled connections idle for longer than this many seconds instead of
+                reusing them (default: None, aiohttp's keep-alive timeout).
+            warm_up_connections: Number of connections to open on connect (default: 0).
+            retry_on_disconnect: Retry a request once when the server closed the connection before
+                responding. Every Divoom endpoint is a read, so any request may be retried (default: True).
+            transport: Transport to send requests with (default: a dedicated AiohttpTransport).
+            cache: Response cache, which may be shared with other clients, e.g. `ResponseCache.shared()`
+                (default: None, every request reaches the API).
+            hedge_percentile: Send a second identical request when the first has not answered within
+                this percentile of the endpoint's observed latency (e.g. 95), and use whichever answers
+                first (default: None, no hedging). Every Divoom endpoint is a read, so this is safe.
 
         """
         base_url = "https://app.divoom-gz.com"
-        super().__init__(base_url, timeout)
+        super().__init__(
+            base_url,
+            timeout,
+            timeouts=timeouts,
+            adaptive_timeout=adaptive_timeout,
+            idle_timeout=idle_timeout,
+            warm_up_connections=warm_up_connections,
+            retry_on_disconnect=retry_on_disconnect,
+            transport=transport,
+        )
+        self.cache = cache
+        self.hedge_percentile = hedge_percentile
+        self.hedge_stats = HedgeStats()
+        self._latency: dict[str, LatencyTracker] = {}
+
+    @property
+    def latency_trackers(self) -> dict[str, LatencyTracker]:
+        """Return the latency percentile trackers used for hedging, keyed by endpoint."""
+        return self._latency
+
+    async def _send(
+            self,
+            endpoint: str,
+            body: bytes,
+            key: str,
+            headers: Mapping[str, str] | None = None,
+    ) -> TransportResponse:
+        """Post a request, hedging it if enabled and the endpoint has enough latency samples."""
+        if self.hedge_percentile is None:
+            return await super()._send(endpoint, body, key, headers)
+        tracker = self._latency.setdefault(key, LatencyTracker())
+        delay = tracker.percentile(self.hedge_percentile) if tracker.samples >= HEDGE_MIN_SAMPLES else None
+        self.hedge_stats.requests += 1
+        started = time.monotonic()
+        primary = asyncio.ensure_future(super()._send(endpoint, body, key, headers))
+        if delay is None:
+            response = await primary
+            tracker.add_sample(time.monotonic() - started)
+            return response
+
+        pending = {primary}
+        try:
+            done, _ = await asyncio.wait(pending, timeout=delay)
+            if not done:
+                self.hedge_stats.fired += 1
+                logger.debug("No response to %s after %.3fs, sending a hedged request", key, delay)
+                pending.add(asyncio.ensure_future(super()._send(endpoint, body, key, headers)))
+            return await self._first_response(pending, primary, tracker, started)
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def _first_response(
+            self,
+            pending: set[asyncio.Future[TransportResponse]],
+            primary: asyncio.Future[TransportResponse],
+            tracker: LatencyTracker,
+            started: float,
+    ) -> TransportResponse:
+        """Return the first successful response, or raise the error of the original request if all failed."""
+        error: BaseException | None = None
+        while pending:
+            done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            pending.difference_update(done)
+            for task in done:
+                if task.exception() is None:
+                    if task is not primary:
+                        self.hedge_stats.won += 1
+                    # Time since the original request: its latency, or a lower bound of it if the hedge won
+                    tracker.add_sample(time.monotonic() - started)
+                    return task.result()
+                if error is None or task is primary:
+                    error = task.exception()
+        raise error
+
+    async def _post(self, endpoint: str, body: bytes, key: str) -> dict[str, Any]:
+        """Post a request through the response cache, if any.
+
+        Fresh cached responses are returned without a request. Stale ones are revalidated with a
+        conditional request when they carry validators, and reused if the server answers 304.
+        """
+        if self.cache is None:
+            return await super()._post(endpoint, body, key)
+        cached = self.cache.get(endpoint, body)
+        if cached is not None and cached.fresh:
+            self.cache.hits += 1
+            return self._decode_response(cached.body)
+
+        headers = cached.conditional_headers() if cached is not None else None
+        response = await self._send(endpoint, body, key, headers or None)
+        if response.status == HTTP_NOT_MODIFIED and cached is not None:
+            self.cache.revalidated += 1
+            self.cache.refresh(endpoint, body, cached, response)
+            return self._decode_response(cached.body)
+
+        self.cache.misses += 1
+        result = self._decode_response(response.body)
+        if not result.get("ReturnCode"):
+            self.cache.store(endpoint, body, response)
+        return result
+
+    async def ping(self) -> dict:
+        """Fetch the dial types as a lightweight request.
+
+        Returns:
+            Response dictionary containing ReturnCode and DialTypeList.
+
+        Raises:
+            PixooCommandError: If the API returns an error or invalid response.
+            PixooConnectionError: If the request fails.
+
+        """
+        return await self.get_dial_type()
 
     async def get_dial_type(self) -> dict:
         """Fetch the list of dial types from the Divoom API."""
@@ -99,6 +287,69 @@ class Divoom(BasePixoo):
         data = {"DeviceId": device_id, "DeviceMac": device_mac, "Page": page}
         return await self._make_request("Device/GetImgLikeList", data)
 
+    def stream_dial_list(self, dial_type: str, page: int) -> AsyncIterator[dict[str, Any]]:
+        """Fetch one page of dials, yielding each dial as soon as it is decoded.
+
+        Unlike `get_dial_list`, the response is decoded incrementally and never held in memory as a
+        whole. Streamed requests bypass the response cache and hedging.
+
+        Args:
+            dial_type: The type of dial (e.g., "Social", "Game").
+            page: The page number to fetch (30 items per page).
+
+        Returns:
+            Async iterator of the DialList items.
+
+        """
+        return self._stream_items("Channel/GetDialList", {"DialType": dial_type, "Page": page}, "DialList")
+
+    def stream_img_upload_list(self, device_id: int, device_mac: str, page: int = 1) -> AsyncIterator[dict[str, Any]]:
+        """Fetch one page of uploaded images, yielding each image as soon as it is decoded.
+
+        Args:
+            device_id: The ID of the device.
+            device_mac: The MAC address of the device.
+            page: The page number to fetch (default: 1).
+
+        Returns:
+            Async iterator of the ImgList items.
+
+        Raises:
+            ValueError: If device_id or device_mac is not provided.
+
+        """
+        return self._stream_images("Device/GetImgUploadList", device_id, device_mac, page)
+
+    def stream_img_like_list(self, device_id: int, device_mac: str, page: int = 1) -> AsyncIterator[dict[str, Any]]:
+        """Fetch one page of liked images, yielding each image as soon as it is decoded.
+
+        Args:
+            device_id: The ID of the device.
+            device_mac: The MAC address of the device.
+            page: The page number to fetch (default: 1).
+
+        Returns:
+            Async iterator of the ImgList items.
+
+        Raises:
+            ValueError: If device_id or device_mac is not provided.
+
+        """
+        return self._stream_images("Device/GetImgLikeList", device_id, device_mac, page)
+
+    def _stream_images(
+            self,
+            endpoint: str,
+            device_id: int,
+            device_mac: str,
+            page: int,
+    ) -> AsyncIterator[dict[str, Any]]:
+        """Stream the ImgList of an image list endpoint."""
+        if not device_id or not device_mac:
+            msg = "DeviceId and DeviceMac must be provided."
+            raise ValueError(msg)
+        return self._stream_items(endpoint, {"DeviceId": device_id, "DeviceMac": device_mac, "Page": page}, "ImgList")
+
     async def get_local_device_list(self) -> dict:
         """Fetch the list of devices on the local network.
 
@@ -111,3 +362,116 @@ class Divoom(BasePixoo):
 
         """
         return await self._make_request("Device/ReturnSameLANDevice")
+
+    @staticmethod
+    async def _iter_pages(
+            fetch: Callable[[int], Awaitable[dict]],
+            list_key: str,
+            concurrency: int,
+    ) -> AsyncIterator[dict]:
+        """Fetch page 1, then the remaining pages concurrently, yielding responses in page order.
+
+        The number of pages is taken from TotalNum. Without TotalNum, pages are fetched one after
+        another until a page is not full.
+        """
+        page = await fetch(1)
+        yield page
+        total = page.get("TotalNum")
+        if total is None:
+            number = 1
+            while len(page.get(list_key) or ()) >= PAGE_SIZE:
+                number += 1
+                page = await fetch(number)
+                yield page
+            return
+
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def fetch_limited(number: int) -> dict:
+            async with semaphore:
+                return await fetch(number)
+
+        tasks = [asyncio.ensure_future(fetch_limited(number)) for number in range(2, math.ceil(total / PAGE_SIZE) + 1)]
+        try:
+            for task in tasks:
+                yield await task
+        finally:
+            for task in tasks:
+                task.cancel()
+            # Retrieve the outcome of every prefetched page, so none is reported as never retrieved
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _iter_items(
+            self,
+            fetch: Callable[[int], Awaitable[dict]],
+            list_key: str,
+            concurrency: int,
+    ) -> AsyncIterator[dict[str, Any]]:
+        """Yield the items of every page, in order."""
+        pages = self._iter_pages(fetch, list_key, concurrency)
+        try:
+            async for page in pages:
+                for item in page.get(list_key) or ():
+                    yield item
+        finally:
+            # Stop the prefetched pages now rather than when the page iterator is garbage collected
+            await pages.aclose()
+
+    def iter_dial_list(
+            self,
+            dial_type: str,
+            concurrency: int = DEFAULT_PAGE_CONCURRENCY,
+    ) -> AsyncIterator[dict[str, Any]]:
+        """Iterate over every dial of a type, fetching the pages after the first concurrently.
+
+        Args:
+            dial_type: The type of dial (e.g., "Social", "Game").
+            concurrency: Maximum number of pages fetched at once (default: 8).
+
+        Returns:
+            Async iterator of the DialList items, in page order.
+
+        """
+        return self._iter_items(lambda page: self.get_dial_list(dial_type, page), "DialList", concurrency)
+
+    def iter_img_upload_list(
+            self,
+            device_id: int,
+            device_mac: str,
+            concurrency: int = DEFAULT_PAGE_CONCURRENCY,
+    ) -> AsyncIterator[dict[str, Any]]:
+        """Iterate over every uploaded image, fetching the pages after the first concurrently.
+
+        Args:
+            device_id: The ID of the device.
+            device_mac: The MAC address of the device.
+            concurrency: Maximum number of pages fetched at once (default: 8).
+
+        Returns:
+            Async iterator of the ImgList items, in page order.
+
+        """
+        return self._iter_items(
+            lambda page: self.get_img_upload_list(device_id, device_mac, page), "ImgList", concurrency,
+        )
+
+    def iter_img_like_list(
+            self,
+            device_id: int,
+            device_mac: str,
+            concurrency: int = DEFAULT_PAGE_CONCURRENCY,
+    ) -> AsyncIterator[dict[str, Any]]:
+        """Iterate over every liked image, fetching the pages after the first concurrently.
+
+        Args:
+            device_id: The ID of the device.
+            device_mac: The MAC address of the device.
+            concurrency: Maximum number of pages fetched at once (default: 8).
+
+        Returns:
+            Async iterator of the ImgList items, in page order.
+
+        """
+        return self._iter_items(
+            lambda page: self.get_img_like_list(device_id, device_mac, page), "ImgList", concurrency,
+        )
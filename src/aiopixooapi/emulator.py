@@ -0,0 +1,363 @@
+"""Local emulator of a Pixoo64 device, for load and integration testing.
+
+`PixooEmulator` is an aiohttp server speaking the device's `/post` JSON protocol. It keeps the
+settings the device reports in Channel/GetAllConf, decodes animations sent with Draw/SendHttpGif
+into a 64x64 framebuffer that can be inspected, and records texts and item lists.
+
+The firmware's limits are mimicked with a fixed processing latency per request, a ceiling on the
+rate request bodies are taken in, and a limit on requests processed at once; further requests
+queue, and beyond `max_pending` they are refused with 503.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import base64
+import binascii
+import collections
+import json
+import time
+from typing import TYPE_CHECKING, Any, Callable
+
+from aiohttp import web
+
+from .pixoo64 import Pixoo64
+
+if TYPE_CHECKING:
+    import types
+
+    from typing_extensions import Self
+
+SCREEN_SIZE = 64
+
+DEFAULT_STATE: dict[str, Any] = {
+    "Brightness": 100,
+    "RotationFlag": 1,
+    "ClockTime": 60,
+    "GalleryTime": 60,
+    "SingleGalleyTime": 5,
+    "PowerOnChannelId": 1,
+    "GalleryShowTimeFlag": 1,
+    "CurClockId": 1,
+    "Time24Flag": 1,
+    "TemperatureMode": 0,
+    "GyrateAngle": 0,
+    "MirrorFlag": 0,
+    "LightSwitch": 1,
+    "SelectIndex": 0,
+}
+
+# Setter command -> (payload key, state key) pairs
+_SETTERS: dict[str, tuple[tuple[str, str], ...]] = {
+    "Channel/SetBrightness": (("Brightness", "Brightness"),),
+    "Channel/SetClockSelectId": (("ClockId", "CurClockId"),),
+    "Channel/SetIndex": (("SelectIndex", "SelectIndex"),),
+    "Channel/SetCustomPageIndex": (("CustomPageIndex", "CustomPageIndex"),),
+    "Channel/SetEqPosition": (("EqPosition", "EqPosition"),),
+    "Channel/CloudIndex": (("Index", "CloudIndex"),),
+    "Channel/OnOffScreen": (("OnOff", "LightSwitch"),),
+    "Device/SetDisTempMode": (("Mode", "TemperatureMode"),),
+    "Device/SetScreenRotationAngle": (("Mode", "GyrateAngle"),),
+    "Device/SetMirrorMode": (("Mode", "MirrorFlag"),),
+    "Device/SetTime24Flag": (("Mode", "Time24Flag"),),
+    "Device/SetHighLightMode": (("Mode", "HighLightMode"),),
+    "Device/SetWhiteBalance": (("RValue", "RValue"), ("GValue", "GValue"), ("BValue", "BValue")),
+    "Sys/LogAndLat": (("Longitude", "Longitude"), ("Latitude", "Latitude")),
+    "Sys/TimeZone": (("TimeZoneValue", "TimeZoneValue"),),
+}
+
+# Commands acknowledged without an emulated effect
+_ACKNOWLEDGED = frozenset({
+    "Device/PlayBuzzer",
+    "Device/PlayTFGif",
+    "Draw/SendRemote",
+    "Draw/UseHTTPCommandSource",
+    "Tools/SetNoiseStatus",
+    "Tools/SetScoreBoard",
+    "Tools/SetStopWatch",
+    "Tools/SetTimer",
+})
+
+_OK: dict[str, Any] = {"error_code": 0}
+_ILLEGAL = {"error_code": "Request data illegal json"}
+_UNKNOWN_COMMAND = {"error_code": "Unknown command"}
+
+
+def _scale(pixels: bytes, width: int) -> bytes:
+    """Scale a square RGB frame up to the screen size by repeating pixels."""
+    if width == SCREEN_SIZE:
+        return pixels
+    factor = SCREEN_SIZE // width
+    rows = []
+    for y in range(width):
+        row = b"".join(pixels[offset:offset + 3] * factor for offset in range(y * width * 3, (y + 1) * width * 3, 3))
+        rows.append(row * factor)
+    return b"".join(rows)
+
+
+class _Animation:
+    """Frames of an animation being received with Draw/SendHttpGif."""
+
+    __slots__ = ("frames", "speed", "width")
+
+    def __init__(self, count: int, width: int, speed: int) -> None:
+        self.frames: list[bytes | None] = [None] * count
+        self.width = width
+        self.speed = speed
+
+
+class PixooEmulator:
+    """A Pixoo64 device served over HTTP on a local port.
+
+    Request counts per command are kept in `requests`, and the highest number of requests processed
+    at once in `max_active`.
+    """
+
+    def __init__(
+            self,
+            *,
+            latency: float = 0,
+            bandwidth: float | None = None,
+            concurrency: int = 1,
+            max_pending: int | None = None,
+    ) -> None:
+        """Initialize the emulator.
+
+        Args:
+            latency: Seconds spent processing each request (default: 0).
+            bandwidth: Bytes per second request bodies are taken in at (default: None, unlimited).
+            concurrency: Requests processed at once; the firmware handles one (default: 1).
+            max_pending: Requests allowed to wait for processing before further ones are refused with
+                503 (default: None, no limit).
+
+        """
+        self.latency = latency
+        self.bandwidth = bandwidth
+        self.concurrency = concurrency
+        self.max_pending = max_pending
+        self.state: dict[str, Any] = dict(DEFAULT_STATE)
+        self.texts: dict[int, dict[str, Any]] = {}
+        self.items: list[dict[str, Any]] = []
+        self.requests: collections.Counter[str] = collections.Counter()
+        self.max_active = 0
+        self.framebuffer = bytes(SCREEN_SIZE * SCREEN_SIZE * 3)
+        self.frames: list[bytes] = [self.framebuffer]
+        self.speed = 0
+        self._next_pic_id = 1
+        self._animations: dict[int, _Animation] = {}
+        self._clock_offset = 0.0
+        self._active = 0
+        self._pending = 0
+        self._semaphore: asyncio.Semaphore | None = None
+        self._runner: web.AppRunner | None = None
+        self._handlers: dict[str, Callable[[dict[str, Any]], dict[str, Any]]] = {
+            "Channel/GetAllConf": self._get_all_conf,
+            "Channel/GetClockInfo": self._get_clock_info,
+            "Channel/GetIndex": self._get_index,
+            "Device/GetDeviceTime": self._get_device_time,
+            "Device/SetUTC": self._set_utc,
+            "Device/GetWeatherInfo": self._get_weather_info,
+            "Device/SysReboot": self._sys_reboot,
+            "Draw/GetHttpGifId": self._get_http_gif_id,
+            "Draw/ResetHttpGifId": self._reset_http_gif_id,
+            "Draw/SendHttpGif": self._send_http_gif,
+            "Draw/SendHttpText": self._send_http_text,
+            "Draw/ClearHttpText": self._clear_http_text,
+            "Draw/SendHttpItemList": self._send_http_item_list,
+            "Draw/CommandList": self._command_list,
+        }
+        self.host = "127.0.0.1"
+        self.port = 0
+
+    async def __aenter__(self) -> Self:
+        """Start the server."""
+        await self.start()
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_val: BaseException | None,
+        exc_tb: types.TracebackType | None,
+    ) -> None:
+        """Stop the server."""
+        await self.close()
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> None:
+        """Start serving.
+
+        Args:
+            host: Address to listen on (default: 127.0.0.1).
+            port: Port to listen on (default: 0, any free port; see `port`).
+
+        """
+        app = web.Application(client_max_size=4 * 1024 * 1024)
+        app.router.add_post("/post", self._handle)
+        self._runner = web.AppRunner(app)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, host, port)
+        await site.start()
+        self.host, self.port = self._runner.addresses[0][:2]
+
+    def client(self, **kwargs: Any) -> Pixoo64:  # noqa: ANN401
+        """Return a Pixoo64 client for the emulator, passing keyword arguments to Pixoo64."""
+        return Pixoo64(self.host, self.port, **kwargs)
+
+    async def close(self) -> None:
+        """Stop serving."""
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    def pixel(self, x: int, y: int) -> tuple[int, int, int]:
+        """Return the RGB color of a pixel of the framebuffer."""
+        offset = (y * SCREEN_SIZE + x) * 3
+        red, green, blue = self.framebuffer[offset:offset + 3]
+        return red, green, blue
+
+    async def _handle(self, request: web.Request) -> web.Response:
+        """Answer a request once the firmware limits allow it."""
+        body = await request.read()
+        if self.max_pending is not None and self._pending >= self.max_pending:
+            raise web.HTTPServiceUnavailable
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.concurrency)
+        self._pending += 1
+        try:
+            await self._semaphore.acquire()
+        finally:
+            self._pending -= 1
+        self._active += 1
+        self.max_active = max(self.max_active, self._active)
+        try:
+            delay = self.latency + (len(body) / self.bandwidth if self.bandwidth else 0)
+            if delay:
+                await asyncio.sleep(delay)
+            try:
+                payload = json.loads(body)
+            except ValueError:
+                return web.json_response(_ILLEGAL)
+            return web.json_response(self.execute(payload) if isinstance(payload, dict) else _ILLEGAL)
+        finally:
+            self._active -= 1
+            self._semaphore.release()
+
+    def execute(self, payload: dict[str, Any]) -> dict[str, Any]:
+        """Apply a command to the emulated device, without the firmware limits.
+
+        Args:
+            payload: The request payload, with its Command.
+
+        Returns:
+            The response payload.
+
+        """
+        command = payload.get("Command")
+        self.requests[command] += 1
+        if command in _SETTERS:
+            for payload_key, state_key in _SETTERS[command]:
+                if payload_key in payload:
+                    self.state[state_key] = payload[payload_key]
+            return _OK
+        if command in _ACKNOWLEDGED:
+            return _OK
+        handler = self._handlers.get(command)
+        if handler is None:
+            return _UNKNOWN_COMMAND
+        return handler(payload)
+
+    def _get_all_conf(self, _: dict[str, Any]) -> dict[str, Any]:
+        """Return the emulated settings."""
+        return {"error_code": 0, **{key: self.state[key] for key in DEFAULT_STATE if key != "SelectIndex"}}
+
+    def _get_clock_info(self, _: dict[str, Any]) -> dict[str, Any]:
+        """Return the selected clock face and the brightness."""
+        return {"error_code": 0, "ClockId": self.state["CurClockId"], "Brightness": self.state["Brightness"]}
+
+    def _get_index(self, _: dict[str, Any]) -> dict[str, Any]:
+        """Return the selected channel."""
+        return {"error_code": 0, "SelectIndex": self.state["SelectIndex"]}
+
+    def _get_device_time(self, _: dict[str, Any]) -> dict[str, Any]:
+        """Return the emulated clock, which runs at the local clock's rate."""
+        now = time.time() + self._clock_offset
+        local = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(now))
+        return {"error_code": 0, "UTCTime": int(now), "LocalTime": local}
+
+    def _set_utc(self, payload: dict[str, Any]) -> dict[str, Any]:
+        """Set the emulated clock."""
+        self._clock_offset = payload.get("Utc", 0) - time.time()
+        return _OK
+
+    def _get_weather_info(self, _: dict[str, Any]) -> dict[str, Any]:
+        """Return fixed weather information."""
+        return {"error_code": 0, "Weather": "Sunny", "CurTemp": 20.0, "MinTemp": 15.0, "MaxTemp": 25.0}
+
+    def _sys_reboot(self, _: dict[str, Any]) -> dict[str, Any]:
+        """Restore the default settings and clear the animations and texts."""
+        self.state = dict(DEFAULT_STATE)
+        self._reset_http_gif_id({})
+        return _OK
+
+    def _get_http_gif_id(self, _: dict[str, Any]) -> dict[str, Any]:
+        """Return the PicId for the next animation."""
+        return {"error_code": 0, "PicId": self._next_pic_id}
+
+    def _reset_http_gif_id(self, _: dict[str, Any]) -> dict[str, Any]:
+        """Restart animation IDs from 1, discarding partly received animations and texts."""
+        self._next_pic_id = 1
+        self._animations.clear()
+        self.texts.clear()
+        return _OK
+
+    def _send_http_gif(self, payload: dict[str, Any]) -> dict[str, Any]:
+        """Store a frame, and play the animation once all its frames arrived."""
+        try:
+            count, width, offset = payload["PicNum"], payload["PicWidth"], payload["PicOffset"]
+            pic_id, speed = payload["PicID"], payload["PicSpeed"]
+            pixels = base64.b64decode(payload["PicData"], validate=True)
+        except (KeyError, binascii.Error):
+            return _ILLEGAL
+        if width not in (16, 32, 64) or not 0 <= offset < count or len(pixels) != width * width * 3:
+            return _ILLEGAL
+        animation = self._animations.get(pic_id)
+        if animation is None or len(animation.frames) != count:
+            animation = self._animations[pic_id] = _Animation(count, width, speed)
+        animation.frames[offset] = _scale(pixels, width)
+        if all(frame is not None for frame in animation.frames):
+            # The animation starts playing once its last frame arrives
+            del self._animations[pic_id]
+            self.frames = list(animation.frames)
+            self.framebuffer = self.frames[0]
+            self.speed = animation.speed
+            self.texts.clear()
+            self._next_pic_id = max(self._next_pic_id, pic_id + 1)
+        return _OK
+
+    def _send_http_text(self, payload: dict[str, Any]) -> dict[str, Any]:
+        """Store a text by its TextId."""
+        if "TextId" not in payload:
+            return _ILLEGAL
+        self.texts[payload["TextId"]] = payload
+        return _OK
+
+    def _clear_http_text(self, _: dict[str, Any]) -> dict[str, Any]:
+        """Remove the texts."""
+        self.texts.clear()
+        return _OK
+
+    def _send_http_item_list(self, payload: dict[str, Any]) -> dict[str, Any]:
+        """Store the item list."""
+        self.items = list(payload.get("ItemList") or ())
+        return _OK
+
+    def _command_list(self, payload: dict[str, Any]) -> dict[str, Any]:
+        """Execute the commands in order, stopping at the first error."""
+        commands = payload.get("CommandList")
+        if not isinstance(commands, list):
+            return _ILLEGAL
+        for command in commands:
+            result = self.execute(command) if isinstance(command, dict) else _ILLEGAL
+            if result.get("error_code") != 0:
+                return result
+        return _OK
@@ -0,0 +1,430 @@
+"""Provides the `PixooFleet` class, which drives many Pixoo64 devices concurrently."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import statistics
+from typing import TYPE_CHECKING, Any, Generic, TypeVar
+
+from .pixoo64 import Pixoo64
+from .timesync import DEFAULT_SAMPLES, SYSTEM_CLOCK, ClockSyncResult, sync_clock
+from .transport import AiohttpTransport, Transport
+
+if TYPE_CHECKING:
+    import types
+    from collections.abc import AsyncIterator, Awaitable, Callable, Iterable, Iterator, Mapping, Sequence
+
+    from typing_extensions import Self
+
+    from .commands import Command, FrameCommand
+    from .timesync import Clock
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+DEFAULT_CONCURRENCY = 64
+SYNC_LEAD = 0.1  # Seconds between the end of the uploads and a synchronized start
+
+
+class FleetResult(Generic[T]):
+    """Outcome of an operation on one device of a fleet."""
+
+    __slots__ = ("error", "host", "result")
+
+    def __init__(self, host: str, result: T | None = None, error: Exception | None = None) -> None:
+        """Initialize the result.
+
+        Args:
+            host: The device the operation ran on.
+            result: The value returned by the operation, if it succeeded.
+            error: The exception raised by the operation, if it failed.
+
+        """
+        self.host = host
+        self.result = result
+        self.error = error
+
+    @property
+    def ok(self) -> bool:
+        """Return whether the operation succeeded."""
+        return self.error is None
+
+    def __repr__(self) -> str:
+        """Return the host and outcome."""
+        outcome = f"error={self.error!r}" if self.error is not None else f"result={self.result!r}"
+        return f"FleetResult({self.host!r}, {outcome})"
+
+
+class DeviceSnapshot:
+    """Settings, channel and time of a device, as read by `PixooFleet.snapshot`."""
+
+    __slots__ = ("channel", "settings", "time")
+
+    def __init__(self, settings: dict[str, Any], channel: dict[str, Any], time: dict[str, Any]) -> None:
+        """Initialize the snapshot.
+
+        Args:
+            settings: Response of `Pixoo64.get_all_settings`.
+            channel: Response of `Pixoo64.get_current_channel`.
+            time: Response of `Pixoo64.get_device_time`.
+
+        """
+        self.settings = settings
+        self.channel = channel
+        self.time = time
+
+    def __repr__(self) -> str:
+        """Return the snapshot fields."""
+        return f"DeviceSnapshot(settings={self.settings!r}, channel={self.channel!r}, time={self.time!r})"
+
+
+class PixooFleet:
+    """A set of Pixoo64 devices sharing one connection pool.
+
+    Operations run on every device (or a subset) at once, with at most `concurrency` requests in
+    flight across the whole fleet. A failing device does not affect the others: its exception is
+    reported in its FleetResult.
+    """
+
+    def __init__(
+            self,
+            devices: Iterable[str | Pixoo64] = (),
+            *,
+            concurrency: int = DEFAULT_CONCURRENCY,
+            transport: Transport | None = None,
+            port: int = 80,
+            timeout: float = 10,
+    ) -> None:
+        """Initialize the fleet.
+
+        Args:
+            devices: Hosts or Pixoo64 clients; hosts get a client on the fleet's shared transport.
+            concurrency: Maximum number of operations running at once across the fleet (default: 64).
+            transport: Transport shared by the clients created for hosts
+                (default: an AiohttpTransport owned by the fleet).
+            port: Port of the devices given as hosts (default: 80).
+            timeout: Request timeout in seconds for the devices given as hosts (default: 10).
+
+        """
+        self.concurrency = concurrency
+        self.port = port
+        self.timeout = timeout
+        self._owns_transport = transport is None
+        self._transport = transport if transport is not None else AiohttpTransport(limit=concurrency)
+        self._semaphore: asyncio.Semaphore | None = None
+        self._devices: dict[str, Pixoo64] = {}
+        for device in devices:
+            self.add(device)
+
+    @property
+    def transport(self) -> Transport:
+        """Return the transport shared by the clients created for hosts."""
+        return self._transport
+
+    def add(self, device: str | Pixoo64) -> Pixoo64:
+        """Add a device to the fleet.
+
+        Args:
+            device: A host, which gets a client on the shared transport, or a Pixoo64 client.
+
+        Returns:
+            The client for the device.
+
+        """
+        if isinstance(device, str):
+            device = Pixoo64(device, self.port, self.timeout, transport=self._transport)
+        self._devices[device.host] = device
+        return device
+
+    def __getitem__(self, host: str) -> Pixoo64:
+        """Return the client for a host."""
+        return self._devices[host]
+
+    def __contains__(self, host: object) -> bool:
+        """Return whether a host is part of the fleet."""
+        return host in self._devices
+
+    def __iter__(self) -> Iterator[Pixoo64]:
+        """Iterate over the clients."""
+        return iter(self._devices.values())
+
+    def __len__(self) -> int:
+        """Return the number of devices."""
+        return len(self._devices)
+
+    async def __aenter__(self) -> Self:
+        """Async context manager entry."""
+        await self.connect()
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_val: BaseException | None,
+        exc_tb: types.TracebackType | None,
+    ) -> None:
+        """Async context manager exit."""
+        await self.close()
+
+    async def connect(self) -> None:
+        """Start the shared transport."""
+        await self._transport.start()
+
+    async def close(self) -> None:
+        """Close the clients, and the shared transport if the fleet created it."""
+        await asyncio.gather(*(device.close() for device in self._devices.values()))
+        if self._owns_transport:
+            await self._transport.close()
+
+    def _select(self, hosts: Iterable[str] | None) -> list[Pixoo64]:
+        """Return the clients for the given hosts, or all clients."""
+        if hosts is None:
+            return list(self._devices.values())
+        return [self._devices[host] for host in hosts]
+
+    async def _run(self, device: Pixoo64, func: Callable[[Pixoo64], Awaitable[T]]) -> FleetResult[T]:
+        """Run an operation on one device under the fleet's concurrency limit."""
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.concurrency)
+        async with self._semaphore:
+            try:
+                return FleetResult(device.host, await func(device))
+            except Exception as err:  # noqa: BLE001, One device failing must not affect the others
+                logger.debug("Fleet operation failed on %s: %s", device.host, err)
+                return FleetResult(device.host, error=err)
+
+    async def map(
+            self,
+            func: Callable[[Pixoo64], Awaitable[T]],
+            hosts: Iterable[str] | None = None,
+            *,
+            deadline: float | None = None,
+    ) -> AsyncIterator[FleetResult[T]]:
+        """Run an operation on many devices, yielding results in completion order.
+
+        Args:
+            func: Callable taking a client and returning the awaitable to run.
+            hosts: Hosts to run on (default: every device).
+            deadline: Seconds after which devices that have not finished are cancelled and reported
+                with an asyncio.TimeoutError (default: None, wait for every device).
+
+        Yields:
+            A FleetResult per device, as soon as its operation finishes.
+
+        """
+        tasks = {asyncio.ensure_future(self._run(device, func)): device.host for device in self._select(hosts)}
+        loop = asyncio.get_running_loop()
+        expires = None if deadline is None else loop.time() + deadline
+        pending = set(tasks)
+        try:
+            while pending:
+                timeout = None if expires is None else max(expires - loop.time(), 0)
+                done, pending = await asyncio.wait(pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    yield task.result()
+                if not done:
+                    for task in pending:
+                        yield FleetResult(tasks[task], error=asyncio.TimeoutError(f"No result within {deadline}s"))
+                    return
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    def broadcast(
+            self,
+            method: str,
+            *args: Any,  # noqa: ANN401
+            hosts: Iterable[str] | None = None,
+            **kwargs: Any,  # noqa: ANN401
+    ) -> AsyncIterator[FleetResult[dict]]:
+        """Call the same Pixoo64 method on many devices, yielding results in completion order.
+
+        Args:
+            method: Name of the Pixoo64 method to call (e.g. "set_brightness").
+            *args: Positional arguments for the method.
+            hosts: Hosts to call the method on (default: every device).
+            **kwargs: Keyword arguments for the method.
+
+        Returns:
+            Async iterator of a FleetResult per device.
+
+        """
+        return self.map(lambda device: getattr(device, method)(*args, **kwargs), hosts)
+
+    def broadcast_command(
+            self,
+            command: Command,
+            hosts: Iterable[str] | None = None,
+            pic_ids: Mapping[str, int] | None = None,
+    ) -> AsyncIterator[FleetResult[dict]]:
+        """Send one prebuilt command to many devices, serializing it only once.
+
+        Every device is sent the command's cached body. For a FrameCommand, `pic_ids` patches in a
+        per-device animation ID without serializing the frame data again.
+
+        Args:
+            command: The command to send.
+            hosts: Hosts to send the command to (default: every device).
+            pic_ids: Animation ID per host for a FrameCommand (default: the command's own PicID).
+
+        Returns:
+            Async iterator of a FleetResult per device.
+
+        """
+        if pic_ids is None:
+            return self.map(lambda device: device.send_command(command), hosts)
+        return self.map(lambda device: device.send_command(command, pic_ids.get(device.host)), hosts)
+
+    def snapshot(
+            self,
+            hosts: Iterable[str] | None = None,
+            *,
+            deadline: float | None = None,
+    ) -> AsyncIterator[FleetResult[DeviceSnapshot]]:
+        """Read the settings, current channel and time of many devices, yielding each as it arrives.
+
+        Each device is queried with `get_all_settings`, `get_current_channel` and `get_device_time`
+        in turn, using one slot of the fleet's concurrency limit.
+
+        Args:
+            hosts: Hosts to read (default: every device).
+            deadline: Seconds after which devices that have not answered are reported with an
+                asyncio.TimeoutError (default: None, wait for every device).
+
+        Returns:
+            Async iterator of a FleetResult with a DeviceSnapshot per device.
+
+        """
+
+        async def read(device: Pixoo64) -> DeviceSnapshot:
+            settings = await device.get_all_settings()
+            channel = await device.get_current_channel()
+            return DeviceSnapshot(settings, channel, await device.get_device_time())
+
+        return self.map(read, hosts, deadline=deadline)
+
+    def sync_clocks(
+            self,
+            hosts: Iterable[str] | None = None,
+            samples: int = DEFAULT_SAMPLES,
+            *,
+            clock: Clock = SYSTEM_CLOCK,
+    ) -> AsyncIterator[FleetResult[ClockSyncResult]]:
+        """Set the clocks of many devices to the local clock, compensating for each device's latency.
+
+        See `aiopixooapi.timesync.sync_clock`.
+
+        Args:
+            hosts: Hosts to synchronize (default: every device).
+            samples: Number of requests to time per measurement (default: 4).
+            clock: Source of the local time the devices are set to (default: the system clock).
+
+        Returns:
+            Async iterator of a FleetResult per device, whose ClockSyncResult reports the residual skew.
+
+        """
+        return self.map(lambda device: sync_clock(device, samples, clock=clock), hosts)
+
+    @staticmethod
+    async def _upload_all_but_last(
+            device: Pixoo64,
+            frames: Sequence[FrameCommand],
+            pic_id: int | None,
+            clock: Clock,
+    ) -> tuple[int, float]:
+        """Upload all frames but the last; return the PicID and the estimated one-way delay."""
+        if pic_id is None:
+            pic_id = (await device.get_http_gif_id())["PicId"]
+        round_trips = []
+        for frame in frames[:-1]:
+            started = clock.monotonic()
+            await device.send_command(frame, pic_id)
+            round_trips.append(clock.monotonic() - started)
+        if not round_trips:
+            # A single-frame animation has nothing to upload ahead, time a small request instead
+            started = clock.monotonic()
+            await device.get_http_gif_id()
+            round_trips.append(clock.monotonic() - started)
+        return pic_id, statistics.median(round_trips) / 2
+
+    async def play_synchronized(
+            self,
+            frames: Sequence[FrameCommand],
+            hosts: Iterable[str] | None = None,
+            *,
+            pic_ids: Mapping[str, int] | None = None,
+            lead: float = SYNC_LEAD,
+            clock: Clock = SYSTEM_CLOCK,
+    ) -> dict[str, FleetResult[dict]]:
+        """Start an animation on many devices at the same moment.
+
+        A device starts playing once it has the final frame. Every frame but the last is uploaded to
+        every device first, timing each upload. The final frame is then sent to each device half its
+        median upload round trip ahead of a common start time, so that it arrives at the same moment
+        everywhere. The final sends are not held back by the fleet's concurrency limit.
+
+        Args:
+            frames: Every frame of the animation, ordered by PicOffset.
+            hosts: Hosts to play the animation on (default: every device).
+            pic_ids: Animation ID per host (default: the next ID reported by each device).
+            lead: Seconds between the end of the uploads and the start (default: 0.1).
+            clock: Source of the upload timings and of the wait for the start (default: the system clock).
+
+        Returns:
+            Dictionary mapping each host to the FleetResult of its final frame, or of the upload that failed.
+
+        Raises:
+            ValueError: If the frames are not a complete animation in order.
+
+        """
+        if not frames or any(
+            frame.payload["PicOffset"] != offset or frame.payload["PicNum"] != len(frames)
+            for offset, frame in enumerate(frames)
+        ):
+            msg = "Frames must be a complete animation, ordered by PicOffset."
+            raise ValueError(msg)
+
+        def upload(device: Pixoo64) -> Awaitable[tuple[int, float]]:
+            pic_id = pic_ids.get(device.host) if pic_ids is not None else None
+            return self._upload_all_but_last(device, frames, pic_id, clock)
+
+        results: dict[str, FleetResult[Any]] = {}
+        ready: dict[str, tuple[int, float]] = {}
+        async for result in self.map(upload, hosts):
+            if result.ok:
+                ready[result.host] = result.result
+            else:
+                results[result.host] = result
+        start = clock.monotonic() + lead + max((one_way for _, one_way in ready.values()), default=0.0)
+
+        async def release(host: str) -> FleetResult[dict]:
+            pic_id, one_way = ready[host]
+            await clock.sleep(start - one_way - clock.monotonic())
+            try:
+                return FleetResult(host, await self._devices[host].send_command(frames[-1], pic_id))
+            except Exception as err:  # noqa: BLE001, One device failing must not affect the others
+                logger.debug("Synchronized start failed on %s: %s", host, err)
+                return FleetResult(host, error=err)
+
+        for result in await asyncio.gather(*(release(host) for host in ready)):
+            results[result.host] = result
+        return results
+
+    async def gather(
+            self,
+            func: Callable[[Pixoo64], Awaitable[T]],
+            hosts: Iterable[str] | None = None,
+    ) -> dict[str, FleetResult[T]]:
+        """Run an operation on many devices and wait for all of them.
+
+        Args:
+            func: Callable taking a client and returning the awaitable to run.
+            hosts: Hosts to run on (default: every device).
+
+        Returns:
+            Dictionary mapping each host to its FleetResult.
+
+        """
+        return {result.host: result async for result in self.map(func, hosts)}
@@ -0,0 +1,204 @@
+"""HTTP-aware response cache for the Divoom online API.
+
+`ResponseCache` keeps successful responses keyed by endpoint and request body. A response is fresh
+for the `max-age` the server sends in Cache-Control (or until its Expires date), and otherwise for
+the TTL configured for its endpoint. Stale responses carrying an ETag or Last-Modified validator are
+revalidated with a conditional request, so an unchanged response costs a 304 without a body.
+
+A cache can be given to any number of `Divoom` clients; `ResponseCache.shared()` returns one
+instance for the whole process.
+"""
+
+from __future__ import annotations
+
+import email.utils
+import time
+from collections import OrderedDict
+from typing import TYPE_CHECKING, ClassVar
+
+if TYPE_CHECKING:
+    from collections.abc import Mapping
+
+    from .transport import TransportResponse
+
+DEFAULT_MAX_ENTRIES = 1024
+
+
+def _cache_control(headers: Mapping[str, str]) -> dict[str, str]:
+    """Return the Cache-Control directives of a response, lowercased, with their values."""
+    directives = {}
+    for directive in headers.get("Cache-Control", "").split(","):
+        name, _, value = directive.strip().partition("=")
+        if name:
+            directives[name.lower()] = value.strip('"')
+    return directives
+
+
+def _seconds_until(date: str) -> float:
+    """Return the seconds until an HTTP date, zero if it is past or invalid."""
+    try:
+        moment = email.utils.parsedate_to_datetime(date)
+    except (TypeError, ValueError):
+        return 0
+    return max(moment.timestamp() - time.time(), 0)
+
+
+class CachedResponse:
+    """A cached response body with its validators and the time it stops being fresh."""
+
+    __slots__ = ("body", "etag", "expires", "last_modified")
+
+    def __init__(self, body: bytes, etag: str | None, last_modified: str | None, expires: float) -> None:
+        """Initialize the entry.
+
+        Args:
+            body: Raw response body.
+            etag: ETag validator of the response, if any.
+            last_modified: Last-Modified validator of the response, if any.
+            expires: Monotonic time the response stops being fresh.
+
+        """
+        self.body = body
+        self.etag = etag
+        self.last_modified = last_modified
+        self.expires = expires
+
+    @property
+    def fresh(self) -> bool:
+        """Return whether the response can be used without contacting the server."""
+        return time.monotonic() < self.expires
+
+    def conditional_headers(self) -> dict[str, str]:
+        """Return the headers revalidating the response, empty without validators."""
+        headers = {}
+        if self.etag is not None:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified is not None:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class ResponseCache:
+    """Least-recently-used cache of API responses with HTTP freshness and validation.
+
+    Hits, conditional revalidations answered with 304 and misses are counted in `hits`,
+    `revalidated` and `misses`.
+    """
+
+    _shared: ClassVar[ResponseCache | None] = None
+
+    def __init__(
+            self,
+            ttls: Mapping[str, float] | None = None,
+            *,
+            default_ttl: float = 0,
+            max_entries: int = DEFAULT_MAX_ENTRIES,
+    ) -> None:
+        """Initialize the cache.
+
+        Args:
+            ttls: Seconds a response stays fresh per endpoint (e.g. {"Channel/GetDialType": 3600}),
+                used when the server does not send a freshness lifetime.
+            default_ttl: Seconds a response of any other endpoint stays fresh (default: 0, always
+                revalidated or fetched again).
+            max_entries: Maximum number of responses kept (default: 1024).
+
+        """
+        self.ttls = dict(ttls or {})
+        self.default_ttl = default_ttl
+        self.max_entries = max_entries
+        self.hits = 0
+        self.revalidated = 0
+        self.misses = 0
+        self._entries: OrderedDict[tuple[str, bytes], CachedResponse] = OrderedDict()
+
+    @classmethod
+    def shared(cls) -> ResponseCache:
+        """Return the cache shared by the whole process, creating it on first use."""
+        if cls._shared is None:
+            cls._shared = cls()
+        return cls._shared
+
+    def __len__(self) -> int:
+        """Return the number of cached responses."""
+        return len(self._entries)
+
+    def get(self, endpoint: str, body: bytes) -> CachedResponse | None:
+        """Return the cached response to a request, fresh or not, or None if it is not cached.
+
+        Args:
+            endpoint: API endpoint.
+            body: Serialized request payload.
+
+        Returns:
+            The cached response, which is marked as recently used.
+
+        """
+        entry = self._entries.get((endpoint, body))
+        if entry is not None:
+            self._entries.move_to_end((endpoint, body))
+        return entry
+
+    def _lifetime(self, endpoint: str, headers: Mapping[str, str]) -> float | None:
+        """Return the seconds a response stays fresh, or None if it must not be stored."""
+        directives = _cache_control(headers)
+        if "no-store" in directives:
+            return None
+        if "no-cache" in directives:
+            return 0
+        if "max-age" in directives:
+            try:
+                return max(int(directives["max-age"]) - int(headers.get("Age", 0)), 0)
+            except ValueError:
+                return 0
+        if "Expires" in headers:
+            return _seconds_until(headers["Expires"])
+        return self.ttls.get(endpoint, self.default_ttl)
+
+    def store(self, endpoint: str, body: bytes, response: TransportResponse) -> None:
+        """Cache a successful response, unless the server forbids it or it could never be reused.
+
+        Args:
+            endpoint: API endpoint.
+            body: Serialized request payload.
+            response: The response.
+
+        """
+        lifetime = self._lifetime(endpoint, response.headers)
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
+        key = (endpoint, body)
+        if lifetime is None or (not lifetime and etag is None and last_modified is None):
+            self._entries.pop(key, None)
+            return
+        self._insert(key, CachedResponse(response.body, etag, last_modified, time.monotonic() + lifetime))
+
+    def _insert(self, key: tuple[str, bytes], entry: CachedResponse) -> None:
+        """Store an entry as the most recently used, evicting the least recently used beyond the limit."""
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def refresh(self, endpoint: str, body: bytes, entry: CachedResponse, response: TransportResponse) -> None:
+        """Renew a cached response after the server answered a conditional request with 304.
+
+        Args:
+            endpoint: API endpoint.
+            body: Serialized request payload.
+            entry: The revalidated entry, stored again if it was evicted in the meantime.
+            response: The 304 response, whose headers update the freshness and validators.
+
+        """
+        entry.etag = response.headers.get("ETag", entry.etag)
+        entry.last_modified = response.headers.get("Last-Modified", entry.last_modified)
+        entry.expires = time.monotonic() + (self._lifetime(endpoint, response.headers) or 0)
+        self._insert((endpoint, body), entry)
+
+    def invalidate(self, endpoint: str | None = None) -> None:
+        """Drop the cached responses of an endpoint, or all of them."""
+        if endpoint is None:
+            self._entries.clear()
+            return
+        for key in [key for key in self._entries if key[0] == endpoint]:
+            del self._entries[key]
@@ -0,0 +1,156 @@
+"""Incremental decoding of JSON responses carrying a large array.
+
+`ArrayItemParser` is fed a JSON object chunk by chunk and returns the items of one of its array
+members (e.g. "DialList") as soon as each is complete, so only the item being received is buffered.
+The other members, such as ReturnCode and TotalNum, are decoded when the object ends.
+
+Only structural characters are examined between items, found with regular expressions, so the
+scan runs at C speed and each item is decoded once by the json module.
+"""
+
+from __future__ import annotations
+
+import json
+import re
+from typing import Any
+
+_STRUCTURE = re.compile(rb'[\[\]{},"]')
+_STRING_SPECIAL = re.compile(rb'["\\]')
+
+_OPEN_OBJECT, _OPEN_ARRAY = ord("{"), ord("[")
+_CLOSE_OBJECT, _CLOSE_ARRAY = ord("}"), ord("]")
+_COMMA, _QUOTE, _BACKSLASH = ord(","), ord('"'), ord("\\")
+
+
+class ArrayItemParser:
+    """Incremental parser yielding the items of one array member of a JSON object."""
+
+    def __init__(self, key: str) -> None:
+        """Initialize the parser.
+
+        Args:
+            key: Name of the top-level array member whose items are returned (e.g. "DialList").
+
+        """
+        self.key = key
+        self._buffer = b""
+        self._pos = 0  # Next byte of the buffer to scan
+        self._depth = 0
+        self._in_string = False
+        self._string_start = 0
+        self._expect_key = False  # The next string at depth 1 is a member name
+        self._last_key: str | None = None
+        self._in_array = False
+        self._item_start = 0
+        self._flushed = 0  # Bytes of the buffer already copied to the envelope
+        self._envelope = bytearray()  # The object without the items of the array
+
+    def feed(self, chunk: bytes) -> list[Any]:
+        """Parse a chunk of the object.
+
+        Args:
+            chunk: The next bytes of the response body.
+
+        Returns:
+            The items of the array completed by this chunk, in order.
+
+        Raises:
+            ValueError: If an item is not valid JSON.
+
+        """
+        items: list[Any] = []
+        buffer = self._buffer + chunk
+        pos = self._pos
+        while True:
+            if self._in_string:
+                match = _STRING_SPECIAL.search(buffer, pos)
+                if match is None:
+                    pos = len(buffer)
+                    break
+                if buffer[match.start()] == _BACKSLASH:
+                    if match.end() >= len(buffer):
+                        # Wait for the escaped character
+                        pos = match.start()
+                        break
+                    pos = match.end() + 1
+                    continue
+                pos = match.end()
+                self._in_string = False
+                if self._expect_key and self._depth == 1:
+                    self._last_key = json.loads(buffer[self._string_start:pos])
+                    self._expect_key = False
+                continue
+
+            match = _STRUCTURE.search(buffer, pos)
+            if match is None:
+                pos = len(buffer)
+                break
+            pos = match.end()
+            self._structural(buffer, match.start(), items)
+
+        self._pos = pos
+        self._trim(buffer)
+        return items
+
+    def _structural(self, buffer: bytes, index: int, items: list[Any]) -> None:
+        """Handle the structural character at an index of the buffer."""
+        char = buffer[index]
+        if char == _QUOTE:
+            self._in_string = True
+            self._string_start = index
+        elif char in (_OPEN_OBJECT, _OPEN_ARRAY):
+            self._depth += 1
+            if self._depth == 1:
+                self._expect_key = True
+            elif self._depth == 2 and char == _OPEN_ARRAY and self._last_key == self.key:  # noqa: PLR2004
+                self._in_array = True
+                self._envelope += buffer[self._flushed:index + 1]
+                self._item_start = index + 1
+        elif char in (_CLOSE_OBJECT, _CLOSE_ARRAY):
+            if self._in_array and self._depth == 2:  # noqa: PLR2004
+                item = buffer[self._item_start:index].strip()
+                if item:
+                    items.append(json.loads(item))
+                self._in_array = False
+                self._flushed = index
+            self._depth -= 1
+        elif self._depth == 1:
+            self._expect_key = True
+        elif self._in_array and self._depth == 2:  # noqa: PLR2004
+            items.append(json.loads(buffer[self._item_start:index]))
+            self._item_start = index + 1
+
+    def _trim(self, buffer: bytes) -> None:
+        """Keep only the part of the buffer still needed: the current item, key, or unscanned bytes."""
+        if self._in_array:
+            keep = self._item_start
+        else:
+            keep = self._string_start if self._in_string else self._pos
+            self._envelope += buffer[self._flushed:keep]
+            self._flushed = keep
+        self._buffer = buffer[keep:]
+        self._pos -= keep
+        self._item_start -= keep
+        self._string_start -= keep
+        self._flushed -= keep
+
+    def close(self) -> dict[str, Any]:
+        """Finish parsing.
+
+        Returns:
+            The object, with the array member emptied since its items were already returned.
+
+        Raises:
+            ValueError: If the object is incomplete or not valid JSON.
+
+        """
+        if self._depth or self._in_string or self._in_array:
+            msg = "Incomplete JSON response"
+            raise ValueError(msg)
+        self._envelope += self._buffer[self._flushed:]
+        self._buffer = b""
+        result = json.loads(bytes(self._envelope))
+        if not isinstance(result, dict):
+            msg = "JSON response is not an object"
+            raise ValueError(msg)  # noqa: TRY004
+        return result
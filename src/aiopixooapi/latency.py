@@ -0,0 +1,125 @@
+"""Provides latency estimators used to derive request timeouts and hedging delays."""
+
+from __future__ import annotations
+
+import bisect
+import math
+from collections import deque
+
+CLOCK_GRANULARITY = 0.01  # Lower bound for the variance term, in seconds
+RTT_ALPHA = 1 / 8  # Gain for the smoothed round-trip time (RFC 6298)
+RTT_BETA = 1 / 4  # Gain for the round-trip time variation (RFC 6298)
+RTT_K = 4  # Variance multiplier for the retransmission timeout (RFC 6298)
+MAX_BACKOFF = 64
+DEFAULT_LATENCY_WINDOW = 256  # Latest samples kept by a LatencyTracker
+
+
+class RttEstimator:
+    """Round-trip time estimator following TCP's SRTT/RTTVAR algorithm (RFC 6298).
+
+    The timeout derived from the estimate doubles on every reported timeout and snaps back on
+    the next successful sample.
+    """
+
+    __slots__ = ("_backoff", "rttvar", "samples", "srtt")
+
+    def __init__(self) -> None:
+        """Initialize an estimator without samples."""
+        self.srtt: float | None = None
+        self.rttvar: float = 0.0
+        self.samples = 0
+        self._backoff = 1
+
+    @classmethod
+    def restore(cls, srtt: float, rttvar: float, samples: int) -> RttEstimator:
+        """Return an estimator continuing from saved values, e.g. after a restart.
+
+        Args:
+            srtt: The saved smoothed round-trip time in seconds.
+            rttvar: The saved round-trip time variation in seconds.
+            samples: The number of samples the saved values were derived from.
+
+        Returns:
+            The estimator.
+
+        """
+        estimator = cls()
+        estimator.srtt = srtt
+        estimator.rttvar = rttvar
+        estimator.samples = samples
+        return estimator
+
+    def add_sample(self, rtt: float) -> None:
+        """Add a measured round-trip time.
+
+        Args:
+            rtt: The measured round-trip time in seconds.
+
+        """
+        if self.srtt is None:
+            self.srtt = rtt
+            self.rttvar = rtt / 2
+        else:
+            self.rttvar = (1 - RTT_BETA) * self.rttvar + RTT_BETA * abs(self.srtt - rtt)
+            self.srtt = (1 - RTT_ALPHA) * self.srtt + RTT_ALPHA * rtt
+        self.samples += 1
+        self._backoff = 1
+
+    def backoff(self) -> None:
+        """Double the derived timeout after a request timed out."""
+        self._backoff = min(self._backoff * 2, MAX_BACKOFF)
+
+    @property
+    def rto(self) -> float | None:
+        """Return the derived timeout in seconds, or None without samples."""
+        if self.srtt is None:
+            return None
+        return (self.srtt + max(CLOCK_GRANULARITY, RTT_K * self.rttvar)) * self._backoff
+
+
+class LatencyTracker:
+    """Percentiles of the latest latency samples, over a sliding window.
+
+    The samples are kept both in arrival order, to drop the oldest, and sorted, so a percentile is
+    read by index.
+    """
+
+    __slots__ = ("_sorted", "_window")
+
+    def __init__(self, window: int = DEFAULT_LATENCY_WINDOW) -> None:
+        """Initialize a tracker without samples.
+
+        Args:
+            window: Number of latest samples the percentiles are computed over (default: 256).
+
+        """
+        self._window: deque[float] = deque(maxlen=window)
+        self._sorted: list[float] = []
+
+    @property
+    def samples(self) -> int:
+        """Return the number of samples in the window."""
+        return len(self._sorted)
+
+    def add_sample(self, latency: float) -> None:
+        """Add a measured latency in seconds, dropping the oldest sample if the window is full."""
+        if len(self._window) == self._window.maxlen:
+            oldest = self._window[0]
+            del self._sorted[bisect.bisect_left(self._sorted, oldest)]
+        self._window.append(latency)
+        bisect.insort(self._sorted, latency)
+
+    def percentile(self, percentile: float) -> float | None:
+        """Return a percentile of the samples, or None without samples.
+
+        Args:
+            percentile: The percentile, from 0 to 100 (nearest-rank).
+
+        Returns:
+            The smallest sample that is at least as large as the given percentage of samples.
+
+        """
+        if not self._sorted:
+            return None
+        rank = math.ceil(percentile * len(self._sorted) / 100)
+        return self._sorted[min(max(rank, 1), len(self._sorted)) - 1]
@@ -0,0 +1,313 @@
+"""Typed response models for the Pixoo64 and Divoom APIs.
+
+The client methods return plain dictionaries; wrap a response in a model for attribute access,
+e.g. `AllSettings.from_response(await pixoo.get_all_settings())`. Models use `__slots__`, and
+the item models of lists such as `DialList`, `FontList` and `ImgList` are only built on first
+access, after which the raw list is released. The response is already decoded from JSON by then, so
+this defers model construction, not parsing. Keys missing from a response read as None.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any, ClassVar, TypeVar
+
+if TYPE_CHECKING:
+    from collections.abc import Mapping
+
+    from typing_extensions import Self
+
+_ModelT = TypeVar("_ModelT", bound="ResponseModel")
+
+
+class ResponseModel:
+    """Base class for response models, filling slots from response keys."""
+
+    __slots__ = ()
+
+    # (attribute, response key) pairs copied from the response on construction
+    _FIELDS: ClassVar[tuple[tuple[str, str], ...]] = ()
+
+    def __init__(self, response: Mapping[str, Any]) -> None:
+        """Initialize the model from a response dictionary.
+
+        Args:
+            response: The response dictionary.
+
+        """
+        for attribute, key in self._FIELDS:
+            setattr(self, attribute, response.get(key))
+
+    @classmethod
+    def from_response(cls, response: Mapping[str, Any]) -> Self:
+        """Create the model from a response dictionary.
+
+        Args:
+            response: The response dictionary.
+
+        Returns:
+            The model.
+
+        """
+        return cls(response)
+
+    def __repr__(self) -> str:
+        """Return the model fields."""
+        fields = ", ".join(f"{attribute}={getattr(self, attribute)!r}" for attribute, _ in self._FIELDS)
+        return f"{type(self).__name__}({fields})"
+
+    def __eq__(self, other: object) -> bool:
+        """Compare the model fields."""
+        if type(other) is not type(self):
+            return NotImplemented
+        return all(getattr(self, attribute) == getattr(other, attribute) for attribute, _ in self._FIELDS)
+
+    __hash__ = None  # type: ignore[assignment]
+
+
+class _LazyListModel(ResponseModel):
+    """Response model holding a list whose item models are built on first access."""
+
+    __slots__ = ("_items", "_raw_items")
+
+    _LIST_KEY: ClassVar[str]
+    _ITEMS: ClassVar[str]  # Name of the property returning the item models
+
+    def __init__(self, response: Mapping[str, Any]) -> None:
+        super().__init__(response)
+        self._raw_items: list[Mapping[str, Any]] | None = response.get(self._LIST_KEY) or []
+        self._items: tuple[Any, ...] | None = None
+
+    def _decode(self, item_type: type[_ModelT]) -> tuple[_ModelT, ...]:
+        """Build the item models on first use and release the raw list."""
+        if self._items is None:
+            self._items = tuple(item_type(item) for item in self._raw_items or ())
+            self._raw_items = None
+        return self._items
+
+    def __len__(self) -> int:
+        """Return the number of items, without decoding them."""
+        return len(self._items) if self._items is not None else len(self._raw_items or ())
+
+    def __repr__(self) -> str:
+        """Return the model fields and items."""
+        fields = [f"{attribute}={getattr(self, attribute)!r}" for attribute, _ in self._FIELDS]
+        fields.append(f"{self._ITEMS}={getattr(self, self._ITEMS)!r}")
+        return f"{type(self).__name__}({', '.join(fields)})"
+
+    def __eq__(self, other: object) -> bool:
+        """Compare the model fields and items."""
+        equal = super().__eq__(other)
+        if equal is not True:
+            return equal
+        return getattr(self, self._ITEMS) == getattr(other, self._ITEMS)
+
+    __hash__ = None  # type: ignore[assignment]
+
+
+# Pixoo64 device responses
+
+
+class AllSettings(ResponseModel):
+    """Settings returned by `Pixoo64.get_all_settings` (Channel/GetAllConf)."""
+
+    __slots__ = (
+        "brightness",
+        "clock_time",
+        "cur_clock_id",
+        "gallery_show_time_flag",
+        "gallery_time",
+        "gyrate_angle",
+        "light_switch",
+        "mirror_flag",
+        "power_on_channel_id",
+        "rotation_flag",
+        "single_gallery_time",
+        "temperature_mode",
+        "time24_flag",
+    )
+
+    _FIELDS = (
+        ("brightness", "Brightness"),
+        ("rotation_flag", "RotationFlag"),
+        ("clock_time", "ClockTime"),
+        ("gallery_time", "GalleryTime"),
+        ("single_gallery_time", "SingleGalleyTime"),
+        ("power_on_channel_id", "PowerOnChannelId"),
+        ("gallery_show_time_flag", "GalleryShowTimeFlag"),
+        ("cur_clock_id", "CurClockId"),
+        ("time24_flag", "Time24Flag"),
+        ("temperature_mode", "TemperatureMode"),
+        ("gyrate_angle", "GyrateAngle"),
+        ("mirror_flag", "MirrorFlag"),
+        ("light_switch", "LightSwitch"),
+    )
+
+
+class ClockInfo(ResponseModel):
+    """Clock face and brightness returned by `Pixoo64.get_clock_info`."""
+
+    __slots__ = ("brightness", "clock_id")
+
+    _FIELDS = (("clock_id", "ClockId"), ("brightness", "Brightness"))
+
+
+class CurrentChannel(ResponseModel):
+    """Channel returned by `Pixoo64.get_current_channel`."""
+
+    __slots__ = ("select_index",)
+
+    _FIELDS = (("select_index", "SelectIndex"),)
+
+
+class DeviceTime(ResponseModel):
+    """System time returned by `Pixoo64.get_device_time`."""
+
+    __slots__ = ("local_time", "utc_time")
+
+    _FIELDS = (("utc_time", "UTCTime"), ("local_time", "LocalTime"))
+
+
+class WeatherInfo(ResponseModel):
+    """Weather returned by `Pixoo64.get_weather_info`."""
+
+    __slots__ = (
+        "cur_temp",
+        "humidity",
+        "max_temp",
+        "min_temp",
+        "pressure",
+        "visibility",
+        "weather",
+        "wind_speed",
+    )
+
+    _FIELDS = (
+        ("weather", "Weather"),
+        ("cur_temp", "CurTemp"),
+        ("min_temp", "MinTemp"),
+        ("max_temp", "MaxTemp"),
+        ("pressure", "Pressure"),
+        ("humidity", "Humidity"),
+        ("visibility", "Visibility"),
+        ("wind_speed", "WindSpeed"),
+    )
+
+
+class HttpGifId(ResponseModel):
+    """Next animation PicId returned by `Pixoo64.get_http_gif_id`."""
+
+    __slots__ = ("pic_id",)
+
+    _FIELDS = (("pic_id", "PicId"),)
+
+
+# Divoom online API responses
+
+
+class DialTypes(ResponseModel):
+    """Dial types returned by `Divoom.get_dial_type`."""
+
+    __slots__ = ("dial_types",)
+
+    _FIELDS = (("dial_types", "DialTypeList"),)
+
+
+class Dial(ResponseModel):
+    """A dial from a `DialList`."""
+
+    __slots__ = ("clock_id", "name")
+
+    _FIELDS = (("clock_id", "ClockId"), ("name", "Name"))
+
+
+class DialListPage(_LazyListModel):
+    """A page of dials returned by `Divoom.get_dial_list`."""
+
+    __slots__ = ("total_num",)
+
+    _FIELDS = (("total_num", "TotalNum"),)
+    _LIST_KEY = "DialList"
+    _ITEMS = "dials"
+
+    @property
+    def dials(self) -> tuple[Dial, ...]:
+        """Return the dials, built on first access."""
+        return self._decode(Dial)
+
+
+class Font(ResponseModel):
+    """A font from a `FontList`."""
+
+    __slots__ = ("charset", "height", "id", "name", "type", "width")
+
+    _FIELDS = (
+        ("id", "id"),
+        ("name", "name"),
+        ("width", "width"),
+        ("height", "high"),
+        ("charset", "charset"),
+        ("type", "type"),
+    )
+
+
+class FontList(_LazyListModel):
+    """Fonts returned by `Divoom.get_font_list`."""
+
+    __slots__ = ()
+
+    _LIST_KEY = "FontList"
+    _ITEMS = "fonts"
+
+    @property
+    def fonts(self) -> tuple[Font, ...]:
+        """Return the fonts, built on first access."""
+        return self._decode(Font)
+
+
+class Image(ResponseModel):
+    """An image from an `ImgList`."""
+
+    __slots__ = ("file_id", "file_name")
+
+    _FIELDS = (("file_name", "FileName"), ("file_id", "FileId"))
+
+
+class ImageListPage(_LazyListModel):
+    """A page of images returned by `Divoom.get_img_upload_list` and `Divoom.get_img_like_list`."""
+
+    __slots__ = ()
+
+    _LIST_KEY = "ImgList"
+    _ITEMS = "images"
+
+    @property
+    def images(self) -> tuple[Image, ...]:
+        """Return the images, built on first access."""
+        return self._decode(Image)
+
+
+class LocalDevice(ResponseModel):
+    """A device from a `DeviceList`."""
+
+    __slots__ = ("device_id", "device_mac", "device_name", "device_private_ip")
+
+    _FIELDS = (
+        ("device_name", "DeviceName"),
+        ("device_id", "DeviceId"),
+        ("device_private_ip", "DevicePrivateIP"),
+        ("device_mac", "DeviceMac"),
+    )
+
+
+class LocalDeviceList(_LazyListModel):
+    """Devices returned by `Divoom.get_local_device_list`."""
+
+    __slots__ = ()
+
+    _LIST_KEY = "DeviceList"
+    _ITEMS = "devices"
+
+    @property
+    def devices(self) -> tuple[LocalDevice, ...]:
+        """Return the devices, built on first access."""
+        return self._decode(LocalDevice)
@@ -2,10 +2,34 @@
 
 from __future__ import annotations
 
+import functools
+import json
+import logging
+from dataclasses import dataclass, fields
 from enum import Enum
+from typing import TYPE_CHECKING, Any, Callable
 
 from . import PixooCommandError
 from .base import BasePixoo
+from .coalesce import CommandCoalescer
+from .commands import (  # Text and frame limits are re-exported for backward compatibility
+    MAX_FONT,  # noqa: F401
+    MAX_PIC_NUM,  # noqa: F401
+    MAX_TEXT_ID,  # noqa: F401
+    MAX_TEXT_LENGTH,
+    MAX_TEXT_WIDTH,  # noqa: F401
+    MIN_TEXT_WIDTH,  # noqa: F401
+    Command,
+    FrameCommand,
+    TextCommand,
+)
+
+if TYPE_CHECKING:
+    from collections.abc import Collection, Mapping
+
+    import aiohttp
+
+    from .transport import Transport
 
 MAX_CUSTOM_PAGE_INDEX = 2  # Maximum allowed custom page index
 MAX_BRIGHTNESS = 100
@@ -14,14 +38,60 @@ MAX_MINUTE = 59
 MAX_SECOND = 59
 MAX_SCORE = 999
 NET_FILE_TYPE = 2
-MAX_PIC_NUM = 59
-MAX_TEXT_ID = 19
-MIN_TEXT_WIDTH = 17
-MAX_TEXT_WIDTH = 63
-MAX_TEXT_LENGTH = 512
-MAX_FONT = 7
 MAX_ITEM_TEXT_ID = 39
 
+# High-frequency idempotent setters coalesced when a coalesce interval is configured
+DEFAULT_COALESCED_COMMANDS = frozenset({
+    "Channel/SetBrightness",
+    "Device/SetWhiteBalance",
+    "Tools/SetScoreBoard",
+})
+
+# Commands retried when the device closed the connection before answering: reads and setters of an
+# absolute value. Reboots, buzzers, animation frames, texts and channel changes are never replayed.
+IDEMPOTENT_COMMANDS = frozenset({
+    "Channel/GetAllConf",
+    "Channel/GetClockInfo",
+    "Channel/GetIndex",
+    "Device/GetDeviceTime",
+    "Device/GetWeatherInfo",
+    "Draw/GetHttpGifId",
+    "Channel/SetBrightness",
+    "Channel/OnOffScreen",
+    "Device/SetDisTempMode",
+    "Device/SetHighLightMode",
+    "Device/SetMirrorMode",
+    "Device/SetScreenRotationAngle",
+    "Device/SetTime24Flag",
+    "Device/SetUTC",
+    "Device/SetWhiteBalance",
+    "Sys/LogAndLat",
+    "Sys/TimeZone",
+})
+
+# State keys read back by get_all_settings and get_current_channel, so `resync` can verify them.
+# Write-only settings (white balance, time zone, location, high light mode) are not among them.
+VERIFIABLE_STATE_KEYS = frozenset({
+    "Brightness",
+    "ClockTime",
+    "CurClockId",
+    "GalleryShowTimeFlag",
+    "GalleryTime",
+    "GyrateAngle",
+    "LightSwitch",
+    "MirrorFlag",
+    "PowerOnChannelId",
+    "RotationFlag",
+    "SelectIndex",
+    "SingleGalleyTime",
+    "TemperatureMode",
+    "Time24Flag",
+})
+
+logger = logging.getLogger(__name__)
+
+_UNKNOWN = object()  # Sentinel for state keys that were never observed
+
 
 class ChannelSelectIndex(Enum):
     """Enum for valid channel IDs with meaningful names."""
@@ -42,20 +112,302 @@ class CloudChannelIndex(Enum):
     ALBUM = 3  # Album
 
 
+class ProfileFieldResult(Enum):
+    """Enum for the outcome of applying a single profile field."""
+
+    UNCHANGED = "unchanged"  # Device already had the requested value
+    APPLIED = "applied"  # Value was sent to the device
+    FAILED = "failed"  # Device rejected the command
+
+
+def _validate_brightness(brightness: int) -> None:
+    if brightness < 0 or brightness > MAX_BRIGHTNESS:
+        msg = f"Invalid brightness value: {brightness}. Must be between 0 and {MAX_BRIGHTNESS}."
+        raise ValueError(msg)
+
+
+def _validate_time_zone(time_zone_value: str) -> None:
+    if not time_zone_value:
+        msg = "TimeZoneValue must be provided."
+        raise ValueError(msg)
+
+
+def _validate_temperature_mode(mode: int) -> None:
+    if mode not in (0, 1):
+        msg = "Mode must be 0 (Celsius) or 1 (Fahrenheit)."
+        raise ValueError(msg)
+
+
+def _validate_rotation_angle(mode: int) -> None:
+    if mode not in (0, 1, 2, 3):
+        msg = "Mode must be 0 (normal), 1 (90), 2 (180), or 3 (270)."
+        raise ValueError(msg)
+
+
+def _validate_mirror_mode(mode: int) -> None:
+    if mode not in (0, 1):
+        msg = "Mode must be 0 (disable) or 1 (enable)."
+        raise ValueError(msg)
+
+
+def _validate_hour_mode(mode: int) -> None:
+    if mode not in (0, 1):
+        msg = "Mode must be 0 (12-hour) or 1 (24-hour)."
+        raise ValueError(msg)
+
+
+def _validate_white_balance(r_value: int, g_value: int, b_value: int) -> None:
+    if not (0 <= r_value <= MAX_RGB_VALUE):
+        msg = f"RValue must be between 0 and {MAX_RGB_VALUE}. Got: {r_value}"
+        raise ValueError(msg)
+    if not (0 <= g_value <= MAX_RGB_VALUE):
+        msg = f"GValue must be between 0 and {MAX_RGB_VALUE}. Got: {g_value}"
+        raise ValueError(msg)
+    if not (0 <= b_value <= MAX_RGB_VALUE):
+        msg = f"BValue must be between 0 and {MAX_RGB_VALUE}. Got: {b_value}"
+        raise ValueError(msg)
+
+
+@dataclass(frozen=True)
+class PixooProfile:
+    """Declarative set of device settings, applied with `Pixoo64.apply_profile`.
+
+    Fields left as None are not touched on the device.
+
+    Attributes:
+        brightness: The brightness level (0~100).
+        rotation: The rotation angle mode (0: normal, 1: 90, 2: 180, 3: 270).
+        mirror: 0 to disable, 1 to enable mirror mode.
+        hour_mode: 1 for 24-hour mode, 0 for 12-hour mode.
+        temperature_mode: 0 for Celsius, 1 for Fahrenheit.
+        white_balance: Red, green and blue values (0~100 each).
+        time_zone: The time zone value (e.g., "GMT-5").
+
+    """
+
+    brightness: int | None = None
+    rotation: int | None = None
+    mirror: int | None = None
+    hour_mode: int | None = None
+    temperature_mode: int | None = None
+    white_balance: tuple[int, int, int] | None = None
+    time_zone: str | None = None
+
+    def __post_init__(self) -> None:
+        """Validate the profile fields.
+
+        Raises:
+            ValueError: If any field is out of range.
+
+        """
+        if self.brightness is not None:
+            _validate_brightness(self.brightness)
+        if self.rotation is not None:
+            _validate_rotation_angle(self.rotation)
+        if self.mirror is not None:
+            _validate_mirror_mode(self.mirror)
+        if self.hour_mode is not None:
+            _validate_hour_mode(self.hour_mode)
+        if self.temperature_mode is not None:
+            _validate_temperature_mode(self.temperature_mode)
+        if self.white_balance is not None:
+            _validate_white_balance(*self.white_balance)
+        if self.time_zone is not None:
+            _validate_time_zone(self.time_zone)
+
+
+# Profile field -> (command, payload builder, resulting device state builder)
+_PROFILE_COMMANDS: dict[str, tuple[str, Callable[[Any], dict], Callable[[Any], dict]]] = {
+    "brightness": ("Channel/SetBrightness", lambda v: {"Brightness": v}, lambda v: {"Brightness": v}),
+    "rotation": ("Device/SetScreenRotationAngle", lambda v: {"Mode": v}, lambda v: {"GyrateAngle": v}),
+    "mirror": ("Device/SetMirrorMode", lambda v: {"Mode": v}, lambda v: {"MirrorFlag": v}),
+    "hour_mode": ("Device/SetTime24Flag", lambda v: {"Mode": v}, lambda v: {"Time24Flag": v}),
+    "temperature_mode": ("Device/SetDisTempMode", lambda v: {"Mode": v}, lambda v: {"TemperatureMode": v}),
+    "white_balance": (
+        "Device/SetWhiteBalance",
+        lambda v: {"RValue": v[0], "GValue": v[1], "BValue": v[2]},
+        lambda v: {"RValue": v[0], "GValue": v[1], "BValue": v[2]},
+    ),
+    "time_zone": ("Sys/TimeZone", lambda v: {"TimeZoneValue": v}, lambda v: {"TimeZoneValue": v}),
+}
+
+
 class Pixoo64(BasePixoo):
     """Subclass for handling Pixoo64 device-specific API calls."""
 
-    def __init__(self, host: str, port: int = 80, timeout: int = 10) -> None:
+    idempotent_commands = IDEMPOTENT_COMMANDS
+
+    def __init__(  # noqa: PLR0913
+            self,
+            host: str,
+            port: int = 80,
+            timeout: float | aiohttp.ClientTimeout = 10,
+            *,
+            timeouts: Mapping[str, aiohttp.ClientTimeout] | None = None,
+            adaptive_timeout: bool = False,
+            idle_timeout: float | None = None,
+            warm_up_connections: int = 0,
+            retry_on_disconnect: bool = True,
+            transport: Transport | None = None,
+            track_state: bool = False,
+            coalesce_interval: float | None = None,
+            coalesce_commands: Collection[str] = DEFAULT_COALESCED_COMMANDS,
+    ) -> None:
         """Initialize the Pixoo64 device API.
 
         Args:
             host: IP address of the Pixoo64 device.
             port: Port number (default: 80).
-            timeout: Request timeout in seconds (default: 10).
+            timeout: Default request timeout, in seconds or as an aiohttp.ClientTimeout (default: 10).
+            timeouts: Timeout profiles per command (e.g. "Draw/SendHttpGif"), overriding the default timeout.
+            adaptive_timeout: Derive the timeout of commands without a profile from their measured
+                round-trip times (default: False).
+            idle_timeout: Discard pooled connections idle for longer than this many seconds, since the
+                device drops idle keep-alive connections (default: None, aiohttp's keep-alive timeout).
+            warm_up_connections: Number of connections to open on connect (default: 0).
+            retry_on_disconnect: Retry a request once when the device closed the connection before
+                responding, if it never reached the device or is in IDEMPOTENT_COMMANDS (default: True).
+            transport: Transport to send requests with, e.g. one shared by many devices
+                (default: a dedicated AiohttpTransport).
+            track_state: Skip setter calls whose value matches the last known device state (default: False).
+            coalesce_interval: Send the coalesced commands at most once per interval in seconds, using the
+                arguments of the latest call (default: None, every call is sent).
+            coalesce_commands: Commands subject to coalescing (default: brightness, white balance and scoreboard).
 
         """
         base_url = f"http://{host}:{port}"
-        super().__init__(base_url, timeout)
+        super().__init__(
+            base_url,
+            timeout,
+            timeouts=timeouts,
+            adaptive_timeout=adaptive_timeout,
+            idle_timeout=idle_timeout,
+            warm_up_connections=warm_up_connections,
+            retry_on_disconnect=retry_on_disconnect,
+            transport=transport,
+        )
+        self.host = host
+        self.port = port
+        self.track_state = track_state
+        self.coalesce_commands = frozenset(coalesce_commands)
+        self._coalescer = CommandCoalescer(coalesce_interval) if coalesce_interval is not None else None
+        self._state: dict[str, Any] = {}
+
+    async def ping(self) -> dict:
+        """Read the device settings as a lightweight request, which also seeds the known state.
+
+        Returns:
+            Response dictionary containing all settings.
+
+        Raises:
+            PixooCommandError: If the API returns an error or invalid response.
+            PixooConnectionError: If the request fails.
+
+        """
+        return await self.get_all_settings()
+
+    async def close(self) -> None:
+        """Cancel pending coalesced calls and close the transport."""
+        if self._coalescer is not None:
+            self._coalescer.cancel()
+        await super().close()
+
+    @property
+    def state(self) -> dict[str, Any]:
+        """Return a copy of the last known device state.
+
+        The state is seeded from `get_all_settings`, `get_clock_info` and `get_current_channel`
+        and updated after every successful setter call.
+        """
+        return dict(self._state)
+
+    def seed_state(self, state: Mapping[str, Any]) -> None:
+        """Set the known device state, e.g. from a snapshot saved before a restart.
+
+        With `track_state`, setters matching the seeded state are skipped until the state is read
+        back from the device, so a seeded state should be revalidated soon. Only the keys in
+        VERIFIABLE_STATE_KEYS are seeded, since a revalidation could never correct the others.
+
+        Args:
+            state: Device state keys and values, as returned by `state`.
+
+        """
+        self._state.update((key, value) for key, value in state.items() if key in VERIFIABLE_STATE_KEYS)
+
+    async def resync(self) -> dict[str, Any]:
+        """Discard the known device state and read it back from the device.
+
+        Returns:
+            The refreshed device state.
+
+        Raises:
+            PixooCommandError: If the API returns an error or invalid response.
+
+        """
+        self._state.clear()
+        await self.get_all_settings()
+        await self.get_current_channel()
+        return self.state
+
+    async def apply_profile(self, profile: PixooProfile) -> dict[str, ProfileFieldResult]:
+        """Bring the device in line with a settings profile using as few requests as possible.
+
+        The current settings are read once, and only the fields that differ are sent. Write-only
+        settings (white balance, time zone) are not reported back, so they are always sent. Multiple
+        changes are batched into a single Draw/CommandList request.
+
+        Args:
+            profile: The settings to apply.
+
+        Returns:
+            Dictionary mapping every field set in the profile to its ProfileFieldResult.
+
+        Raises:
+            PixooCommandError: If the current settings cannot be read.
+            PixooConnectionError: If the request fails.
+
+        """
+        current = await self.get_all_settings()
+
+        results: dict[str, ProfileFieldResult] = {}
+        pending: list[tuple[str, str, dict, dict]] = []
+        for field in fields(profile):
+            value = getattr(profile, field.name)
+            if value is None:
+                continue
+            command, build_data, build_state = _PROFILE_COMMANDS[field.name]
+            state = build_state(value)
+            # Only compare against values just read back; remembered write-only values may be stale
+            if state.keys() <= VERIFIABLE_STATE_KEYS and all(
+                current.get(key, _UNKNOWN) == state_value for key, state_value in state.items()
+            ):
+                results[field.name] = ProfileFieldResult.UNCHANGED
+            else:
+                pending.append((field.name, command, build_data(value), state))
+
+        if not pending:
+            return results
+
+        try:
+            if len(pending) == 1:
+                _, command, data, _ = pending[0]
+                await self._make_command_request(command, data)
+            else:
+                # The changed state keys are known, so the state is updated rather than discarded
+                await self._send_command_list([{"Command": command, **data} for _, command, data, _ in pending])
+        except PixooCommandError:
+            logger.exception("Failed to apply profile fields %s", [name for name, *_ in pending])
+            results.update((name, ProfileFieldResult.FAILED) for name, *_ in pending)
+            return results
+
+        for name, _, _, state in pending:
+            self._state.update(state)
+            results[name] = ProfileFieldResult.APPLIED
+        return results
+
+    def _update_state(self, response: dict) -> None:
+        """Record the settings reported in a device response."""
+        self._state.update((key, value) for key, value in response.items() if key != "error_code")
 
     async def _make_command_request(self, command: str, data: dict | None = None) -> dict:
         """Make a request to the Pixoo64 device with a command.
@@ -71,14 +423,88 @@ class Pixoo64(BasePixoo):
             PixooCommandError: If the command fails or returns an error.
 
         """
-        if data is None:
-            data = {}
-        data["Command"] = command
-        return await self._make_request("post", data)
+        return await self._make_request("post", {**(data or {}), "Command": command}, command=command)
+
+    async def send_command(self, command: Command, pic_id: int | None = None) -> dict:
+        """Send a prebuilt command, reusing its validated and serialized body.
+
+        The known device state is discarded for commands other than frames and texts, which may
+        change any setting.
+
+        Args:
+            command: The command to send (e.g. a TextCommand or FrameCommand).
+            pic_id: Animation ID to send a FrameCommand with instead of its own (default: None).
+
+        Returns:
+            Response dictionary.
+
+        Raises:
+            TypeError: If a PicID is given for a command that is not a FrameCommand.
+            PixooCommandError: If the command fails or returns an error.
+            PixooConnectionError: If the request fails.
+
+        """
+        body = command.body
+        if pic_id is not None:
+            if not isinstance(command, FrameCommand):
+                msg = f"PicID can only be set on a FrameCommand. Got: {type(command).__name__}"
+                raise TypeError(msg)
+            body = command.body_for_pic_id(pic_id)
+        if not isinstance(command, (FrameCommand, TextCommand)):
+            self._state.clear()
+        return await self._make_raw_request("post", body, command=command.name)
+
+    async def _make_setter_request(
+            self,
+            command: str,
+            data: dict,
+            state: dict[str, Any],
+            invalidates: tuple[str, ...] = (),
+    ) -> dict:
+        """Make a setter request, skipping it when the device is already in the requested state.
+
+        Commands listed in `coalesce_commands` are coalesced when a coalesce interval is configured.
+
+        Args:
+            command: The command to send to the device.
+            data: Payload for the command.
+            state: The device state keys and values the command results in.
+            invalidates: State keys that become unknown once the command succeeds.
+
+        Returns:
+            Response dictionary, or a local success response if the request was skipped.
+
+        Raises:
+            PixooCommandError: If the command fails or returns an error.
+
+        """
+        send = functools.partial(self._send_setter, command, data, state, invalidates)
+        if self._coalescer is not None and command in self.coalesce_commands:
+            return await self._coalescer.submit(command, send)
+        return await send()
+
+    async def _send_setter(
+            self,
+            command: str,
+            data: dict,
+            state: dict[str, Any],
+            invalidates: tuple[str, ...],
+    ) -> dict:
+        """Send a setter request unless the known state already matches, then record the new state."""
+        if self.track_state and state and all(self._state.get(key, _UNKNOWN) == value for key, value in state.items()):
+            logger.debug("Skipping %s, device already in state %s", command, state)
+            return {"error_code": 0}
+        response = await self._make_command_request(command, data)
+        self._state.update(state)
+        for key in invalidates:
+            self._state.pop(key, None)
+        return response
 
     async def sys_reboot(self) -> dict:
         """Reboot the Pixoo64 device."""
-        return await self._make_command_request("Device/SysReboot")
+        response = await self._make_command_request("Device/SysReboot")
+        self._state.clear()
+        return response
 
     async def get_all_settings(self) -> dict:
         """Get all settings from the Pixoo64 device.
@@ -94,6 +520,7 @@ class Pixoo64(BasePixoo):
         if response.get("error_code", 0) != 0:
             msg = f"Failed to get all settings: {response}"
             raise PixooCommandError(msg)
+        self._update_state(response)
         return response
 
     async def set_clock_select_id(self, clock_id: int) -> dict:
@@ -109,7 +536,12 @@ class Pixoo64(BasePixoo):
             PixooCommandError: If the API returns an error or invalid response.
 
         """
-        return await self._make_command_request("Channel/SetClockSelectId", {"ClockId": clock_id})
+        return await self._make_setter_request(
+            "Channel/SetClockSelectId",
+            {"ClockId": clock_id},
+            {"CurClockId": clock_id},
+            invalidates=("SelectIndex",),
+        )
 
     async def get_clock_info(self) -> dict:
         """Get the current working face ID and brightness.
@@ -121,7 +553,12 @@ class Pixoo64(BasePixoo):
             PixooCommandError: If the API returns an error or invalid response.
 
         """
-        return await self._make_command_request("Channel/GetClockInfo")
+        response = await self._make_command_request("Channel/GetClockInfo")
+        if "ClockId" in response:
+            self._state["CurClockId"] = response["ClockId"]
+        if "Brightness" in response:
+            self._state["Brightness"] = response["Brightness"]
+        return response
 
     async def set_channel(self, select_index: ChannelSelectIndex) -> dict:
         """Set the device to the selected channel.
@@ -136,7 +573,11 @@ class Pixoo64(BasePixoo):
             PixooCommandError: If the API returns an error or invalid response.
 
         """
-        return await self._make_command_request("Channel/SetIndex", {"SelectIndex": select_index.value})
+        return await self._make_setter_request(
+            "Channel/SetIndex",
+            {"SelectIndex": select_index.value},
+            {"SelectIndex": select_index.value},
+        )
 
     async def set_custom_page_index(self, custom_page_index: int) -> dict:
         """Set the device to a specific custom page index.
@@ -155,7 +596,12 @@ class Pixoo64(BasePixoo):
         if custom_page_index < 0 or custom_page_index > MAX_CUSTOM_PAGE_INDEX:
             msg = f"Invalid custom page index: {custom_page_index}. Must be between 0 and {MAX_CUSTOM_PAGE_INDEX}."
             raise ValueError(msg)
-        return await self._make_command_request("Channel/SetCustomPageIndex", {"CustomPageIndex": custom_page_index})
+        return await self._make_setter_request(
+            "Channel/SetCustomPageIndex",
+            {"CustomPageIndex": custom_page_index},
+            {},
+            invalidates=("SelectIndex",),
+        )
 
     async def set_visualizer_position(self, eq_position: int) -> dict:
         """Set the device to a specific visualizer position.
@@ -174,7 +620,12 @@ class Pixoo64(BasePixoo):
         if eq_position < 0:
             msg = f"Invalid visualizer position: {eq_position}. Must be 0 or greater."
             raise ValueError(msg)
-        return await self._make_command_request("Channel/SetEqPosition", {"EqPosition": eq_position})
+        return await self._make_setter_request(
+            "Channel/SetEqPosition",
+            {"EqPosition": eq_position},
+            {},
+            invalidates=("SelectIndex",),
+        )
 
     async def set_cloud_channel(self, index: CloudChannelIndex) -> dict:
         """Set the device to a specific cloud channel.
@@ -189,7 +640,12 @@ class Pixoo64(BasePixoo):
             PixooCommandError: If the API returns an error or invalid response.
 
         """
-        return await self._make_command_request("Channel/CloudIndex", {"Index": index.value})
+        return await self._make_setter_request(
+            "Channel/CloudIndex",
+            {"Index": index.value},
+            {},
+            invalidates=("SelectIndex",),
+        )
 
     async def get_current_channel(self) -> dict:
         """Get the current channel the device is on.
@@ -201,7 +657,10 @@ class Pixoo64(BasePixoo):
             PixooCommandError: If the API returns an error or invalid response.
 
         """
-        return await self._make_command_request("Channel/GetIndex")
+        response = await self._make_command_request("Channel/GetIndex")
+        if "SelectIndex" in response:
+            self._state["SelectIndex"] = response["SelectIndex"]
+        return response
 
     async def set_brightness(self, brightness: int) -> dict:
         """Set the brightness of the device.
@@ -217,10 +676,12 @@ class Pixoo64(BasePixoo):
             PixooCommandError: If the API returns an error or invalid response.
 
         """
-        if brightness < 0 or brightness > MAX_BRIGHTNESS:
-            msg = f"Invalid brightness value: {brightness}. Must be between 0 and {MAX_BRIGHTNESS}."
-            raise ValueError(msg)
-        return await self._make_command_request("Channel/SetBrightness", {"Brightness": brightness})
+        _validate_brightness(brightness)
+        return await self._make_setter_request(
+            "Channel/SetBrightness",
+            {"Brightness": brightness},
+            {"Brightness": brightness},
+        )
 
     async def set_weather_area(self, longitude: str, latitude: str) -> dict:
         """Set the weather area by specifying longitude and latitude.
@@ -240,7 +701,11 @@ class Pixoo64(BasePixoo):
         if not longitude or not latitude:
             msg = "Longitude and Latitude must be provided."
             raise ValueError(msg)
-        return await self._make_command_request("Sys/LogAndLat", {"Longitude": longitude, "Latitude": latitude})
+        return await self._make_setter_request(
+            "Sys/LogAndLat",
+            {"Longitude": longitude, "Latitude": latitude},
+            {"Longitude": longitude, "Latitude": latitude},
+        )
 
     async def set_time_zone(self, time_zone_value: str) -> dict:
         """Set the time zone of the device.
@@ -256,10 +721,12 @@ class Pixoo64(BasePixoo):
             PixooCommandError: If the API returns an error or invalid response.
 
         """
-        if not time_zone_value:
-            msg = "TimeZoneValue must be provided."
-            raise ValueError(msg)
-        return await self._make_command_request("Sys/TimeZone", {"TimeZoneValue": time_zone_value})
+        _validate_time_zone(time_zone_value)
+        return await self._make_setter_request(
+            "Sys/TimeZone",
+            {"TimeZoneValue": time_zone_value},
+            {"TimeZoneValue": time_zone_value},
+        )
 
     async def set_system_time(self, utc: int) -> dict:
         """Set the system time of the device.
@@ -297,7 +764,7 @@ class Pixoo64(BasePixoo):
         if on_off not in (0, 1):
             msg = "OnOff must be 0 (off) or 1 (on)."
             raise ValueError(msg)
-        return await self._make_command_request("Channel/OnOffScreen", {"OnOff": on_off})
+        return await self._make_setter_request("Channel/OnOffScreen", {"OnOff": on_off}, {"LightSwitch": on_off})
 
     async def get_device_time(self) -> dict:
         """Get the device system time.
@@ -329,10 +796,8 @@ class Pixoo64(BasePixoo):
             PixooCommandError: If the API returns an error or invalid response.
 
         """
-        if mode not in (0, 1):
-            msg = "Mode must be 0 (Celsius) or 1 (Fahrenheit)."
-            raise ValueError(msg)
-        return await self._make_command_request("Device/SetDisTempMode", {"Mode": mode})
+        _validate_temperature_mode(mode)
+        return await self._make_setter_request("Device/SetDisTempMode", {"Mode": mode}, {"TemperatureMode": mode})
 
     async def set_screen_rotation_angle(self, mode: int) -> dict:
         """Set the screen rotation angle.
@@ -348,10 +813,8 @@ class Pixoo64(BasePixoo):
             PixooCommandError: If the API returns an error or invalid response.
 
         """
-        if mode not in (0, 1, 2, 3):
-            msg = "Mode must be 0 (normal), 1 (90), 2 (180), or 3 (270)."
-            raise ValueError(msg)
-        return await self._make_command_request("Device/SetScreenRotationAngle", {"Mode": mode})
+        _validate_rotation_angle(mode)
+        return await self._make_setter_request("Device/SetScreenRotationAngle", {"Mode": mode}, {"GyrateAngle": mode})
 
     async def set_mirror_mode(self, mode: int) -> dict:
         """Set the screen mirror mode.
@@ -367,10 +830,8 @@ class Pixoo64(BasePixoo):
             PixooCommandError: If the API returns an error or invalid response.
 
         """
-        if mode not in (0, 1):
-            msg = "Mode must be 0 (disable) or 1 (enable)."
-            raise ValueError(msg)
-        return await self._make_command_request("Device/SetMirrorMode", {"Mode": mode})
+        _validate_mirror_mode(mode)
+        return await self._make_setter_request("Device/SetMirrorMode", {"Mode": mode}, {"MirrorFlag": mode})
 
     async def set_hour_mode(self, mode: int) -> dict:
         """Set the screen hour mode to 24-hour or 12-hour.
@@ -386,10 +847,8 @@ class Pixoo64(BasePixoo):
             PixooCommandError: If the API returns an error or invalid response.
 
         """
-        if mode not in (0, 1):
-            msg = "Mode must be 0 (12-hour) or 1 (24-hour)."
-            raise ValueError(msg)
-        return await self._make_command_request("Device/SetTime24Flag", {"Mode": mode})
+        _validate_hour_mode(mode)
+        return await self._make_setter_request("Device/SetTime24Flag", {"Mode": mode}, {"Time24Flag": mode})
 
     async def set_high_light_mode(self, mode: int) -> dict:
         """Set the screen high light mode.
@@ -408,7 +867,7 @@ class Pixoo64(BasePixoo):
         if mode not in (0, 1):
             msg = "Mode must be 0 (close) or 1 (open)."
             raise ValueError(msg)
-        return await self._make_command_request("Device/SetHighLightMode", {"Mode": mode})
+        return await self._make_setter_request("Device/SetHighLightMode", {"Mode": mode}, {"HighLightMode": mode})
 
     async def set_white_balance(self, r_value: int, g_value: int, b_value: int) -> dict:
         """Set the screen white balance.
@@ -426,18 +885,11 @@ class Pixoo64(BasePixoo):
             PixooCommandError: If the API returns an error or invalid response.
 
         """
-        if not (0 <= r_value <= MAX_RGB_VALUE):
-            msg = f"RValue must be between 0 and {MAX_RGB_VALUE}. Got: {r_value}"
-            raise ValueError(msg)
-        if not (0 <= g_value <= MAX_RGB_VALUE):
-            msg = f"GValue must be between 0 and {MAX_RGB_VALUE}. Got: {g_value}"
-            raise ValueError(msg)
-        if not (0 <= b_value <= MAX_RGB_VALUE):
-            msg = f"BValue must be between 0 and {MAX_RGB_VALUE}. Got: {b_value}"
-            raise ValueError(msg)
-        return await self._make_command_request(
+        _validate_white_balance(r_value, g_value, b_value)
+        return await self._make_setter_request(
             "Device/SetWhiteBalance",
             {"RValue": r_value, "GValue": g_value, "BValue": b_value},
+            {"RValue": r_value, "GValue": g_value, "BValue": b_value},
         )
 
     async def get_weather_info(self) -> dict:
@@ -526,9 +978,10 @@ class Pixoo64(BasePixoo):
         if not (0 <= red_score <= MAX_SCORE):
             msg = f"RedScore must be between 0 and {MAX_SCORE}. Got: {red_score}"
             raise ValueError(msg)
-        return await self._make_command_request(
+        return await self._make_setter_request(
             "Tools/SetScoreBoard",
             {"BlueScore": blue_score, "RedScore": red_score},
+            {},
         )
 
     async def set_noise_tool(self, noise_status: int) -> dict:
@@ -631,7 +1084,7 @@ class Pixoo64(BasePixoo):
             raise PixooCommandError(msg)
         return response
 
-    async def send_animation_frame(  # noqa: PLR0913
+    async def send_animation_frame(  # noqa: PLR0913, PLR0917
             self, pic_num: int, pic_width: int, pic_offset: int, pic_id: int, pic_speed: int, pic_data: str,
     ) -> dict:
         """Send a single frame of an animation to the device.
@@ -652,38 +1105,11 @@ class Pixoo64(BasePixoo):
             PixooCommandError: If the API returns an error or invalid response.
 
         """
-        if not (1 <= pic_num < MAX_PIC_NUM):
-            msg = f"PicNum must be between 1 and {MAX_PIC_NUM}. Got: {pic_num}"
-            raise ValueError(msg)
-        if pic_width not in (16, 32, 64):
-            msg = f"PicWidth must be one of 16, 32, or 64. Got: {pic_width}"
-            raise ValueError(msg)
-        if not (0 <= pic_offset < pic_num):
-            msg = f"PicOffset must be between 0 and PicNum-1. Got: {pic_offset}"
-            raise ValueError(msg)
-        if pic_id < 1:
-            msg = f"PicID must be greater than or equal to 1. Got: {pic_id}"
-            raise ValueError(msg)
-        if pic_speed < 0:
-            msg = f"PicSpeed must be a positive integer. Got: {pic_speed}"
-            raise ValueError(msg)
-        if not pic_data:
-            msg = "PicData must be provided."
-            raise ValueError(msg)
-
-        return await self._make_command_request(
-            "Draw/SendHttpGif",
-            {
-                "PicNum": pic_num,
-                "PicWidth": pic_width,
-                "PicOffset": pic_offset,
-                "PicID": pic_id,
-                "PicSpeed": pic_speed,
-                "PicData": pic_data,
-            },
+        return await self.send_command(
+            FrameCommand(pic_num, pic_width, pic_offset, pic_id, pic_speed, pic_data=pic_data),
         )
 
-    async def send_text(  # noqa: PLR0913
+    async def send_text(  # noqa: PLR0913, PLR0917
             self,
             text_id: int,
             x: int,
@@ -718,39 +1144,19 @@ class Pixoo64(BasePixoo):
             PixooCommandError: If the API returns an error or invalid response.
 
         """
-        if not (0 <= text_id <= MAX_TEXT_ID):
-            msg = f"TextId must be between 0 and {MAX_TEXT_ID}. Got: {text_id}"
-            raise ValueError(msg)
-        if not (MIN_TEXT_WIDTH < text_width < MAX_TEXT_WIDTH):
-            msg = f"TextWidth must be between {MIN_TEXT_WIDTH} and {MAX_TEXT_WIDTH}. Got: {text_width}"
-            raise ValueError(msg)
-        if len(text_string) >= MAX_TEXT_LENGTH:
-            msg = f"TextString length must be less than {MAX_TEXT_LENGTH}. Got: {len(text_string)}"
-            raise ValueError(msg)
-        if direction not in (0, 1):
-            msg = f"Direction must be 0 (scroll left) or 1 (scroll right). Got: {direction}"
-            raise ValueError(msg)
-        if not (0 <= font <= MAX_FONT):
-            msg = f"Font must be between 0 and {MAX_FONT}. Got: {font}"
-            raise ValueError(msg)
-        if align not in (1, 2, 3):
-            msg = f"Align must be 1 (left), 2 (middle), or 3 (right). Got: {align}"
-            raise ValueError(msg)
-
-        return await self._make_command_request(
-            "Draw/SendHttpText",
-            {
-                "TextId": text_id,
-                "x": x,
-                "y": y,
-                "dir": direction,
-                "font": font,
-                "TextWidth": text_width,
-                "TextString": text_string,
-                "speed": speed,
-                "color": color,
-                "align": align,
-            },
+        return await self.send_command(
+            TextCommand(
+                text_id,
+                x,
+                y,
+                direction,
+                font,
+                text_width=text_width,
+                text_string=text_string,
+                speed=speed,
+                color=color,
+                align=align,
+            ),
         )
 
     async def clear_text(self) -> dict:
@@ -766,7 +1172,7 @@ class Pixoo64(BasePixoo):
         return await self._make_command_request("Draw/ClearHttpText")
 
     async def send_display_list(self, item_list: list) -> dict:
-        """Send a display list to the device.
+        """Send a display list to the device, discarding the known device state.
 
         Args:
             item_list: A list of dictionaries, each representing a display item with the following keys:
@@ -800,6 +1206,7 @@ class Pixoo64(BasePixoo):
                 msg = f"TextString length must be less than {MAX_TEXT_LENGTH}. Got: {len(item.get('TextString', ''))}"
                 raise ValueError(msg)
 
+        self._state.clear()
         return await self._make_command_request("Draw/SendHttpItemList", {"ItemList": item_list})
 
     async def play_buzzer(self, active_time_in_cycle: int, off_time_in_cycle: int, play_total_time: int) -> dict:
@@ -837,11 +1244,12 @@ class Pixoo64(BasePixoo):
             },
         )
 
-    async def run_command_list(self, command_list: list) -> dict:
-        """Run a list of commands on the device.
+    async def run_command_list(self, command_list: list[dict | Command]) -> dict:
+        """Run a list of commands on the device, discarding the known device state they may change.
 
         Args:
-            command_list: A list of dictionaries, each representing a command with its parameters.
+            command_list: A list of dictionaries, each representing a command with its parameters,
+                or prebuilt Command objects, whose serialized bodies are reused.
 
         Returns:
             Response dictionary containing the error_code.
@@ -855,10 +1263,23 @@ class Pixoo64(BasePixoo):
             msg = "CommandList must be a non-empty list."
             raise ValueError(msg)
 
-        return await self._make_command_request("Draw/CommandList", {"CommandList": command_list})
+        self._state.clear()
+        return await self._send_command_list(command_list)
+
+    async def _send_command_list(self, command_list: list[dict | Command]) -> dict:
+        """Send a Draw/CommandList request, leaving the known device state to the caller."""
+        body = b"".join((
+            b'{"CommandList":[',
+            b",".join(
+                item.body if isinstance(item, Command) else json.dumps(item, separators=(",", ":")).encode()
+                for item in command_list
+            ),
+            b'],"Command":"Draw/CommandList"}',
+        ))
+        return await self._make_raw_request("post", body, command="Draw/CommandList")
 
     async def use_http_command_source(self, command_url: str) -> dict:
-        """Run commands from a URL on the device.
+        """Run commands from a URL on the device, discarding the known device state they may change.
 
         Args:
             command_url: The URL containing the command array information.
@@ -875,6 +1296,7 @@ class Pixoo64(BasePixoo):
             msg = "CommandUrl must be provided."
             raise ValueError(msg)
 
+        self._state.clear()
         return await self._make_command_request(
             "Draw/UseHTTPCommandSource",
             {"CommandUrl": command_url},
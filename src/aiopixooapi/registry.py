@@ -0,0 +1,212 @@
+"""Provides the `DeviceRegistry` class, which indexes many devices by tag for fast subset selection.
+
+A registry holds one compact record per device and an inverted index from each tag to the hosts
+carrying it. Pixoo64 clients are only created when a device is actually addressed.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import sys
+from typing import TYPE_CHECKING
+
+from .fleet import PixooFleet
+from .pixoo64 import Pixoo64
+from .transport import AiohttpTransport, Transport
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator, Mapping
+
+
+class DeviceRecord:
+    """Connection details and tags of a registered device."""
+
+    __slots__ = ("host", "port", "tags", "timeout")
+
+    def __init__(
+            self,
+            host: str,
+            port: int = 80,
+            timeout: float = 10,
+            tags: Mapping[str, object] | None = None,
+    ) -> None:
+        """Initialize the record.
+
+        Args:
+            host: Hostname or IP address of the device.
+            port: Port of the device (default: 80).
+            timeout: Request timeout in seconds (default: 10).
+            tags: Tags of the device (e.g. {"floor": 3, "model": "pixoo64"}); values are stored as strings.
+
+        """
+        self.host = host
+        self.port = port
+        self.timeout = timeout
+        # Tag names and values repeat across thousands of records, so they are interned and kept as pairs
+        self.tags: tuple[tuple[str, str], ...] = tuple(
+            (sys.intern(key), sys.intern(str(value))) for key, value in (tags or {}).items()
+        )
+
+    def tag(self, key: str) -> str | None:
+        """Return the value of a tag, or None if the device does not have it."""
+        for name, value in self.tags:
+            if name == key:
+                return value
+        return None
+
+    def __repr__(self) -> str:
+        """Return the host, port and tags."""
+        return f"DeviceRecord({self.host!r}, {self.port!r}, tags={dict(self.tags)!r})"
+
+
+class DeviceRegistry:
+    """Devices indexed by tag, with Pixoo64 clients created on first use.
+
+    `select` intersects the index entries of the requested tags, starting from the smallest, so its
+    cost follows the size of the result rather than the size of the registry. Clients created by
+    `handle` share one transport.
+    """
+
+    def __init__(self, *, transport: Transport | None = None) -> None:
+        """Initialize the registry.
+
+        Args:
+            transport: Transport shared by the clients of the registry
+                (default: an AiohttpTransport owned by the registry).
+
+        """
+        self._owns_transport = transport is None
+        self._transport = transport if transport is not None else AiohttpTransport()
+        self._records: dict[str, DeviceRecord] = {}
+        self._index: dict[tuple[str, str], set[str]] = {}
+        self._handles: dict[str, Pixoo64] = {}
+
+    @property
+    def transport(self) -> Transport:
+        """Return the transport shared by the clients of the registry."""
+        return self._transport
+
+    def add(self, host: str, port: int = 80, timeout: float = 10, **tags: object) -> DeviceRecord:
+        """Register a device, replacing any previous record for the host.
+
+        Args:
+            host: Hostname or IP address of the device.
+            port: Port of the device (default: 80).
+            timeout: Request timeout in seconds (default: 10).
+            **tags: Tags of the device (e.g. floor=3, group="lobby").
+
+        Returns:
+            The record of the device.
+
+        """
+        if host in self._records:
+            self.remove(host)
+        record = DeviceRecord(host, port, timeout, tags)
+        self._records[host] = record
+        for tag in record.tags:
+            self._index.setdefault(tag, set()).add(host)
+        return record
+
+    def remove(self, host: str) -> DeviceRecord:
+        """Unregister a device.
+
+        Args:
+            host: Host of the device.
+
+        Returns:
+            The removed record.
+
+        Raises:
+            KeyError: If the host is not registered.
+
+        """
+        record = self._records.pop(host)
+        for tag in record.tags:
+            hosts = self._index[tag]
+            hosts.discard(host)
+            if not hosts:
+                del self._index[tag]
+        # Clients of the registry hold no resources of their own, the transport stays shared
+        self._handles.pop(host, None)
+        return record
+
+    def __getitem__(self, host: str) -> DeviceRecord:
+        """Return the record of a host."""
+        return self._records[host]
+
+    def __contains__(self, host: object) -> bool:
+        """Return whether a host is registered."""
+        return host in self._records
+
+    def __iter__(self) -> Iterator[DeviceRecord]:
+        """Iterate over the records."""
+        return iter(self._records.values())
+
+    def __len__(self) -> int:
+        """Return the number of registered devices."""
+        return len(self._records)
+
+    def select(self, **tags: object) -> set[str]:
+        """Return the hosts carrying all of the given tags.
+
+        Args:
+            **tags: Tags to match (e.g. floor=3, model="pixoo64"); without tags every host matches.
+
+        Returns:
+            The matching hosts.
+
+        """
+        if not tags:
+            return set(self._records)
+        matches = []
+        for key, value in tags.items():
+            hosts = self._index.get((key, str(value)))
+            if not hosts:
+                return set()
+            matches.append(hosts)
+        matches.sort(key=len)
+        return matches[0].intersection(*matches[1:])
+
+    def handle(self, host: str) -> Pixoo64:
+        """Return the client for a host, creating it on first use.
+
+        Args:
+            host: Host of the device.
+
+        Returns:
+            The client, using the registry's shared transport.
+
+        Raises:
+            KeyError: If the host is not registered.
+
+        """
+        handle = self._handles.get(host)
+        if handle is None:
+            record = self._records[host]
+            handle = Pixoo64(record.host, record.port, record.timeout, transport=self._transport)
+            self._handles[host] = handle
+        return handle
+
+    def fleet(self, concurrency: int = 64, **tags: object) -> PixooFleet:
+        """Return a fleet of the devices carrying all of the given tags.
+
+        Args:
+            concurrency: Maximum number of operations running at once across the fleet (default: 64).
+            **tags: Tags to match; without tags every device is included.
+
+        Returns:
+            A fleet of clients sharing the registry's transport.
+
+        """
+        return PixooFleet(
+            (self.handle(host) for host in self.select(**tags)),
+            concurrency=concurrency,
+            transport=self._transport,
+        )
+
+    async def close(self) -> None:
+        """Close the clients, and the shared transport if the registry created it."""
+        await asyncio.gather(*(handle.close() for handle in self._handles.values()))
+        self._handles.clear()
+        if self._owns_transport:
+            await self._transport.close()
@@ -0,0 +1,78 @@
+"""Provides bookkeeping for background revalidations, shared by the catalog and the warm start.
+
+`Revalidations` runs at most one background task per key, logs failures instead of raising them,
+and lets its owner wait for or cancel the tasks in progress.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from typing import TYPE_CHECKING
+
+from .exceptions import PixooError
+
+if TYPE_CHECKING:
+    import logging
+    from collections.abc import Awaitable, Callable
+
+
+class Revalidations:
+    """Background revalidation tasks, keyed by what they revalidate."""
+
+    def __init__(self, logger: logging.Logger) -> None:
+        """Initialize the revalidations.
+
+        Args:
+            logger: Logger for revalidation failures.
+
+        """
+        self._logger = logger
+        self._tasks: dict[str, asyncio.Future] = {}
+
+    def __contains__(self, key: object) -> bool:
+        """Return whether a revalidation of the key is in progress."""
+        return key in self._tasks
+
+    def __len__(self) -> int:
+        """Return the number of revalidations in progress."""
+        return len(self._tasks)
+
+    def schedule(self, key: str, revalidate: Callable[[], Awaitable[None]]) -> bool:
+        """Start a background revalidation, unless one of the same key is in progress.
+
+        Must be called with a running event loop.
+
+        Args:
+            key: What is revalidated, e.g. a store key or a host.
+            revalidate: Called to start the revalidation.
+
+        Returns:
+            Whether a revalidation was started.
+
+        """
+        if key in self._tasks:
+            return False
+        self._tasks[key] = asyncio.ensure_future(self._run(key, revalidate))
+        return True
+
+    async def _run(self, key: str, revalidate: Callable[[], Awaitable[None]]) -> None:
+        """Run a revalidation; failures are only logged."""
+        try:
+            await revalidate()
+        except PixooError as err:
+            self._logger.warning("Failed to revalidate %s: %s", key, err)
+        finally:
+            self._tasks.pop(key, None)
+
+    async def join(self) -> None:
+        """Wait for the revalidations in progress, including ones started meanwhile."""
+        while self._tasks:
+            await asyncio.gather(*self._tasks.values(), return_exceptions=True)
+
+    async def close(self) -> None:
+        """Cancel the revalidations in progress and wait for them to finish."""
+        tasks = list(self._tasks.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._tasks.clear()
@@ -0,0 +1,265 @@
+"""Provides the `CatalogIndex` class, an in-memory search index over Divoom dials and images.
+
+Entries are indexed by the words of their name in an inverted index, with a sorted vocabulary for
+prefix lookups, and by field values such as the dial type for filtering. Entries can be added page
+by page as they arrive, e.g. from `Divoom.iter_dial_list`.
+"""
+
+from __future__ import annotations
+
+import bisect
+import re
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Mapping
+
+_WORD = re.compile(r"\w+")
+
+DIAL = "dial"
+IMAGE = "image"
+
+
+def tokenize(text: str) -> list[str]:
+    """Return the lowercase words of a text."""
+    return _WORD.findall(text.lower())
+
+
+class IndexEntry:
+    """A dial or image in a CatalogIndex."""
+
+    __slots__ = ("fields", "id", "item", "kind", "name", "tokens")
+
+    def __init__(
+            self,
+            kind: str,
+            entry_id: Any,  # noqa: ANN401
+            name: str,
+            fields: Mapping[str, str],
+            item: Mapping[str, Any],
+    ) -> None:
+        """Initialize the entry.
+
+        Args:
+            kind: "dial" or "image".
+            entry_id: ClockId of a dial or FileId of an image.
+            name: Name of the dial or image.
+            fields: Filterable field values, e.g. {"dial_type": "Social"}.
+            item: The item as returned by the API.
+
+        """
+        self.kind = kind
+        self.id = entry_id
+        self.name = name
+        self.fields = dict(fields)
+        self.item = item
+        self.tokens = frozenset(tokenize(name))
+
+    def __repr__(self) -> str:
+        """Return the kind, ID and name."""
+        return f"IndexEntry({self.kind!r}, {self.id!r}, {self.name!r})"
+
+
+class CatalogIndex:
+    """Searchable index of dials and images.
+
+    Entries are numbered in the order they are added, and the postings of words and field values are
+    sets of those numbers. `search` intersects them smallest first and finds the words starting with
+    a prefix by bisecting the sorted vocabulary, so a query costs time in proportion to the matches
+    rather than the catalog size. A query with a limit walks its candidates in order instead and
+    stops at the limit, so a broad query is answered after a few entries.
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty index."""
+        self._entries: dict[int, IndexEntry] = {}
+        self._numbers: dict[tuple[str, Any], int] = {}
+        self._postings: dict[str, set[int]] = {}
+        self._vocabulary: list[str] = []
+        self._filters: dict[tuple[str, str], set[int]] = {}
+        self._next_number = 0
+
+    def __len__(self) -> int:
+        """Return the number of entries."""
+        return len(self._entries)
+
+    def _add(
+            self,
+            kind: str,
+            entry_id: Any,  # noqa: ANN401
+            name: str,
+            fields: Mapping[str, str],
+            item: Mapping[str, Any],
+    ) -> None:
+        """Index an entry, replacing any previous entry with the same kind and ID."""
+        key = (kind, entry_id)
+        if key in self._numbers:
+            self._remove(self._numbers[key])
+        number = self._next_number
+        self._next_number += 1
+        entry = IndexEntry(kind, entry_id, name, {"kind": kind, **fields}, item)
+        self._entries[number] = entry
+        self._numbers[key] = number
+        for token in entry.tokens:
+            postings = self._postings.get(token)
+            if postings is None:
+                postings = self._postings[token] = set()
+                bisect.insort(self._vocabulary, token)
+            postings.add(number)
+        for field in entry.fields.items():
+            self._filters.setdefault(field, set()).add(number)
+
+    def _remove(self, number: int) -> None:
+        """Remove an entry from the postings and filters."""
+        entry = self._entries.pop(number)
+        del self._numbers[entry.kind, entry.id]
+        for token in entry.tokens:
+            postings = self._postings[token]
+            postings.discard(number)
+            if not postings:
+                del self._postings[token]
+                del self._vocabulary[bisect.bisect_left(self._vocabulary, token)]
+        for field in entry.fields.items():
+            self._filters[field].discard(number)
+
+    def add_dial(self, dial_type: str, dial: Mapping[str, Any]) -> None:
+        """Index a dial from a DialList.
+
+        Args:
+            dial_type: The type of the dial list (e.g. "Social").
+            dial: The dial, with ClockId and Name.
+
+        """
+        self._add(DIAL, dial.get("ClockId"), dial.get("Name") or "", {"dial_type": dial_type}, dial)
+
+    def add_image(self, image: Mapping[str, Any], source: str = "upload") -> None:
+        """Index an image from an ImgList.
+
+        Args:
+            image: The image, with FileId and FileName.
+            source: The list the image came from, e.g. "upload" or "like" (default: "upload").
+
+        """
+        self._add(IMAGE, image.get("FileId"), image.get("FileName") or "", {"source": source}, image)
+
+    def add_dial_list(self, dial_type: str, response: Mapping[str, Any]) -> None:
+        """Index every dial of a `Divoom.get_dial_list` page."""
+        for dial in response.get("DialList") or ():
+            self.add_dial(dial_type, dial)
+
+    def add_img_list(self, response: Mapping[str, Any], source: str = "upload") -> None:
+        """Index every image of a `Divoom.get_img_upload_list` or `Divoom.get_img_like_list` page."""
+        for image in response.get("ImgList") or ():
+            self.add_image(image, source)
+
+    def _completions(self, prefix: str) -> list[str]:
+        """Return the indexed words starting with a prefix."""
+        vocabulary = self._vocabulary
+        start = index = bisect.bisect_left(vocabulary, prefix)
+        while index < len(vocabulary) and vocabulary[index].startswith(prefix):
+            index += 1
+        return vocabulary[start:index]
+
+    def _matches(self, words: list[str], filters: Mapping[str, str], *, prefix: bool) -> Iterable[int]:
+        """Return the numbers of the entries matching the query words and filters."""
+        last = words.pop() if prefix and words else None
+        sets = [self._postings.get(word, set()) for word in words]
+        sets.extend(self._filters.get(field, set()) for field in filters.items())
+        if last is not None:
+            completions = [self._postings[word] for word in self._completions(last)]
+            sets.sort(key=len)
+            if not sets or sum(map(len, completions)) <= len(sets[0]):
+                sets.append(completions[0] if len(completions) == 1 else set().union(*completions))
+                return self._intersect(sets)
+            candidates = self._intersect(sets)
+            if len(candidates) < len(completions):
+                # Few candidates left: checking their words beats one set operation per completion
+                entries = self._entries
+                return [
+                    number for number in candidates
+                    if any(token.startswith(last) for token in entries[number].tokens)
+                ]
+            matches: set[int] = set()
+            for postings in completions:
+                matches |= candidates.intersection(postings)
+            return matches
+        return self._intersect(sets) if sets else self._entries
+
+    def _first_matches(
+            self,
+            words: list[str],
+            filters: Mapping[str, str],
+            limit: int,
+            *,
+            prefix: bool,
+    ) -> list[int] | None:
+        """Return the first `limit` matching entry numbers by walking candidates in order.
+
+        The candidates are the smallest posting set, sorted, or the entries if the query is only a
+        prefix. Returns None once the walk would cost more than the postings of the words completing
+        the prefix, whose union is then the cheaper way to find the matches.
+        """
+        last = words[-1] if prefix and words else None
+        sets = [self._postings.get(word) for word in (words[:-1] if last is not None else words)]
+        sets.extend(self._filters.get(field) for field in filters.items())
+        if None in sets or limit <= 0:
+            return []
+        sets.sort(key=len)
+        budget = len(sets[0]) if sets else len(self._entries)
+        if last is not None:
+            completions = 0
+            for word in self._completions(last):
+                completions += len(self._postings[word])
+                if completions >= budget:
+                    break
+            else:
+                if sets:
+                    return None
+                budget = completions
+        candidates = sorted(sets.pop(0)) if sets else self._entries
+        entries = self._entries
+        found: list[int] = []
+        for visited, number in enumerate(candidates):
+            if visited >= budget:
+                return None
+            if all(number in postings for postings in sets) and (
+                last is None or any(token.startswith(last) for token in entries[number].tokens)
+            ):
+                found.append(number)
+                if len(found) == limit:
+                    break
+        return found
+
+    @staticmethod
+    def _intersect(sets: list[set[int]]) -> set[int]:
+        """Intersect sets, smallest first, without copying a single set."""
+        if len(sets) == 1:
+            return sets[0]
+        sets.sort(key=len)
+        return sets[0].intersection(*sets[1:])
+
+    def search(
+            self,
+            query: str = "",
+            *,
+            prefix: bool = True,
+            limit: int | None = None,
+            **filters: str,
+    ) -> list[IndexEntry]:
+        """Find the entries whose name contains every word of the query.
+
+        Args:
+            query: Words to look for; without words only the filters apply.
+            prefix: Match the last word of the query as a prefix, for search-as-you-type (default: True).
+            limit: Maximum number of entries to return (default: all).
+            **filters: Field values to match, e.g. kind="dial", dial_type="Social", source="like".
+
+        Returns:
+            The matching entries, in the order they were added.
+
+        """
+        words = tokenize(query)
+        ordered = self._first_matches(words, filters, limit, prefix=prefix) if limit is not None else None
+        if ordered is None:
+            ordered = sorted(self._matches(words, filters, prefix=prefix))[:limit]
+        return [self._entries[number] for number in ordered]
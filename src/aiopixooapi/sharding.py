@@ -0,0 +1,485 @@
+"""Provides the `ShardedFleet` class, which spreads a fleet of devices over worker processes.
+
+Every worker process runs its own event loop and `PixooFleet`, with its own connection pool, for
+the devices a consistent hash ring assigns to it, so the JSON and base64 work of thousands of
+devices is spread over several cores. Requests travel over pipes as compact tuples; large command
+bodies, such as frames, go through shared memory and are copied once per worker instead of once
+per device.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import bisect
+import contextlib
+import hashlib
+import itertools
+import logging
+import multiprocessing
+import os
+import pickle
+import time
+from concurrent.futures import ThreadPoolExecutor
+from multiprocessing import shared_memory
+from typing import TYPE_CHECKING, Any, Callable
+
+from .commands import Command, FrameCommand
+from .exceptions import PixooError
+from .fleet import DEFAULT_CONCURRENCY, FleetResult, PixooFleet
+
+if TYPE_CHECKING:
+    import types
+    from collections.abc import AsyncIterator, Iterable, Mapping
+    from multiprocessing.connection import Connection
+
+    from typing_extensions import Self
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_REPLICAS = 64  # Points per worker on the hash ring
+SHARED_MEMORY_THRESHOLD = 16384  # Command bodies from this size on are passed through shared memory
+
+
+class HashRing:
+    """Consistent hash ring assigning keys to nodes.
+
+    Each node is placed on the ring at several points, so keys spread evenly and adding or removing
+    a node only moves the keys of that node.
+    """
+
+    def __init__(self, nodes: Iterable[int], replicas: int = DEFAULT_REPLICAS) -> None:
+        """Initialize the ring.
+
+        Args:
+            nodes: The nodes to assign keys to.
+            replicas: Number of points per node on the ring (default: 64).
+
+        """
+        points = sorted((self._hash(f"{node}:{replica}"), node) for node in nodes for replica in range(replicas))
+        self._points = [point for point, _ in points]
+        self._nodes = [node for _, node in points]
+
+    @staticmethod
+    def _hash(key: str) -> int:
+        """Return a stable 64-bit hash of a key, the same in every process."""
+        return int.from_bytes(hashlib.blake2b(key.encode(), digest_size=8).digest(), "big")
+
+    def node_for(self, key: str) -> int:
+        """Return the node a key is assigned to.
+
+        Args:
+            key: The key, e.g. a host.
+
+        Returns:
+            The first node on the ring after the key's hash.
+
+        """
+        index = bisect.bisect(self._points, self._hash(key)) % len(self._points)
+        return self._nodes[index]
+
+
+class ShardMetrics:
+    """Counters reported by a worker process."""
+
+    __slots__ = ("cpu_time", "devices", "errors", "requests", "shard")
+
+    def __init__(self, shard: int) -> None:
+        """Initialize the metrics.
+
+        Args:
+            shard: Index of the worker.
+
+        """
+        self.shard = shard
+        self.devices = 0
+        self.requests = 0
+        self.errors = 0
+        self.cpu_time = 0.0
+
+    def __repr__(self) -> str:
+        """Return the counters."""
+        return (
+            f"ShardMetrics(shard={self.shard}, devices={self.devices}, requests={self.requests}, "
+            f"errors={self.errors}, cpu_time={self.cpu_time:.3f})"
+        )
+
+
+def _portable(error: Exception | None) -> Exception | None:
+    """Return the error, or a PixooError describing it if it cannot be sent to another process."""
+    if error is None:
+        return None
+    try:
+        pickle.dumps(error)
+    except Exception:  # noqa: BLE001, Any pickling failure means the error cannot cross processes
+        return PixooError(f"{type(error).__name__}: {error}")
+    return error
+
+
+def _read_shared(name: str, size: int) -> bytes:
+    """Copy a command body out of shared memory."""
+    block = shared_memory.SharedMemory(name)
+    try:
+        return bytes(block.buf[:size])
+    finally:
+        block.close()
+
+
+class _Worker:
+    """Event loop side of a worker process, running requests on its own PixooFleet."""
+
+    def __init__(self, connection: Connection, port: int, timeout: float, concurrency: int) -> None:
+        self.connection = connection
+        self.fleet = PixooFleet(concurrency=concurrency, port=port, timeout=timeout)
+        self.requests = 0
+        self.errors = 0
+
+    async def run(self) -> None:
+        """Handle requests until the parent asks to close or goes away."""
+        loop = asyncio.get_running_loop()
+        tasks: set[asyncio.Future] = set()
+        with ThreadPoolExecutor(max_workers=1) as receiver:
+            async with self.fleet:
+                while True:
+                    try:
+                        message = await loop.run_in_executor(receiver, self.connection.recv)
+                    except EOFError:
+                        break
+                    op_id, op, *args = message
+                    if op == "close":
+                        break
+                    if op == "add":
+                        # Handled in order, before any later request can select the hosts
+                        for host in args[0]:
+                            self.fleet.add(host)
+                        continue
+                    task = asyncio.ensure_future(self._handle(op_id, op, args))
+                    tasks.add(task)
+                    task.add_done_callback(tasks.discard)
+                await asyncio.gather(*tasks)
+
+    async def _handle(self, op_id: int, op: str, args: list[Any]) -> None:
+        """Run a request on the fleet and send back the results and metrics."""
+        results: list[tuple[str, Any, Exception | None]] = []
+        error = None
+        try:
+            if op == "call":
+                method, call_args, kwargs, hosts = args
+                iterator = self.fleet.broadcast(method, *call_args, hosts=hosts, **kwargs)
+            else:
+                frame, body, shared_name, size, pic_ids, hosts = args
+                if body is None:
+                    body = _read_shared(shared_name, size)
+                command = (FrameCommand if frame else Command).from_body(body)
+                iterator = self.fleet.broadcast_command(command, hosts, pic_ids)
+            async for result in iterator:
+                results.append((result.host, result.result, _portable(result.error)))
+                self.requests += 1
+                self.errors += not result.ok
+        except Exception as err:  # noqa: BLE001, Reported to the parent instead of ending the worker
+            error = _portable(err)
+        metrics = (len(self.fleet), self.requests, self.errors, time.process_time())
+        self.connection.send((op_id, results, metrics, error))
+
+
+def _run_worker(connection: Connection, port: int, timeout: float, concurrency: int) -> None:
+    """Entry point of a worker process."""
+    try:
+        asyncio.run(_Worker(connection, port, timeout, concurrency).run())
+    finally:
+        connection.close()
+
+
+class ShardedFleet:
+    """A fleet of Pixoo64 devices spread over worker processes.
+
+    Devices are assigned to workers by a consistent hash of their host. Operations are given as
+    Pixoo64 method names or prebuilt commands, since they are sent to other processes, and results
+    are streamed back per worker as each one finishes. Each worker runs at most `concurrency`
+    requests at once.
+    """
+
+    def __init__(  # noqa: PLR0913
+            self,
+            devices: Iterable[str] = (),
+            *,
+            workers: int | None = None,
+            concurrency: int = DEFAULT_CONCURRENCY,
+            port: int = 80,
+            timeout: float = 10,
+            replicas: int = DEFAULT_REPLICAS,
+    ) -> None:
+        """Initialize the fleet.
+
+        Args:
+            devices: Hosts of the devices.
+            workers: Number of worker processes (default: the number of CPUs).
+            concurrency: Maximum number of requests running at once per worker (default: 64).
+            port: Port of the devices (default: 80).
+            timeout: Request timeout in seconds (default: 10).
+            replicas: Number of points per worker on the hash ring (default: 64).
+
+        """
+        self.workers = workers or os.cpu_count() or 1
+        self.concurrency = concurrency
+        self.port = port
+        self.timeout = timeout
+        self._ring = HashRing(range(self.workers), replicas)
+        self._shards: list[set[str]] = [set() for _ in range(self.workers)]
+        self._metrics = [ShardMetrics(shard) for shard in range(self.workers)]
+        self._processes: list[multiprocessing.process.BaseProcess] = []
+        self._connections: list[Connection] = []
+        self._receivers: list[asyncio.Future] = []
+        self._executor: ThreadPoolExecutor | None = None
+        self._pending: dict[int, tuple[int, asyncio.Future]] = {}
+        self._op_ids = itertools.count()
+        for host in devices:
+            self.add(host)
+
+    @property
+    def metrics(self) -> list[ShardMetrics]:
+        """Return the metrics of every worker, as of its latest reply."""
+        return self._metrics
+
+    def shard_for(self, host: str) -> int:
+        """Return the index of the worker a host is assigned to."""
+        return self._ring.node_for(host)
+
+    def add(self, host: str) -> int:
+        """Add a device to the fleet.
+
+        Args:
+            host: Host of the device.
+
+        Returns:
+            The index of the worker the device is assigned to.
+
+        """
+        shard = self.shard_for(host)
+        self._shards[shard].add(host)
+        if self._connections:
+            self._connections[shard].send((None, "add", (host,)))
+        return shard
+
+    def __contains__(self, host: object) -> bool:
+        """Return whether a host is part of the fleet."""
+        return isinstance(host, str) and host in self._shards[self.shard_for(host)]
+
+    def __len__(self) -> int:
+        """Return the number of devices."""
+        return sum(len(hosts) for hosts in self._shards)
+
+    async def __aenter__(self) -> Self:
+        """Async context manager entry."""
+        await self.start()
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_val: BaseException | None,
+        exc_tb: types.TracebackType | None,
+    ) -> None:
+        """Async context manager exit."""
+        await self.close()
+
+    async def start(self) -> None:
+        """Start the worker processes and hand them their devices."""
+        if self._connections:
+            return
+        context = multiprocessing.get_context("spawn")  # Forking a process with a running loop is unsafe
+        self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="shard-receiver")
+        for shard, hosts in enumerate(self._shards):
+            connection, child_connection = context.Pipe()
+            process = context.Process(
+                target=_run_worker,
+                args=(child_connection, self.port, self.timeout, self.concurrency),
+                name=f"pixoo-shard-{shard}",
+                daemon=True,
+            )
+            process.start()
+            child_connection.close()
+            connection.send((None, "add", tuple(hosts)))
+            self._processes.append(process)
+            self._connections.append(connection)
+            self._receivers.append(asyncio.ensure_future(self._receive(shard)))
+        logger.debug("Started %d fleet workers", self.workers)
+
+    async def close(self) -> None:
+        """Ask the workers to finish their requests and exit, then wait for them.
+
+        The pipes, processes and receiver threads are released even if closing is interrupted; workers
+        still running then are killed.
+        """
+        if not self._connections:
+            return
+        loop = asyncio.get_running_loop()
+        try:
+            for connection in self._connections:
+                with contextlib.suppress(OSError):  # The worker may already have exited
+                    connection.send((None, "close"))
+            await asyncio.gather(*self._receivers)
+            for process in self._processes:
+                await loop.run_in_executor(self._executor, process.join)
+        finally:
+            for connection in self._connections:
+                connection.close()
+            for process in self._processes:
+                if process.is_alive():
+                    process.kill()
+                    process.join()
+                process.close()
+            self._executor.shutdown()
+            self._processes, self._connections, self._receivers = [], [], []
+        logger.debug("Stopped fleet workers")
+
+    async def _receive(self, shard: int) -> None:
+        """Resolve the pending requests of a worker with its replies until it exits."""
+        loop = asyncio.get_running_loop()
+        connection = self._connections[shard]
+        while True:
+            try:
+                op_id, results, metrics, error = await loop.run_in_executor(self._executor, connection.recv)
+            except (EOFError, OSError):
+                break
+            shard_metrics = self._metrics[shard]
+            shard_metrics.devices, shard_metrics.requests, shard_metrics.errors, shard_metrics.cpu_time = metrics
+            _, future = self._pending.pop(op_id, (shard, None))
+            if future is None or future.done():
+                continue
+            if error is not None:
+                future.set_exception(error)
+            else:
+                future.set_result(results)
+
+        for op_id, (pending_shard, future) in list(self._pending.items()):
+            if pending_shard == shard:
+                del self._pending[op_id]
+                if not future.done():
+                    future.set_exception(PixooError(f"Fleet worker {shard} exited"))
+
+    def _request(self, shard: int, message: tuple[Any, ...]) -> asyncio.Future:
+        """Send a request to a worker and return the future of its reply."""
+        op_id = next(self._op_ids)
+        future = asyncio.get_running_loop().create_future()
+        self._pending[op_id] = (shard, future)
+        self._connections[shard].send((op_id, *message))
+        return future
+
+    def _by_shard(self, hosts: Iterable[str] | None) -> dict[int, list[str] | None]:
+        """Group hosts by worker; None selects every device of a worker."""
+        if hosts is None:
+            return {shard: None for shard, shard_hosts in enumerate(self._shards) if shard_hosts}
+        grouped: dict[int, list[str] | None] = {}
+        for host in hosts:
+            grouped.setdefault(self.shard_for(host), []).append(host)
+        return grouped
+
+    async def _map(
+            self,
+            hosts: Iterable[str] | None,
+            message: Callable[[int, list[str] | None], tuple[Any, ...]],
+    ) -> AsyncIterator[FleetResult[dict]]:
+        """Send a request to every worker concerned and yield the results as workers reply."""
+        if not self._connections:
+            await self.start()
+        futures = [
+            self._request(shard, message(shard, shard_hosts)) for shard, shard_hosts in self._by_shard(hosts).items()
+        ]
+        try:
+            for next_done in asyncio.as_completed(futures):
+                for host, result, error in await next_done:
+                    yield FleetResult(host, result, error)
+        finally:
+            # Replies arriving after the caller stopped iterating are dropped
+            for future in futures:
+                future.cancel()
+
+    def broadcast(
+            self,
+            method: str,
+            *args: Any,  # noqa: ANN401
+            hosts: Iterable[str] | None = None,
+            **kwargs: Any,  # noqa: ANN401
+    ) -> AsyncIterator[FleetResult[dict]]:
+        """Call the same Pixoo64 method on many devices, yielding results as workers finish.
+
+        Args:
+            method: Name of the Pixoo64 method to call (e.g. "set_brightness").
+            *args: Positional arguments for the method, which must be picklable.
+            hosts: Hosts to call the method on (default: every device).
+            **kwargs: Keyword arguments for the method, which must be picklable.
+
+        Returns:
+            Async iterator of a FleetResult per device.
+
+        """
+        return self._map(hosts, lambda _, shard_hosts: ("call", method, args, kwargs, shard_hosts))
+
+    async def broadcast_command(
+            self,
+            command: Command,
+            hosts: Iterable[str] | None = None,
+            pic_ids: Mapping[str, int] | None = None,
+    ) -> AsyncIterator[FleetResult[dict]]:
+        """Send one prebuilt command to many devices, yielding results as workers finish.
+
+        The serialized body is placed in shared memory when it is large, and each worker sends it to
+        its devices as `PixooFleet.broadcast_command` does.
+
+        Args:
+            command: The command to send.
+            hosts: Hosts to send the command to (default: every device).
+            pic_ids: Animation ID per host for a FrameCommand (default: the command's own PicID).
+
+        Yields:
+            A FleetResult per device.
+
+        """
+        body: bytes | None = command.body
+        size = len(body)
+        block = None
+        frame = isinstance(command, FrameCommand)
+
+        def message(shard: int, shard_hosts: list[str] | None) -> tuple[Any, ...]:
+            shard_pic_ids = None
+            if pic_ids is not None:
+                wanted = self._shards[shard] if shard_hosts is None else shard_hosts
+                shard_pic_ids = {host: pic_ids[host] for host in wanted if host in pic_ids}
+            return ("send", frame, body, block.name if block else None, size, shard_pic_ids, shard_hosts)
+
+        try:
+            if size >= SHARED_MEMORY_THRESHOLD:
+                block = shared_memory.SharedMemory(create=True, size=size)
+                block.buf[:size] = body
+                body = None
+            results = self._map(hosts, message)
+            try:
+                async for result in results:
+                    yield result
+            finally:
+                await results.aclose()
+        finally:
+            if block is not None:
+                block.close()
+                block.unlink()
+
+    async def gather(
+            self,
+            method: str,
+            *args: Any,  # noqa: ANN401
+            hosts: Iterable[str] | None = None,
+            **kwargs: Any,  # noqa: ANN401
+    ) -> dict[str, FleetResult[dict]]:
+        """Call the same Pixoo64 method on many devices and wait for all of them.
+
+        Args:
+            method: Name of the Pixoo64 method to call.
+            *args: Positional arguments for the method.
+            hosts: Hosts to call the method on (default: every device).
+            **kwargs: Keyword arguments for the method.
+
+        Returns:
+            Dictionary mapping each host to its FleetResult.
+
+        """
+        return {result.host: result async for result in self.broadcast(method, *args, hosts=hosts, **kwargs)}
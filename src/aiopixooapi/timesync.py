@@ -0,0 +1,158 @@
+"""Latency-compensated clock synchronization for Pixoo64 devices.
+
+A device reports its clock in whole seconds (`get_device_time`) and is set with a whole-second
+timestamp (`set_system_time`). Sending the local time as-is leaves every device behind by however
+long its request took. Here the offset of a device clock is estimated NTP-style from timed
+`get_device_time` requests, and `set_system_time` is sent so that it reaches the device as the
+timestamp it carries begins.
+
+The local time and the delays are taken from a `Clock`, which tests replace with a virtual one.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import math
+import time
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .pixoo64 import Pixoo64
+
+DEFAULT_SAMPLES = 4
+MIN_LEAD = 0.05  # Seconds left between scheduling and sending set_system_time
+
+
+class Clock:
+    """Source of the local time and of delays, backed by the system clock and the event loop."""
+
+    def time(self) -> float:
+        """Return the local Unix time, in seconds."""
+        return time.time()
+
+    def monotonic(self) -> float:
+        """Return a monotonic time for measuring intervals, in seconds."""
+        return time.monotonic()
+
+    async def sleep(self, delay: float) -> None:
+        """Wait for a number of seconds."""
+        await asyncio.sleep(delay)
+
+
+SYSTEM_CLOCK = Clock()
+
+
+class ClockOffset:
+    """Estimated offset of a device clock from the local clock."""
+
+    __slots__ = ("offset", "rtt", "uncertainty")
+
+    def __init__(self, offset: float, uncertainty: float, rtt: float) -> None:
+        """Initialize the estimate.
+
+        Args:
+            offset: Device clock minus local clock, in seconds.
+            uncertainty: Half-width of the interval the offset is known to lie in, in seconds.
+            rtt: Shortest round-trip time measured, in seconds.
+
+        """
+        self.offset = offset
+        self.uncertainty = uncertainty
+        self.rtt = rtt
+
+    def __repr__(self) -> str:
+        """Return the estimate."""
+        return f"ClockOffset(offset={self.offset:+.3f}, uncertainty={self.uncertainty:.3f}, rtt={self.rtt:.3f})"
+
+
+class ClockSyncResult:
+    """Clock offset of a device before and after synchronization."""
+
+    __slots__ = ("after", "before")
+
+    def __init__(self, before: ClockOffset, after: ClockOffset) -> None:
+        """Initialize the result.
+
+        Args:
+            before: Offset measured before setting the clock.
+            after: Offset measured after setting the clock.
+
+        """
+        self.before = before
+        self.after = after
+
+    @property
+    def residual_skew(self) -> float:
+        """Return the remaining offset of the device clock, in seconds."""
+        return self.after.offset
+
+    def __repr__(self) -> str:
+        """Return the offsets."""
+        return f"ClockSyncResult(before={self.before!r}, after={self.after!r})"
+
+
+async def measure_offset(pixoo: Pixoo64, samples: int = DEFAULT_SAMPLES, *, clock: Clock = SYSTEM_CLOCK) -> ClockOffset:
+    """Estimate the offset of a device clock from timed `get_device_time` requests.
+
+    A reading of T whole seconds taken between local times t0 and t3 places the offset in
+    [T - t3, T + 1 - t0]. The samples are spread over a second, so they catch the device clock at
+    different points of its second, and their intervals are intersected.
+
+    Args:
+        pixoo: The device.
+        samples: Number of requests to time (default: 4).
+        clock: Source of the local time and of the delays between samples (default: the system clock).
+
+    Returns:
+        The estimated offset.
+
+    Raises:
+        PixooCommandError: If the API returns an error or invalid response.
+        PixooConnectionError: If a request fails.
+
+    """
+    low, high = -math.inf, math.inf
+    rtt = math.inf
+    for sample in range(samples):
+        if sample:
+            await clock.sleep(1 / samples)
+        sent = clock.time()
+        response = await pixoo.get_device_time()
+        received = clock.time()
+        device_time = response["UTCTime"]
+        rtt = min(rtt, received - sent)
+        sample_low, sample_high = device_time - received, device_time + 1 - sent
+        if sample_low > high or sample_high < low:
+            # The device clock moved between samples, start over from this one
+            low, high = sample_low, sample_high
+        else:
+            low, high = max(low, sample_low), min(high, sample_high)
+    return ClockOffset((low + high) / 2, (high - low) / 2, rtt)
+
+
+async def sync_clock(pixoo: Pixoo64, samples: int = DEFAULT_SAMPLES, *, clock: Clock = SYSTEM_CLOCK) -> ClockSyncResult:
+    """Set a device clock to the local clock, compensating for the request latency.
+
+    The one-way delay is taken as half the shortest round-trip time. `set_system_time` is sent that
+    long before the next whole second, carrying that second, and the offset is measured again to
+    verify the result.
+
+    Args:
+        pixoo: The device.
+        samples: Number of requests to time per measurement (default: 4).
+        clock: Source of the local time the device is set to (default: the system clock).
+
+    Returns:
+        The offsets before and after.
+
+    Raises:
+        PixooCommandError: If the API returns an error or invalid response.
+        PixooConnectionError: If a request fails.
+
+    """
+    before = await measure_offset(pixoo, samples, clock=clock)
+    one_way = before.rtt / 2
+    target = math.ceil(clock.time() + one_way + MIN_LEAD)
+    await clock.sleep(max(target - one_way - clock.time(), 0))
+    await pixoo.set_system_time(target)
+    return ClockSyncResult(before, await measure_offset(pixoo, samples, clock=clock))
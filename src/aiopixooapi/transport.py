@@ -0,0 +1,541 @@
+"""Provides the transports used by `BasePixoo` to post JSON requests.
+
+`AiohttpTransport` is the default. `StreamTransport` speaks HTTP/1.1 directly over asyncio streams,
+and `MemoryTransport` answers requests in-process, for tests.
+"""
+
+from __future__ import annotations
+
+import abc
+import asyncio
+import inspect
+import json
+import logging
+import time
+from typing import TYPE_CHECKING, Any, Callable
+from urllib.parse import urlsplit
+
+import aiohttp
+from multidict import CIMultiDict, CIMultiDictProxy
+from yarl import URL
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator, Mapping
+
+logger = logging.getLogger(__name__)
+
+HTTP_BAD_REQUEST = 400
+STREAM_CHUNK_SIZE = 16384  # Bytes read at a time by post_chunks
+_BODILESS_STATUSES = frozenset({204, 304})  # Responses that never carry a body (RFC 9112)
+DEFAULT_PORTS = {"http": 80, "https": 443}
+
+
+class StaleConnectionError(aiohttp.ServerDisconnectedError):
+    """The server closed a reused keep-alive connection before any byte of the response arrived.
+
+    The device drops idle connections, so a request sent on one it already closed never reached
+    it and can safely be sent again, whatever the command.
+    """
+
+
+class TransportResponse:
+    """Status, headers and raw body of a response."""
+
+    __slots__ = ("body", "headers", "status")
+
+    def __init__(self, status: int, headers: Mapping[str, str], body: bytes) -> None:
+        """Initialize the response.
+
+        Args:
+            status: HTTP status code.
+            headers: Response headers (case-insensitive mapping).
+            body: Raw response body.
+
+        """
+        self.status = status
+        self.headers = headers
+        self.body = body
+
+
+def _raise_for_status(
+        url: str,
+        status: int,
+        reason: str,
+        headers: Mapping[str, str],
+        method: str = "POST",
+) -> None:
+    """Raise aiohttp.ClientResponseError for error statuses, as an aiohttp session with raise_for_status does."""
+    if status >= HTTP_BAD_REQUEST:
+        request_info = aiohttp.RequestInfo(URL(url), method, CIMultiDictProxy(CIMultiDict()), URL(url))
+        raise aiohttp.ClientResponseError(
+            request_info,
+            (),
+            status=status,
+            message=reason,
+            headers=CIMultiDictProxy(CIMultiDict(headers)),
+        )
+
+
+class Transport(abc.ABC):
+    """Interface for posting a JSON request body and reading back the response.
+
+    Failures are raised as aiohttp exceptions (aiohttp.ClientError subclasses or asyncio.TimeoutError)
+    whatever the implementation, so callers handle every transport the same way. A transport can be
+    shared by several clients; it is started by every client using it, so `start` must be idempotent.
+    """
+
+    async def start(self) -> None:  # noqa: B027
+        """Prepare the transport for use."""
+
+    @abc.abstractmethod
+    async def post(
+            self,
+            url: str,
+            body: bytes,
+            *,
+            timeout: aiohttp.ClientTimeout,
+            headers: Mapping[str, str] | None = None,
+    ) -> TransportResponse:
+        """Post a JSON body.
+
+        Args:
+            url: Request URL.
+            body: Serialized JSON request body.
+            timeout: Timeouts for the request.
+            headers: Optional extra request headers.
+
+        Returns:
+            The response.
+
+        Raises:
+            aiohttp.ClientError: If the request fails or the server answers with an error status.
+            asyncio.TimeoutError: If the request times out.
+
+        """
+
+    async def get(
+            self,
+            url: str,
+            *,
+            timeout: aiohttp.ClientTimeout,
+            headers: Mapping[str, str] | None = None,
+    ) -> TransportResponse:
+        """Fetch a resource, such as an image file.
+
+        Args:
+            url: Resource URL.
+            timeout: Timeouts for the request.
+            headers: Optional extra request headers.
+
+        Returns:
+            The response.
+
+        Raises:
+            NotImplementedError: If the transport only supports posting.
+            aiohttp.ClientError: If the request fails or the server answers with an error status.
+            asyncio.TimeoutError: If the request times out.
+
+        """
+        msg = f"{type(self).__name__} does not support GET requests"
+        raise NotImplementedError(msg)
+
+    async def post_chunks(
+            self,
+            url: str,
+            body: bytes,
+            *,
+            timeout: aiohttp.ClientTimeout,
+            headers: Mapping[str, str] | None = None,
+    ) -> AsyncIterator[bytes]:
+        """Post a JSON body and yield the response body in chunks as it arrives.
+
+        Transports without streaming support yield the whole body as a single chunk.
+
+        Args:
+            url: Request URL.
+            body: Serialized JSON payload.
+            timeout: Timeouts for the request.
+            headers: Optional extra request headers.
+
+        Yields:
+            Chunks of the response body.
+
+        Raises:
+            aiohttp.ClientError: If the request fails or the server answers with an error status.
+            asyncio.TimeoutError: If the request times out.
+
+        """
+        yield (await self.post(url, body, timeout=timeout, headers=headers)).body
+
+    async def close(self) -> None:  # noqa: B027
+        """Release the resources held by the transport."""
+
+
+class AiohttpTransport(Transport):
+    """Transport built on an aiohttp.ClientSession."""
+
+    def __init__(self, idle_timeout: float | None = None, limit: int = 100) -> None:
+        """Initialize the transport.
+
+        Args:
+            idle_timeout: Discard pooled connections idle for longer than this many seconds
+                (default: None, aiohttp's keep-alive timeout).
+            limit: Maximum number of simultaneous connections (default: 100).
+
+        """
+        self.idle_timeout = idle_timeout
+        self.limit = limit
+        self._session: aiohttp.ClientSession | None = None
+
+    @property
+    def session(self) -> aiohttp.ClientSession | None:
+        """Return the underlying aiohttp session, or None before the transport is started."""
+        return self._session
+
+    async def start(self) -> None:
+        """Create the aiohttp session."""
+        if self._session is None:
+            connector_args: dict[str, Any] = {"limit": self.limit}
+            if self.idle_timeout is not None:
+                connector_args["keepalive_timeout"] = self.idle_timeout
+            self._session = aiohttp.ClientSession(
+                headers={"Content-Type": "application/json"},
+                raise_for_status=True,
+                connector=aiohttp.TCPConnector(**connector_args),
+            )
+            logger.debug("Created new aiohttp session")
+
+    async def post(
+            self,
+            url: str,
+            body: bytes,
+            *,
+            timeout: aiohttp.ClientTimeout,
+            headers: Mapping[str, str] | None = None,
+    ) -> TransportResponse:
+        """Post a JSON body through the aiohttp session."""
+        if self._session is None:
+            await self.start()
+        async with self._session.post(url, data=body, timeout=timeout, headers=headers) as response:
+            return TransportResponse(response.status, response.headers, await response.read())
+
+    async def get(
+            self,
+            url: str,
+            *,
+            timeout: aiohttp.ClientTimeout,
+            headers: Mapping[str, str] | None = None,
+    ) -> TransportResponse:
+        """Fetch a resource through the aiohttp session."""
+        if self._session is None:
+            await self.start()
+        async with self._session.get(url, timeout=timeout, headers=headers) as response:
+            return TransportResponse(response.status, response.headers, await response.read())
+
+    async def post_chunks(
+            self,
+            url: str,
+            body: bytes,
+            *,
+            timeout: aiohttp.ClientTimeout,
+            headers: Mapping[str, str] | None = None,
+    ) -> AsyncIterator[bytes]:
+        """Post a JSON body through the aiohttp session and yield the response body as it is received."""
+        if self._session is None:
+            await self.start()
+        async with self._session.post(url, data=body, timeout=timeout, headers=headers) as response:
+            async for chunk in response.content.iter_chunked(STREAM_CHUNK_SIZE):
+                yield chunk
+
+    async def close(self) -> None:
+        """Close the aiohttp session."""
+        if self._session:
+            await self._session.close()
+            await asyncio.sleep(0)  # Graceful shutdown
+            self._session = None
+            logger.debug("Closed aiohttp session")
+
+
+def _connection_lost(err: OSError, *, stale: bool) -> aiohttp.ClientError:
+    """Return the aiohttp exception for a socket error, StaleConnectionError if the request never got through."""
+    if stale:
+        return StaleConnectionError(f"Reused connection lost: {err}")
+    return aiohttp.ClientOSError(err.errno, f"Connection lost: {err}")
+
+
+class _StreamConnection:
+    """An open HTTP/1.1 connection, the time it was last released to the pool and whether it was reused."""
+
+    __slots__ = ("reader", "released", "reused", "writer")
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.reader = reader
+        self.writer = writer
+        self.released = 0.0
+        self.reused = False
+
+    def close(self) -> None:
+        self.writer.close()
+
+
+class _Target:
+    """Connection details and pre-built request head for a method and URL."""
+
+    __slots__ = ("head", "host", "method", "port", "ssl")
+
+    def __init__(self, url: str, method: str = "POST") -> None:
+        parts = urlsplit(url)
+        self.host = parts.hostname or ""
+        self.port = parts.port or DEFAULT_PORTS[parts.scheme]
+        self.ssl = parts.scheme == "https"
+        self.method = method
+        path = parts.path or "/"
+        if parts.query:
+            path = f"{path}?{parts.query}"
+        self.head = (
+            f"{method} {path} HTTP/1.1\r\n"
+            f"Host: {parts.netloc}\r\n"
+            "Content-Type: application/json\r\n"
+            "Accept: */*\r\n"
+            "Content-Length: "
+        ).encode("latin-1")
+
+
+class StreamTransport(Transport):
+    """Minimal HTTP/1.1 transport on asyncio streams with persistent connections.
+
+    Only what talking to a Pixoo device needs is implemented: POST with a JSON body, and responses
+    framed by Content-Length, chunked encoding or connection close. The request head is built once
+    per URL. A reused connection closed before any response byte arrived raises StaleConnectionError.
+    """
+
+    def __init__(self, idle_timeout: float = 15.0) -> None:
+        """Initialize the transport.
+
+        Args:
+            idle_timeout: Discard pooled connections idle for longer than this many seconds (default: 15).
+
+        """
+        self.idle_timeout = idle_timeout
+        self._targets: dict[tuple[str, str], _Target] = {}
+        self._pool: dict[tuple[str, int, bool], list[_StreamConnection]] = {}
+
+    async def post(
+            self,
+            url: str,
+            body: bytes,
+            *,
+            timeout: aiohttp.ClientTimeout,
+            headers: Mapping[str, str] | None = None,
+    ) -> TransportResponse:
+        """Post a JSON body over a pooled connection."""
+        return await self._request("POST", url, body, timeout, headers)
+
+    async def get(
+            self,
+            url: str,
+            *,
+            timeout: aiohttp.ClientTimeout,
+            headers: Mapping[str, str] | None = None,
+    ) -> TransportResponse:
+        """Fetch a resource over a pooled connection."""
+        return await self._request("GET", url, b"", timeout, headers)
+
+    async def _request(
+            self,
+            method: str,
+            url: str,
+            body: bytes,
+            timeout: aiohttp.ClientTimeout,
+            headers: Mapping[str, str] | None,
+    ) -> TransportResponse:
+        """Send a request over a pooled connection, within the total timeout."""
+        target = self._targets.get((method, url))
+        if target is None:
+            target = self._targets[method, url] = _Target(url, method)
+        exchange = self._exchange(url, target, body, timeout, headers)
+        if timeout.total is None:
+            return await exchange
+        return await asyncio.wait_for(exchange, timeout.total)
+
+    async def _exchange(
+            self,
+            url: str,
+            target: _Target,
+            body: bytes,
+            timeout: aiohttp.ClientTimeout,
+            headers: Mapping[str, str] | None,
+    ) -> TransportResponse:
+        """Send the request and read the response on a pooled or new connection."""
+        connection = await self._acquire(target, timeout)
+        try:
+            head = target.head + str(len(body)).encode("latin-1") + b"\r\n"
+            if headers:
+                head += "".join(f"{name}: {value}\r\n" for name, value in headers.items()).encode("latin-1")
+            try:
+                connection.writer.writelines((head, b"\r\n", body))
+                await connection.writer.drain()
+            except OSError as err:
+                raise _connection_lost(err, stale=connection.reused) from err
+            status, reason, response_headers, response_body, keep_alive = await self._read_response(
+                connection.reader, reused=connection.reused,
+            )
+        except BaseException:
+            connection.close()
+            raise
+
+        if keep_alive:
+            connection.released = time.monotonic()
+            connection.reused = True
+            self._pool.setdefault((target.host, target.port, target.ssl), []).append(connection)
+        else:
+            connection.close()
+        _raise_for_status(url, status, reason, response_headers, target.method)
+        return TransportResponse(status, response_headers, response_body)
+
+    async def _acquire(self, target: _Target, timeout: aiohttp.ClientTimeout) -> _StreamConnection:
+        """Return a pooled connection that is still fresh, or open a new one."""
+        idle = self._pool.get((target.host, target.port, target.ssl))
+        now = time.monotonic()
+        while idle:
+            connection = idle.pop()
+            if now - connection.released <= self.idle_timeout and not connection.writer.is_closing():
+                return connection
+            connection.close()
+
+        connect_timeout = timeout.sock_connect or timeout.connect
+        try:
+            reader, writer = await asyncio.wait_for(
+                asyncio.open_connection(target.host, target.port, ssl=target.ssl or None),
+                connect_timeout,
+            )
+        except OSError as err:
+            msg = f"Cannot connect to host {target.host}:{target.port}: {err}"
+            raise aiohttp.ClientConnectionError(msg) from err
+        return _StreamConnection(reader, writer)
+
+    @staticmethod
+    async def _read_response(
+            reader: asyncio.StreamReader,
+            *,
+            reused: bool = False,
+    ) -> tuple[int, str, CIMultiDict[str], bytes, bool]:
+        """Read a response and report whether its connection can be reused."""
+        status_line = b""
+        try:
+            status_line = await reader.readline()
+            if not status_line:
+                raise StaleConnectionError if reused else aiohttp.ServerDisconnectedError
+            version, _, rest = status_line.decode("latin-1").rstrip("\r\n").partition(" ")
+            status_text, _, reason = rest.partition(" ")
+            status = int(status_text)
+
+            headers: CIMultiDict[str] = CIMultiDict()
+            while True:
+                line = await reader.readline()
+                if line in (b"\r\n", b"\n", b""):
+                    break
+                name, _, value = line.decode("latin-1").partition(":")
+                headers.add(name.strip(), value.strip())
+
+            keep_alive = version == "HTTP/1.1" and headers.get("Connection", "").lower() != "close"
+            if status in _BODILESS_STATUSES:
+                body = b""
+            elif "chunked" in headers.get("Transfer-Encoding", "").lower():
+                body = await StreamTransport._read_chunked(reader)
+            elif "Content-Length" in headers:
+                body = await reader.readexactly(int(headers["Content-Length"]))
+            else:
+                body = await reader.read()
+                keep_alive = False
+        except asyncio.IncompleteReadError as err:
+            msg = "Response payload is not completed"
+            raise aiohttp.ClientPayloadError(msg) from err
+        except ValueError as err:
+            msg = f"Invalid HTTP response: {err}"
+            raise aiohttp.ClientPayloadError(msg) from err
+        except OSError as err:
+            raise _connection_lost(err, stale=reused and not status_line) from err
+        return status, reason, headers, body, keep_alive
+
+    @staticmethod
+    async def _read_chunked(reader: asyncio.StreamReader) -> bytes:
+        """Read a body sent with chunked transfer encoding."""
+        chunks = []
+        while True:
+            size = int((await reader.readline()).split(b";", 1)[0], 16)
+            if size == 0:
+                # Skip trailers up to the terminating empty line
+                while (await reader.readline()) not in (b"\r\n", b"\n", b""):
+                    pass
+                return b"".join(chunks)
+            chunks.append(await reader.readexactly(size))
+            await reader.readexactly(2)
+
+    async def close(self) -> None:
+        """Close all pooled connections."""
+        for connections in self._pool.values():
+            for connection in connections:
+                connection.close()
+        self._pool.clear()
+
+
+class MemoryTransport(Transport):
+    """Transport answering requests in-process with a handler, for tests.
+
+    The handler receives the URL and the decoded JSON payload (None for an empty body or a GET) and
+    returns a JSON-serializable response, a TransportResponse, or an awaitable of either. It may
+    raise aiohttp exceptions to simulate failures. Requests are recorded in `requests`.
+    """
+
+    def __init__(self, handler: Callable[[str, Any], Any]) -> None:
+        """Initialize the transport.
+
+        Args:
+            handler: Callable producing the response for a URL and payload.
+
+        """
+        self.handler = handler
+        self.requests: list[tuple[str, Any]] = []
+
+    async def post(
+            self,
+            url: str,
+            body: bytes,
+            *,
+            timeout: aiohttp.ClientTimeout,
+            headers: Mapping[str, str] | None = None,  # noqa: ARG002
+    ) -> TransportResponse:
+        """Answer the request with the handler."""
+        return await self._answer(url, json.loads(body) if body else None, timeout)
+
+    async def get(
+            self,
+            url: str,
+            *,
+            timeout: aiohttp.ClientTimeout,
+            headers: Mapping[str, str] | None = None,  # noqa: ARG002
+    ) -> TransportResponse:
+        """Answer the request with the handler, passing None as the payload."""
+        return await self._answer(url, None, timeout, "GET")
+
+    async def _answer(
+            self,
+            url: str,
+            payload: Any,  # noqa: ANN401
+            timeout: aiohttp.ClientTimeout,
+            method: str = "POST",
+    ) -> TransportResponse:
+        """Record the request and build the response from the handler's result."""
+        self.requests.append((url, payload))
+        result = self.handler(url, payload)
+        if inspect.isawaitable(result):
+            result = await (asyncio.wait_for(result, timeout.total) if timeout.total else result)
+        if not isinstance(result, TransportResponse):
+            result = TransportResponse(
+                200,
+                CIMultiDict({"Content-Type": "application/json"}),
+                json.dumps(result).encode(),
+            )
+        _raise_for_status(url, result.status, "", result.headers, method)
+        return result
@@ -0,0 +1,215 @@
+"""Warm-start persistence of Pixoo64 device state and latency profiles.
+
+`DeviceStateStore` keeps the last known state of each device (settings, clock and channel) and the
+round-trip time estimators of its commands in an SQLite database, keyed by host. `WarmStart` seeds
+clients from the store at startup, so a fleet serves commands right away with its known state and
+adaptive timeouts, and revalidates the devices in the background, saving what it reads.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import functools
+import json
+import logging
+import sqlite3
+import threading
+import time
+from typing import TYPE_CHECKING, Any
+
+from .latency import RttEstimator
+from .pixoo64 import VERIFIABLE_STATE_KEYS
+from .revalidation import Revalidations
+
+if TYPE_CHECKING:
+    import os
+    from collections.abc import Iterable
+
+    from .pixoo64 import Pixoo64
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_REVALIDATION_CONCURRENCY = 16
+
+
+class SavedDevice:
+    """State and latency profile of a device, as saved in a DeviceStateStore."""
+
+    __slots__ = ("latency", "saved", "state")
+
+    def __init__(self, state: dict[str, Any], latency: dict[str, RttEstimator], saved: float) -> None:
+        """Initialize the saved device.
+
+        Args:
+            state: Last known device state.
+            latency: Round-trip time estimators, keyed by command.
+            saved: Unix time the device was saved.
+
+        """
+        self.state = state
+        self.latency = latency
+        self.saved = saved
+
+    @property
+    def age(self) -> float:
+        """Return the seconds since the device was saved."""
+        return time.time() - self.saved
+
+
+class DeviceStateStore:
+    """SQLite-backed store of device state and latency profiles, keyed by host.
+
+    The store may be used from several threads; WarmStart saves revalidated devices from the default executor.
+    """
+
+    def __init__(self, path: str | os.PathLike[str] = ":memory:") -> None:
+        """Initialize the store, creating the database if needed.
+
+        Args:
+            path: Database file (default: an in-memory database).
+
+        """
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(str(path), check_same_thread=False)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS devices ("
+            "host TEXT PRIMARY KEY, state TEXT NOT NULL, latency TEXT NOT NULL, saved REAL NOT NULL)",
+        )
+        self._db.commit()
+
+    def get(self, host: str) -> SavedDevice | None:
+        """Return the saved device for a host, or None if it is not stored."""
+        with self._lock:
+            row = self._db.execute("SELECT state, latency, saved FROM devices WHERE host = ?", (host,)).fetchone()
+        if row is None:
+            return None
+        state, latency, saved = row
+        estimators = {key: RttEstimator.restore(*values) for key, values in json.loads(latency).items()}
+        return SavedDevice(json.loads(state), estimators, saved)
+
+    def put(self, pixoo: Pixoo64) -> None:
+        """Save the known state and round-trip time estimators of a client."""
+        self.put_many([pixoo])
+
+    def put_many(self, clients: Iterable[Pixoo64]) -> None:
+        """Save the known state and round-trip time estimators of several clients in one transaction.
+
+        Only the state keys a revalidation reads back (VERIFIABLE_STATE_KEYS) are saved.
+        """
+        now = time.time()
+        rows = []
+        for pixoo in clients:
+            latency = {
+                key: (estimator.srtt, estimator.rttvar, estimator.samples)
+                for key, estimator in pixoo.rtt_estimators.items()
+                if estimator.srtt is not None
+            }
+            state = {key: value for key, value in pixoo.state.items() if key in VERIFIABLE_STATE_KEYS}
+            rows.append((pixoo.host, json.dumps(state), json.dumps(latency), now))
+        with self._lock:
+            self._db.executemany(
+                "INSERT OR REPLACE INTO devices (host, state, latency, saved) VALUES (?, ?, ?, ?)", rows,
+            )
+            self._db.commit()
+
+    def delete(self, hosts: Iterable[str]) -> None:
+        """Remove devices."""
+        with self._lock:
+            self._db.executemany("DELETE FROM devices WHERE host = ?", ((host,) for host in hosts))
+            self._db.commit()
+
+    def close(self) -> None:
+        """Close the database."""
+        with self._lock:
+            self._db.close()
+
+
+class WarmStart:
+    """Seeds clients from a DeviceStateStore and revalidates them in the background.
+
+    `restore` returns at once: clients get their saved state and latency profile, and a background
+    task per device reads its settings, clock and channel back, at most `concurrency` at a time,
+    then saves them. Devices saved less than `max_age` seconds ago are not revalidated.
+    """
+
+    def __init__(
+            self,
+            store: DeviceStateStore,
+            *,
+            max_age: float = 0,
+            concurrency: int = DEFAULT_REVALIDATION_CONCURRENCY,
+    ) -> None:
+        """Initialize the warm start.
+
+        Args:
+            store: Store to read and write the devices.
+            max_age: Seconds a saved device is trusted without revalidation (default: 0, always revalidated).
+            concurrency: Maximum number of devices revalidated at once (default: 16).
+
+        """
+        self.store = store
+        self.max_age = max_age
+        self.concurrency = concurrency
+        self._semaphore: asyncio.Semaphore | None = None
+        self._revalidations = Revalidations(logger)
+
+    def restore(self, clients: Iterable[Pixoo64], *, revalidate: bool = True) -> int:
+        """Seed clients from the store and schedule their revalidation.
+
+        Must be called with a running event loop. Devices that were never saved are revalidated too,
+        which saves them.
+
+        Args:
+            clients: The clients, e.g. a PixooFleet.
+            revalidate: Schedule background revalidations (default: True).
+
+        Returns:
+            The number of clients seeded from the store.
+
+        """
+        restored = 0
+        for pixoo in clients:
+            saved = self.store.get(pixoo.host)
+            if saved is not None:
+                pixoo.seed_state(saved.state)
+                for key, estimator in saved.latency.items():
+                    pixoo.rtt_estimators.setdefault(key, estimator)
+                restored += 1
+            stale = saved is None or saved.age >= self.max_age
+            if revalidate and stale:
+                self._revalidations.schedule(pixoo.host, functools.partial(self.revalidate, pixoo))
+        logger.debug("Restored %d devices, revalidating %d", restored, len(self._revalidations))
+        return restored
+
+    async def revalidate(self, pixoo: Pixoo64) -> None:
+        """Read the settings, clock and channel of a device and save them.
+
+        The device is saved in the default executor, off the event loop.
+
+        Args:
+            pixoo: Client of the device.
+
+        Raises:
+            PixooCommandError: If the API returns an error or invalid response.
+            PixooConnectionError: If a request fails.
+
+        """
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.concurrency)
+        async with self._semaphore:
+            await pixoo.get_all_settings()
+            await pixoo.get_clock_info()
+            await pixoo.get_current_channel()
+        await asyncio.get_running_loop().run_in_executor(None, self.store.put, pixoo)
+
+    def save(self, clients: Iterable[Pixoo64]) -> None:
+        """Save the current state and latency profile of clients, e.g. before shutting down."""
+        self.store.put_many(clients)
+
+    async def join(self) -> None:
+        """Wait for the background revalidations in progress."""
+        await self._revalidations.join()
+
+    async def close(self) -> None:
+        """Cancel the background revalidations in progress."""
+        await self._revalidations.close()
@@ -0,0 +1,60 @@
+"""Shared fixtures for the unit tests."""
+
+from __future__ import annotations
+
+import asyncio
+import heapq
+import itertools
+
+import pytest
+
+from aiopixooapi.timesync import Clock
+
+IDLE_ROUNDS = 20  # Event loop iterations given to runnable tasks before the virtual clock moves on
+
+
+class VirtualClock(Clock):
+    """Clock whose time only moves when every task waiting on it is asleep.
+
+    Sleeping returns as soon as the other tasks have had the chance to run and no sleeper is due
+    earlier, so timing-sensitive code runs instantly and deterministically.
+    """
+
+    def __init__(self, start: float = 1_700_000_000.0) -> None:
+        """Initialize the clock at a Unix time."""
+        self.now = start
+        self._sleepers: list[tuple[float, int, asyncio.Future]] = []
+        self._order = itertools.count()
+        self._advancing: asyncio.Future | None = None
+
+    def time(self) -> float:
+        """Return the virtual time."""
+        return self.now
+
+    def monotonic(self) -> float:
+        """Return the virtual time."""
+        return self.now
+
+    async def sleep(self, delay: float) -> None:
+        """Wait until the virtual time has moved on by a number of seconds."""
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._sleepers, (self.now + max(delay, 0), next(self._order), future))
+        if self._advancing is None or self._advancing.done():
+            self._advancing = asyncio.ensure_future(self._advance())
+        await future
+
+    async def _advance(self) -> None:
+        """Wake the sleepers in order, once the other tasks have run."""
+        while self._sleepers:
+            for _ in range(IDLE_ROUNDS):
+                await asyncio.sleep(0)
+            wake, _, future = heapq.heappop(self._sleepers)
+            self.now = max(self.now, wake)
+            if not future.done():
+                future.set_result(None)
+
+
+@pytest.fixture
+def virtual_clock() -> VirtualClock:
+    """Return a virtual clock starting at a fixed Unix time."""
+    return VirtualClock()
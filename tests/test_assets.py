@@ -0,0 +1,147 @@
+# ruff: noqa: PLR2004, Magic value used in comparison
+# ruff: noqa: S101, Use of `assert` detected
+"""Unit tests for the asset pipeline."""
+
+from __future__ import annotations
+
+import asyncio
+import io
+import sys
+from typing import TYPE_CHECKING, Any
+
+import aiohttp
+import pytest
+from multidict import CIMultiDict
+
+from aiopixooapi.assets import AssetCache, AssetPipeline, decode_frames
+from aiopixooapi.divoom import Divoom
+from aiopixooapi.exceptions import PixooConnectionError
+from aiopixooapi.transport import MemoryTransport, TransportResponse
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+def _files(files: dict[str, bytes], delay: float = 0) -> MemoryTransport:
+    """Return a transport serving files by the last part of their URL."""
+
+    async def handler(url: str, _: Any) -> TransportResponse:  # noqa: ANN401
+        await asyncio.sleep(delay)
+        name = url.rsplit("/", 1)[-1]
+        if name not in files:
+            return TransportResponse(404, CIMultiDict(), b"")
+        return TransportResponse(200, CIMultiDict(), files[name])
+
+    return MemoryTransport(handler)
+
+
+def test_cache_deduplicates_content(tmp_path: Path) -> None:
+    """Test that references with the same content share one stored file."""
+    cache = AssetCache(tmp_path)
+    first = cache.put("a", b"same")
+    second = cache.put("b", b"same")
+    assert first == second
+    assert len(cache) == 1
+    assert cache.size == 4
+    assert cache.get("a") == cache.get("b") == b"same"
+    assert cache.get("c") is None
+
+
+def test_cache_evicts_least_recently_used(tmp_path: Path) -> None:
+    """Test that the least recently used files are evicted once the cache is full, across restarts."""
+    cache = AssetCache(tmp_path, max_size=10)
+    cache.put("a", b"aaaa")
+    cache.put("b", b"bbbb")
+    assert cache.get("a") == b"aaaa"
+    cache.put("c", b"cccc")
+    assert cache.size == 8
+    assert cache.get("b") is None
+    assert cache.get("a") == b"aaaa"
+
+    reopened = AssetCache(tmp_path, max_size=10)
+    assert reopened.size == 8
+    assert reopened.get("c") == b"cccc"
+
+
+@pytest.mark.asyncio
+async def test_fetch_only_once(tmp_path: Path) -> None:
+    """Test that concurrent and repeated fetches of a file send a single request."""
+    transport = _files({"1": b"gif"}, delay=0.01)
+    pipeline = AssetPipeline(Divoom(transport=transport), AssetCache(tmp_path))
+    assert await asyncio.gather(*(pipeline.fetch("1") for _ in range(5))) == [b"gif"] * 5
+    assert await pipeline.fetch("1") == b"gif"
+    assert transport.requests == [("https://f.divoom-gz.com/1", None)]
+
+    reopened = AssetPipeline(Divoom(transport=transport), AssetCache(tmp_path))
+    assert await reopened.fetch("1") == b"gif"
+    assert len(transport.requests) == 1
+
+
+@pytest.mark.asyncio
+async def test_fetch_many_bounded(tmp_path: Path) -> None:
+    """Test that fetch_many respects the concurrency limit and reports failures per file."""
+    active = peak = 0
+
+    async def handler(url: str, _: Any) -> TransportResponse:  # noqa: ANN401
+        nonlocal active, peak
+        active += 1
+        peak = max(peak, active)
+        await asyncio.sleep(0.01)
+        active -= 1
+        if url.endswith("missing"):
+            raise aiohttp.ClientConnectionError
+        return TransportResponse(200, CIMultiDict(), url.encode())
+
+    pipeline = AssetPipeline(Divoom(transport=MemoryTransport(handler)), AssetCache(tmp_path), concurrency=3)
+    results = await pipeline.fetch_many([str(i) for i in range(10)] + ["missing", "0"])
+    assert peak == 3
+    assert len(results) == 11
+    assert results["4"] == b"https://f.divoom-gz.com/4"
+    assert isinstance(results["missing"], PixooConnectionError)
+    assert pipeline.cache.get("missing") is None
+
+
+@pytest.mark.asyncio
+async def test_fetch_error_status(tmp_path: Path) -> None:
+    """Test that an error status raises PixooConnectionError and caches nothing."""
+    pipeline = AssetPipeline(Divoom(transport=_files({})), AssetCache(tmp_path))
+    with pytest.raises(PixooConnectionError):
+        await pipeline.fetch("https://example.com/nothing")
+    assert len(pipeline.cache) == 0
+
+
+@pytest.mark.asyncio
+async def test_fetch_redirect_is_not_cached(tmp_path: Path) -> None:
+    """Test that a redirect returned by a transport that does not follow it is not stored as the file."""
+
+    def handler(url: str, _: Any) -> TransportResponse:  # noqa: ANN401
+        return TransportResponse(302, CIMultiDict({"Location": f"{url}/moved"}), b"<html>Found</html>")
+
+    pipeline = AssetPipeline(Divoom(transport=MemoryTransport(handler)), AssetCache(tmp_path))
+    with pytest.raises(PixooConnectionError, match="HTTP 302"):
+        await pipeline.fetch("1")
+    assert len(pipeline.cache) == 0
+
+
+def test_decode_requires_pillow(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that decoding without Pillow explains how to install it."""
+    monkeypatch.setitem(sys.modules, "PIL", None)
+    with pytest.raises(ImportError, match=r"aiopixooapi\[images\]"):
+        decode_frames(b"GIF89a")
+
+
+@pytest.mark.asyncio
+async def test_frames_from_gif(tmp_path: Path) -> None:
+    """Test that an animated GIF is decoded into frames ready for Pixoo64."""
+    image = pytest.importorskip("PIL.Image")
+    frames = [image.new("RGB", (32, 32), color) for color in ("red", "green", "blue")]
+    buffer = io.BytesIO()
+    frames[0].save(buffer, "GIF", save_all=True, append_images=frames[1:], duration=150)
+
+    pipeline = AssetPipeline(Divoom(transport=_files({"anim": buffer.getvalue()})), AssetCache(tmp_path))
+    commands = await pipeline.frames("anim", pic_id=7)
+    assert [command.payload["PicOffset"] for command in commands] == [0, 1, 2]
+    assert {command.payload["PicNum"] for command in commands} == {3}
+    assert {command.payload["PicWidth"] for command in commands} == {64}
+    assert {command.payload["PicSpeed"] for command in commands} == {150}
+    assert commands[0].pic_id == 7
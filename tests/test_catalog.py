@@ -0,0 +1,160 @@
+# ruff: noqa: PLR2004, Magic value used in comparison
+# ruff: noqa: S101, Use of `assert` detected
+"""Unit tests for the persistent Divoom catalog."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+import pytest
+
+from aiopixooapi.catalog import CatalogStore, DivoomCatalog
+from aiopixooapi.divoom import Divoom
+from aiopixooapi.exceptions import PixooCommandError
+from aiopixooapi.transport import MemoryTransport
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+class _Api:
+    """Handler serving dial types, fonts and a paged dial list that can be changed."""
+
+    def __init__(self, dials: int = 75) -> None:
+        self.dials = [{"ClockId": i, "Name": f"dial {i}"} for i in range(dials)]
+        self.failing = False
+
+    def __call__(self, url: str, payload: Any) -> dict:  # noqa: ANN401
+        if self.failing:
+            return {"ReturnCode": 1, "ReturnMessage": "Server busy"}
+        if url.endswith("GetDialType"):
+            return {"ReturnCode": 0, "DialTypeList": ["Social", "Game"]}
+        if url.endswith("GetTimeDialFontList"):
+            return {"ReturnCode": 0, "FontList": [{"id": 1, "name": "small"}]}
+        page = payload["Page"]
+        return {"ReturnCode": 0, "TotalNum": len(self.dials), "DialList": self.dials[(page - 1) * 30:page * 30]}
+
+
+def _pages(transport: MemoryTransport) -> list[int]:
+    return [payload["Page"] for url, payload in transport.requests if url.endswith("GetDialList")]
+
+
+@pytest.mark.asyncio
+async def test_startup_reads_from_disk(tmp_path: Path) -> None:
+    """Test that a second catalog on the same database answers without any request."""
+    api = _Api()
+    transport = MemoryTransport(api)
+    async with Divoom(transport=transport) as divoom:
+        catalog = DivoomCatalog(divoom, CatalogStore(tmp_path / "catalog.db"))
+        assert (await catalog.get_dial_type())["DialTypeList"] == ["Social", "Game"]
+        assert await catalog.get_dial_list("Social") == api.dials
+        assert (await catalog.get_font_list())["FontList"][0]["name"] == "small"
+        catalog.store.close()
+    assert len(transport.requests) == 5
+
+    transport.requests.clear()
+    async with Divoom(transport=transport) as divoom:
+        catalog = DivoomCatalog(divoom, CatalogStore(tmp_path / "catalog.db"))
+        assert await catalog.get_dial_list("Social") == api.dials
+        assert (await catalog.get_dial_type())["DialTypeList"] == ["Social", "Game"]
+        await catalog.join()
+    assert transport.requests == []
+
+
+@pytest.mark.asyncio
+async def test_stale_entries_are_served_while_revalidating() -> None:
+    """Test that a stale entry is returned at once and refreshed in the background."""
+    api = _Api(dials=10)
+    transport = MemoryTransport(api)
+    async with Divoom(transport=transport) as divoom:
+        catalog = DivoomCatalog(divoom, CatalogStore(), max_age=0)
+        first = await catalog.get_dial_list("Social")
+        api.dials.append({"ClockId": 99, "Name": "new"})
+        assert await catalog.get_dial_list("Social") == first
+        await catalog.join()
+        assert await catalog.get_dial_list("Social") == api.dials
+        await catalog.close()
+
+
+@pytest.mark.asyncio
+async def test_unchanged_dial_list_only_fetches_first_page() -> None:
+    """Test that revalidating an unchanged dial list stops after page 1."""
+    api = _Api(dials=100)
+    transport = MemoryTransport(api)
+    async with Divoom(transport=transport) as divoom:
+        catalog = DivoomCatalog(divoom, CatalogStore(), max_age=0)
+        await catalog.get_dial_list("Social")
+        assert _pages(transport) == [1, 2, 3, 4]
+
+        transport.requests.clear()
+        await catalog.get_dial_list("Social")
+        await catalog.join()
+        assert _pages(transport) == [1]
+
+        transport.requests.clear()
+        del api.dials[40:]
+        await catalog.get_dial_list("Social")
+        await catalog.join()
+        assert _pages(transport) == [1, 2]
+        assert await catalog.get_dial_list("Social") == api.dials
+        assert catalog.store.get("Channel/GetDialList/Social/3") is None
+
+
+@pytest.mark.asyncio
+async def test_later_pages_expire_on_their_own() -> None:
+    """Test that a change on page 2 is picked up once the page is older than page_max_age."""
+    api = _Api(dials=75)
+    transport = MemoryTransport(api)
+    async with Divoom(transport=transport) as divoom:
+        catalog = DivoomCatalog(divoom, CatalogStore(), max_age=0, page_max_age=3600)
+        await catalog.get_dial_list("Social")
+        api.dials[40] = {"ClockId": 40, "Name": "renamed"}
+
+        transport.requests.clear()
+        await catalog.get_dial_list("Social")
+        await catalog.join()
+        assert _pages(transport) == [1]
+
+        catalog.page_max_age = 0
+        transport.requests.clear()
+        await catalog.get_dial_list("Social")
+        await catalog.join()
+        assert _pages(transport) == [1, 2, 3]
+        assert (await catalog.get_dial_list("Social"))[40]["Name"] == "renamed"
+        await catalog.join()
+
+
+@pytest.mark.asyncio
+async def test_error_responses_are_not_stored() -> None:
+    """Test that a response with a non-zero ReturnCode is neither returned nor stored."""
+    api = _Api(dials=40)
+    transport = MemoryTransport(api)
+    async with Divoom(transport=transport) as divoom:
+        catalog = DivoomCatalog(divoom, CatalogStore(), max_age=0)
+        api.failing = True
+        with pytest.raises(PixooCommandError):
+            await catalog.get_dial_type()
+        with pytest.raises(PixooCommandError):
+            await catalog.get_dial_list("Social")
+        assert catalog.store.get("Channel/GetDialType") is None
+        assert catalog.store.get("Channel/GetDialList/Social/1") is None
+
+        api.failing = False
+        dials = await catalog.get_dial_list("Social")
+        api.failing = True
+        assert await catalog.get_dial_list("Social") == dials
+        await catalog.join()
+        assert catalog.store.get("Channel/GetDialList/Social/1").response["ReturnCode"] == 0
+
+
+def test_store_put_reports_changes() -> None:
+    """Test that storing identical content only refreshes the fetch time."""
+    store = CatalogStore()
+    assert store.put("key", {"a": 1})
+    fetched = store.get("key").fetched
+    assert not store.put("key", {"a": 1})
+    assert store.get("key").fetched >= fetched
+    assert store.fetched("key") == store.get("key").fetched
+    assert store.fetched("missing") is None
+    assert store.put("key", {"a": 2})
+    assert store.get("key").response == {"a": 2}
@@ -0,0 +1,91 @@
+# ruff: noqa: PLR2004, Magic value used in comparison
+# ruff: noqa: S101, Use of `assert` detected
+"""Unit tests for the command coalescer."""
+
+import asyncio
+
+import pytest
+
+from aiopixooapi.coalesce import CommandCoalescer
+
+
+@pytest.mark.asyncio
+async def test_burst_runs_latest_call_once() -> None:
+    """Test that a burst of calls executes only the latest one and shares its result."""
+    coalescer = CommandCoalescer(0.05)
+    calls = []
+
+    async def call(value: int) -> int:
+        calls.append(value)
+        return value
+
+    results = await asyncio.gather(*(coalescer.submit("key", lambda v=v: call(v)) for v in range(5)))
+    assert calls == [4]
+    assert results == [4, 4, 4, 4, 4]
+
+
+@pytest.mark.asyncio
+async def test_rate_is_capped_per_key() -> None:
+    """Test that consecutive windows for a key are at least one interval apart."""
+    coalescer = CommandCoalescer(0.05)
+    loop = asyncio.get_running_loop()
+    started = []
+
+    async def call() -> None:
+        started.append(loop.time())
+
+    await coalescer.submit("key", call)
+    await coalescer.submit("key", call)
+    assert len(started) == 2
+    assert started[1] - started[0] >= 0.045
+
+
+@pytest.mark.asyncio
+async def test_keys_are_independent() -> None:
+    """Test that calls for different keys are not coalesced together."""
+    coalescer = CommandCoalescer(0.05)
+
+    async def call(value: str) -> str:
+        return value
+
+    results = await asyncio.gather(
+        coalescer.submit("a", lambda: call("a")),
+        coalescer.submit("b", lambda: call("b")),
+    )
+    assert results == ["a", "b"]
+
+
+@pytest.mark.asyncio
+async def test_error_propagates_to_all_callers() -> None:
+    """Test that every caller of a window receives the error of the executed call."""
+    coalescer = CommandCoalescer(0.01)
+
+    async def call() -> None:
+        msg = "boom"
+        raise RuntimeError(msg)
+
+    results = await asyncio.gather(
+        coalescer.submit("key", call),
+        coalescer.submit("key", call),
+        return_exceptions=True,
+    )
+    assert all(isinstance(result, RuntimeError) for result in results)
+
+
+@pytest.mark.asyncio
+async def test_cancelled_flush_cancels_callers() -> None:
+    """Test that callers do not hang when the flush is cancelled while the call is running."""
+    coalescer = CommandCoalescer(0.01)
+    started = asyncio.Event()
+
+    async def call() -> None:
+        started.set()
+        await asyncio.Event().wait()
+
+    callers = [asyncio.ensure_future(coalescer.submit("key", call)) for _ in range(2)]
+    await asyncio.sleep(0)
+    flush = coalescer._pending["key"].task  # noqa: SLF001
+    await started.wait()
+    flush.cancel()
+    results = await asyncio.wait_for(asyncio.gather(*callers, return_exceptions=True), 1)
+    assert all(isinstance(result, asyncio.CancelledError) for result in results)
@@ -0,0 +1,86 @@
+# ruff: noqa: PLR2004, Magic value used in comparison
+# ruff: noqa: S101, Use of `assert` detected
+"""Unit tests for the prebuilt command objects."""
+
+import json
+
+import pytest
+
+from aiopixooapi.commands import Command, FrameCommand, TextCommand
+
+
+def test_command_body() -> None:
+    """Test that the body is the compact JSON payload with the Command key."""
+    command = Command("Channel/SetBrightness", {"Brightness": 50})
+    assert command.body == b'{"Brightness":50,"Command":"Channel/SetBrightness"}'
+    assert command.as_dict() == {"Brightness": 50, "Command": "Channel/SetBrightness"}
+
+
+def test_command_copies_payload() -> None:
+    """Test that changing the source payload does not change the command."""
+    payload = {"Brightness": 50}
+    command = Command("Channel/SetBrightness", payload)
+    payload["Brightness"] = 10
+    assert command.payload["Brightness"] == 50
+    assert "Command" not in payload
+
+
+def test_command_is_immutable() -> None:
+    """Test that commands reject changes."""
+    command = Command("Draw/ClearHttpText")
+    with pytest.raises(AttributeError):
+        command.name = "Device/SysReboot"
+    with pytest.raises(TypeError):
+        command.payload["Command"] = "Device/SysReboot"
+
+
+def test_command_equality() -> None:
+    """Test that commands with the same body are equal and hash alike."""
+    assert Command("Draw/ClearHttpText") == Command("Draw/ClearHttpText")
+    assert len({Command("Draw/ClearHttpText"), Command("Draw/ClearHttpText")}) == 1
+
+
+def test_text_command() -> None:
+    """Test that a text command carries the Draw/SendHttpText payload."""
+    command = TextCommand(1, 0, 0, 0, 1, text_width=32, text_string="Hello", speed=100, color="#FF0000", align=2)
+    assert json.loads(command.body) == {
+        "TextId": 1,
+        "x": 0,
+        "y": 0,
+        "dir": 0,
+        "font": 1,
+        "TextWidth": 32,
+        "TextString": "Hello",
+        "speed": 100,
+        "color": "#FF0000",
+        "align": 2,
+        "Command": "Draw/SendHttpText",
+    }
+
+
+def test_text_command_invalid() -> None:
+    """Test that invalid text parameters are rejected on construction."""
+    with pytest.raises(ValueError, match=r"Font must be between 0 and 7. Got: 8"):
+        TextCommand(1, 0, 0, 0, 8, text_width=32, text_string="Hello", speed=100, color="#FF0000")
+
+
+def test_frame_command() -> None:
+    """Test that a frame command carries the Draw/SendHttpGif payload."""
+    command = FrameCommand(1, 64, 0, 1, 100, pic_data="base64data")
+    assert command.name == "Draw/SendHttpGif"
+    assert command.payload["PicData"] == "base64data"
+
+
+def test_frame_command_invalid() -> None:
+    """Test that invalid frame parameters are rejected on construction."""
+    with pytest.raises(ValueError, match=r"PicWidth must be one of 16, 32, or 64. Got: 48"):
+        FrameCommand(1, 48, 0, 1, 100, pic_data="base64data")
+
+
+def test_frame_command_body_for_pic_id() -> None:
+    """Test that the PicID can be patched into the serialized body."""
+    command = FrameCommand(2, 64, 1, 7, 100, pic_data="base64data")
+    assert command.body_for_pic_id(7) is command.body
+    assert json.loads(command.body_for_pic_id(1234)) == {**command.as_dict(), "PicID": 1234}
+    with pytest.raises(ValueError, match=r"PicID must be greater than or equal to 1. Got: 0"):
+        command.body_for_pic_id(0)
@@ -0,0 +1,112 @@
+# ruff: noqa: PLR2004, Magic value used in comparison
+# ruff: noqa: S101, Use of `assert` detected
+"""Unit tests for LAN discovery, against local servers standing in for devices."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from typing import TYPE_CHECKING, Any
+
+import pytest
+from aiohttp import web
+
+from aiopixooapi.discovery import LanDiscovery, expand_candidates
+from aiopixooapi.divoom import Divoom
+from aiopixooapi.transport import MemoryTransport
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator
+
+DEVICES = ["127.0.0.2", "127.0.0.3"]
+SILENT = [f"127.0.0.{i}" for i in range(10, 40)]
+
+
+@pytest.fixture
+async def port() -> AsyncIterator[int]:
+    """Serve devices on DEVICES and hosts that never answer on SILENT, all on one port."""
+    released = asyncio.Event()
+
+    async def post(request: web.Request) -> web.Response:
+        host = request.transport.get_extra_info("sockname")[0]
+        if host in SILENT:
+            await released.wait()
+        payload = await request.json()
+        assert payload == {"Command": "Channel/GetAllConf"}
+        return web.json_response({"error_code": 0, "Brightness": 100, "Host": host})
+
+    app = web.Application()
+    app.router.add_post("/post", post)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    first = web.TCPSite(runner, DEVICES[0], 0)
+    await first.start()
+    port = first._server.sockets[0].getsockname()[1]  # noqa: SLF001
+    for host in [*DEVICES[1:], *SILENT]:
+        await web.TCPSite(runner, host, port).start()
+    yield port
+    released.set()
+    await runner.cleanup()
+
+
+def test_expand_candidates() -> None:
+    """Test that networks expand to their hosts and duplicates are dropped."""
+    assert expand_candidates(["10.0.0.0/30", "10.0.0.1", "pixoo.local"]) == ["10.0.0.1", "10.0.0.2", "pixoo.local"]
+    assert len(expand_candidates(["192.168.1.0/24"])) == 254
+
+
+@pytest.mark.asyncio
+async def test_discover_network(port: int) -> None:
+    """Test that only responders are returned, with working clients, within about one timeout."""
+    discovery = LanDiscovery(port=port, probe_timeout=0.5)
+    try:
+        started = time.monotonic()
+        devices = await discovery.discover(["127.0.0.0/29", *SILENT])
+        elapsed = time.monotonic() - started
+        assert [device.host for device in devices] == DEVICES
+        assert elapsed < 1.5
+        assert devices[0].settings["Brightness"] == 100
+        assert not devices[0].cloud
+        assert (await devices[1].pixoo.get_all_settings())["Host"] == "127.0.0.3"
+    finally:
+        await discovery.close()
+
+
+@pytest.mark.asyncio
+async def test_discover_merges_cloud(port: int) -> None:
+    """Test that devices listed by the cloud are probed and carry their cloud details."""
+    cloud_list = {
+        "ReturnCode": 0,
+        "DeviceList": [
+            {"DeviceName": "Lobby", "DeviceId": 7, "DevicePrivateIP": "127.0.0.3", "DeviceMac": "aa:bb"},
+            {"DeviceName": "Gone", "DeviceId": 8, "DevicePrivateIP": "127.0.0.7", "DeviceMac": "cc:dd"},
+        ],
+    }
+
+    def handler(_: str, __: Any) -> dict:  # noqa: ANN401
+        return cloud_list
+
+    discovery = LanDiscovery(port=port, probe_timeout=0.5)
+    try:
+        async with Divoom(transport=MemoryTransport(handler)) as divoom:
+            devices = await discovery.discover(["127.0.0.2"], divoom=divoom)
+    finally:
+        await discovery.close()
+    assert [device.host for device in devices] == DEVICES
+    assert (devices[1].cloud, devices[1].name, devices[1].device_id, devices[1].mac) == (True, "Lobby", 7, "aa:bb")
+
+
+@pytest.mark.asyncio
+async def test_discover_without_cloud(port: int) -> None:
+    """Test that a failing cloud request leaves the probe results."""
+
+    def handler(_: str, __: Any) -> dict:  # noqa: ANN401
+        return {"error_code": 1}
+
+    discovery = LanDiscovery(port=port, probe_timeout=0.5)
+    try:
+        async with Divoom(transport=MemoryTransport(handler)) as divoom:
+            devices = await discovery.discover(DEVICES, divoom=divoom)
+    finally:
+        await discovery.close()
+    assert [device.host for device in devices] == DEVICES
@@ -2,10 +2,19 @@
 # ruff: noqa: S101, Use of `assert` detected
 """Unit tests for the Divoom device functionality."""
 
+from __future__ import annotations
+
+import asyncio
+from typing import Any
+
+import aiohttp
 import pytest
 from aioresponses import aioresponses
 
-from aiopixooapi.divoom import Divoom
+from aiopixooapi.divoom import HEDGE_MIN_SAMPLES, Divoom
+from aiopixooapi.exceptions import PixooConnectionError
+from aiopixooapi.pixoo64 import Pixoo64
+from aiopixooapi.transport import AiohttpTransport, MemoryTransport
 
 
 @pytest.mark.asyncio
@@ -207,3 +216,171 @@ async def test_get_local_device_list() -> None:
             assert response["DeviceList"][0]["DevicePrivateIP"] == "10.0.0.100"
             assert response["DeviceList"][1]["DeviceName"] == "PixooMax"
             assert response["DeviceList"][1]["DevicePrivateIP"] == "10.0.0.101"
+
+
+@pytest.mark.asyncio
+async def test_idle_timeout_reaches_transport() -> None:
+    """Test that idle_timeout configures the transport the client creates."""
+    async with Divoom(idle_timeout=4) as divoom:
+        assert isinstance(divoom.transport, AiohttpTransport)
+        assert divoom.transport.idle_timeout == 4
+
+
+@pytest.mark.asyncio
+async def test_retry_on_disconnect_can_be_disabled() -> None:
+    """Test that a dropped connection is retried by default, and not with retry_on_disconnect=False."""
+    for retry, requests in ((True, 2), (False, 1)):
+        async with Divoom(retry_on_disconnect=retry) as divoom:
+            with aioresponses() as mock:
+                mock.post("https://app.divoom-gz.com/Channel/GetDialType", exception=aiohttp.ServerDisconnectedError())
+                mock.post("https://app.divoom-gz.com/Channel/GetDialType", payload={"ReturnCode": 0})
+                if retry:
+                    assert (await divoom.get_dial_type())["ReturnCode"] == 0
+                else:
+                    with pytest.raises(PixooConnectionError):
+                        await divoom.get_dial_type()
+                assert len(next(iter(mock.requests.values()))) == requests
+
+
+class _PagedCatalog:
+    """Handler serving a list in pages of 30, later pages answering first."""
+
+    def __init__(self, list_key: str, total: int, *, with_total: bool = True) -> None:
+        self.list_key = list_key
+        self.items = [{"Name": f"item {i}"} for i in range(total)]
+        self.with_total = with_total
+        self.running = 0
+        self.max_running = 0
+
+    async def __call__(self, _url: str, payload: Any) -> dict:  # noqa: ANN401
+        page = payload["Page"]
+        self.running += 1
+        self.max_running = max(self.max_running, self.running)
+        try:
+            await asyncio.sleep(0.05 / page)
+        finally:
+            self.running -= 1
+        response = {"ReturnCode": 0, self.list_key: self.items[(page - 1) * 30:page * 30]}
+        if self.with_total:
+            response["TotalNum"] = len(self.items)
+        return response
+
+
+@pytest.mark.asyncio
+async def test_iter_dial_list_fetches_pages_concurrently() -> None:
+    """Test that every dial is yielded in order, with the later pages fetched concurrently."""
+    catalog = _PagedCatalog("DialList", 200)
+    transport = MemoryTransport(catalog)
+    async with Divoom(transport=transport) as divoom:
+        items = [item async for item in divoom.iter_dial_list("Social", concurrency=4)]
+    assert items == catalog.items
+    assert len(transport.requests) == 7
+    assert catalog.max_running == 4
+    assert all(payload["DialType"] == "Social" for _, payload in transport.requests)
+
+
+@pytest.mark.asyncio
+async def test_iter_img_upload_list_without_total() -> None:
+    """Test that pages are fetched until one is not full when TotalNum is missing."""
+    catalog = _PagedCatalog("ImgList", 60, with_total=False)
+    transport = MemoryTransport(catalog)
+    async with Divoom(transport=transport) as divoom:
+        items = [item async for item in divoom.iter_img_upload_list(1, "aa:bb")]
+    assert items == catalog.items
+    assert [payload["Page"] for _, payload in transport.requests] == [1, 2, 3]
+
+
+@pytest.mark.asyncio
+async def test_iter_img_like_list_single_page() -> None:
+    """Test that a catalog fitting on one page takes one request."""
+    catalog = _PagedCatalog("ImgList", 12)
+    transport = MemoryTransport(catalog)
+    async with Divoom(transport=transport) as divoom:
+        items = [item async for item in divoom.iter_img_like_list(1, "aa:bb")]
+    assert items == catalog.items
+    assert len(transport.requests) == 1
+
+
+@pytest.mark.asyncio
+async def test_iter_pages_stopped_early_settles_prefetches() -> None:
+    """Test that no prefetched page is left running once an iteration is closed early or fails."""
+    release = asyncio.Event()
+
+    async def handler(_url: str, payload: Any) -> dict:  # noqa: ANN401
+        if payload["Page"] == 1:
+            return {"ReturnCode": 0, "TotalNum": 150, "DialList": [{"Name": "first"}]}
+        if payload["Page"] == 2:
+            raise aiohttp.ClientConnectionError
+        await release.wait()
+        return {"ReturnCode": 0, "DialList": []}
+
+    async with Divoom(transport=MemoryTransport(handler)) as divoom:
+        dials = divoom.iter_dial_list("Social")
+        assert await dials.__anext__() == {"Name": "first"}
+        await asyncio.sleep(0)
+        await dials.aclose()
+        assert asyncio.all_tasks() == {asyncio.current_task()}
+
+        with pytest.raises(PixooConnectionError):
+            [dial async for dial in divoom.iter_dial_list("Social")]
+        assert asyncio.all_tasks() == {asyncio.current_task()}
+
+
+class _SlowAfter:
+    """Handler answering quickly, except for the listed requests (counted from 0)."""
+
+    def __init__(self, slow: set[int], *, fail: set[int] | None = None) -> None:
+        self.slow = slow
+        self.fail = fail or set()
+        self.count = 0
+
+    async def __call__(self, _: str, __: Any) -> dict:  # noqa: ANN401
+        number = self.count
+        self.count += 1
+        await asyncio.sleep(0.5 if number in self.slow else 0.001)
+        if number in self.fail:
+            raise aiohttp.ClientConnectionError
+        return {"ReturnCode": 0, "Request": number}
+
+
+@pytest.mark.asyncio
+async def test_hedge_wins_slow_request() -> None:
+    """Test that a hedged request answers for an original stuck in the latency tail."""
+    handler = _SlowAfter({HEDGE_MIN_SAMPLES})
+    transport = MemoryTransport(handler)
+    async with Divoom(transport=transport, hedge_percentile=95) as divoom:
+        for _ in range(HEDGE_MIN_SAMPLES):
+            await divoom.get_font_list()
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        response = await divoom.get_font_list()
+        assert loop.time() - started < 0.25
+    assert response["Request"] == HEDGE_MIN_SAMPLES + 1
+    assert len(transport.requests) == HEDGE_MIN_SAMPLES + 2
+    stats = divoom.hedge_stats
+    assert (stats.requests, stats.fired, stats.won) == (HEDGE_MIN_SAMPLES + 1, 1, 1)
+
+
+@pytest.mark.asyncio
+async def test_hedge_failure_falls_back_to_original() -> None:
+    """Test that a failed hedge leaves the original request to answer."""
+    handler = _SlowAfter({HEDGE_MIN_SAMPLES}, fail={HEDGE_MIN_SAMPLES + 1})
+    async with Divoom(transport=MemoryTransport(handler), hedge_percentile=90) as divoom:
+        for _ in range(HEDGE_MIN_SAMPLES):
+            await divoom.get_dial_type()
+        response = await divoom.get_dial_type()
+    assert response["Request"] == HEDGE_MIN_SAMPLES
+    assert (divoom.hedge_stats.fired, divoom.hedge_stats.won) == (1, 0)
+
+
+@pytest.mark.asyncio
+async def test_hedging_is_opt_in() -> None:
+    """Test that requests are never duplicated without hedge_percentile, and Pixoo64 cannot hedge."""
+    handler = _SlowAfter({HEDGE_MIN_SAMPLES})
+    transport = MemoryTransport(handler)
+    async with Divoom(transport=transport) as divoom:
+        for _ in range(HEDGE_MIN_SAMPLES + 1):
+            await divoom.get_dial_type()
+    assert len(transport.requests) == HEDGE_MIN_SAMPLES + 1
+    assert divoom.hedge_stats.fired == 0
+    assert not hasattr(Pixoo64("192.168.1.100"), "hedge_percentile")
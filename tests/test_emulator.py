@@ -0,0 +1,102 @@
+# ruff: noqa: PLR2004, Magic value used in comparison
+# ruff: noqa: S101, Use of `assert` detected
+"""Unit tests for the Pixoo64 emulator, driven by real clients over local sockets."""
+
+from __future__ import annotations
+
+import asyncio
+import base64
+import time
+
+import pytest
+
+from aiopixooapi.commands import Command, FrameCommand
+from aiopixooapi.emulator import PixooEmulator
+from aiopixooapi.exceptions import PixooCommandError, PixooConnectionError
+from aiopixooapi.pixoo64 import ChannelSelectIndex
+
+
+def _frame(color: bytes, width: int) -> str:
+    return base64.b64encode(color * width * width).decode()
+
+
+@pytest.mark.asyncio
+async def test_settings_round_trip() -> None:
+    """Test that setters change what the getters report."""
+    async with PixooEmulator() as emulator, emulator.client() as pixoo:
+        await pixoo.set_brightness(42)
+        await pixoo.set_channel(ChannelSelectIndex.CUSTOM)
+        await pixoo.set_screen_rotation_angle(2)
+        settings = await pixoo.get_all_settings()
+        assert (settings["Brightness"], settings["GyrateAngle"]) == (42, 2)
+        assert (await pixoo.get_current_channel())["SelectIndex"] == 3
+        assert (await pixoo.get_clock_info())["Brightness"] == 42
+        await pixoo.set_system_time(1_000_000_000)
+        assert abs((await pixoo.get_device_time())["UTCTime"] - 1_000_000_000) <= 1
+        with pytest.raises(PixooCommandError):
+            await pixoo.send_command(Command("Device/Unknown"))
+    assert emulator.requests["Channel/SetBrightness"] == 1
+
+
+@pytest.mark.asyncio
+async def test_animation_framebuffer() -> None:
+    """Test that frames are decoded and scaled into the framebuffer once the animation is complete."""
+    async with PixooEmulator() as emulator, emulator.client() as pixoo:
+        assert (await pixoo.get_http_gif_id())["PicId"] == 1
+        await pixoo.send_animation_frame(2, 16, 0, 1, 100, _frame(b"\xff\x00\x00", 16))
+        assert emulator.pixel(0, 0) == (0, 0, 0)
+        await pixoo.send_animation_frame(2, 16, 1, 1, 100, _frame(b"\x00\x00\xff", 16))
+        assert emulator.pixel(0, 0) == emulator.pixel(63, 63) == (255, 0, 0)
+        assert len(emulator.frames) == 2
+        assert emulator.frames[1] == b"\x00\x00\xff" * 64 * 64
+        assert emulator.speed == 100
+        assert (await pixoo.get_http_gif_id())["PicId"] == 2
+
+        pixels = bytearray(64 * 64 * 3)
+        pixels[(5 * 64 + 7) * 3:(5 * 64 + 8) * 3] = b"\x01\x02\x03"
+        await pixoo.send_command(FrameCommand(1, 64, 0, 2, 50, pic_data=base64.b64encode(pixels).decode()))
+        assert emulator.pixel(7, 5) == (1, 2, 3)
+        assert emulator.pixel(0, 0) == (0, 0, 0)
+
+        with pytest.raises(PixooCommandError):
+            await pixoo.send_animation_frame(1, 32, 0, 3, 50, _frame(b"\x00\x00\x00", 16))
+
+
+@pytest.mark.asyncio
+async def test_command_list_and_text() -> None:
+    """Test that a command list is applied in order and texts are recorded."""
+    async with PixooEmulator() as emulator, emulator.client() as pixoo:
+        await pixoo.run_command_list([
+            {"Command": "Channel/SetBrightness", "Brightness": 10},
+            Command("Device/SetMirrorMode", {"Mode": 1}),
+        ])
+        await pixoo.send_text(4, 0, 20, 0, 2, 56, "hello", 100, "#FFFFFF")
+        assert (emulator.state["Brightness"], emulator.state["MirrorFlag"]) == (10, 1)
+        assert emulator.texts[4]["TextString"] == "hello"
+        await pixoo.clear_text()
+        assert emulator.texts == {}
+
+
+@pytest.mark.asyncio
+async def test_firmware_limits() -> None:
+    """Test that requests are processed one at a time, and refused beyond the pending limit."""
+    async with PixooEmulator(latency=0.05) as emulator, emulator.client() as pixoo:
+        started = time.monotonic()
+        await asyncio.gather(*(pixoo.get_all_settings() for _ in range(4)))
+        assert time.monotonic() - started >= 0.2
+        assert emulator.max_active == 1
+
+    async with PixooEmulator(latency=0.05, max_pending=1) as emulator, emulator.client() as pixoo:
+        results = await asyncio.gather(*(pixoo.get_all_settings() for _ in range(4)), return_exceptions=True)
+        refused = [result for result in results if isinstance(result, PixooConnectionError)]
+        assert len(refused) == 2
+
+
+@pytest.mark.asyncio
+async def test_bandwidth_ceiling() -> None:
+    """Test that request bodies are taken in at the configured rate."""
+    async with PixooEmulator(bandwidth=20000) as emulator, emulator.client() as pixoo:
+        started = time.monotonic()
+        await pixoo.send_animation_frame(1, 32, 0, 1, 100, _frame(b"\x10\x20\x30", 32))
+        assert time.monotonic() - started >= 0.2
+        assert emulator.pixel(10, 10) == (16, 32, 48)
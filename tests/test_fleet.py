@@ -0,0 +1,208 @@
+# ruff: noqa: PLR2004, Magic value used in comparison
+# ruff: noqa: S101, Use of `assert` detected
+"""Unit tests for the fleet manager."""
+
+from __future__ import annotations
+
+import asyncio
+from typing import TYPE_CHECKING, Any
+
+import aiohttp
+import pytest
+
+from aiopixooapi.commands import FrameCommand, TextCommand
+from aiopixooapi.exceptions import PixooConnectionError
+from aiopixooapi.fleet import PixooFleet
+from aiopixooapi.pixoo64 import Pixoo64
+from aiopixooapi.transport import MemoryTransport
+
+if TYPE_CHECKING:
+    from .conftest import VirtualClock
+
+HOSTS = [f"192.168.1.{i}" for i in range(1, 11)]
+
+
+class _SlowDevices:
+    """Handler answering after a per-host delay and tracking how many requests run at once."""
+
+    def __init__(self, delays: dict[str, float] | None = None, failing: tuple[str, ...] = ()) -> None:
+        self.delays = delays or {}
+        self.failing = failing
+        self.running = 0
+        self.max_running = 0
+
+    async def __call__(self, url: str, payload: Any) -> dict:  # noqa: ANN401
+        host = url.split("//", 1)[1].split(":", 1)[0]
+        self.running += 1
+        self.max_running = max(self.max_running, self.running)
+        try:
+            await asyncio.sleep(self.delays.get(host, 0.01))
+        finally:
+            self.running -= 1
+        if host in self.failing:
+            raise aiohttp.ClientConnectionError
+        return {"error_code": 0, "Host": host, "Payload": payload}
+
+
+@pytest.mark.asyncio
+async def test_broadcast_reaches_every_device() -> None:
+    """Test that a broadcast calls the method on every device over the shared transport."""
+    transport = MemoryTransport(_SlowDevices())
+    async with PixooFleet(HOSTS, transport=transport) as fleet:
+        results = [result async for result in fleet.broadcast("set_brightness", 50)]
+    assert sorted(result.host for result in results) == sorted(HOSTS)
+    assert all(result.ok for result in results)
+    assert all(payload == {"Brightness": 50, "Command": "Channel/SetBrightness"} for _, payload in transport.requests)
+
+
+@pytest.mark.asyncio
+async def test_concurrency_limit() -> None:
+    """Test that no more than the configured number of operations run at once."""
+    handler = _SlowDevices()
+    async with PixooFleet(HOSTS, concurrency=3, transport=MemoryTransport(handler)) as fleet:
+        results = await fleet.gather(lambda device: device.get_all_settings())
+    assert len(results) == len(HOSTS)
+    assert handler.max_running == 3
+
+
+@pytest.mark.asyncio
+async def test_results_in_completion_order() -> None:
+    """Test that results are yielded as devices answer."""
+    handler = _SlowDevices({"192.168.1.1": 0.1, "192.168.1.2": 0.05, "192.168.1.3": 0.01})
+    async with PixooFleet(HOSTS[:3], transport=MemoryTransport(handler)) as fleet:
+        order = [result.host async for result in fleet.broadcast("get_clock_info")]
+    assert order == ["192.168.1.3", "192.168.1.2", "192.168.1.1"]
+
+
+@pytest.mark.asyncio
+async def test_errors_are_isolated() -> None:
+    """Test that a failing device is reported without affecting the others."""
+    handler = _SlowDevices(failing=("192.168.1.2",))
+    async with PixooFleet(HOSTS[:3], transport=MemoryTransport(handler)) as fleet:
+        results = await fleet.gather(lambda device: device.set_brightness(10))
+    assert isinstance(results["192.168.1.2"].error, PixooConnectionError)
+    assert results["192.168.1.1"].ok
+    assert results["192.168.1.3"].result["Host"] == "192.168.1.3"
+
+
+@pytest.mark.asyncio
+async def test_subset_and_existing_clients() -> None:
+    """Test running on a subset of hosts, including a client added by the caller."""
+    transport = MemoryTransport(_SlowDevices())
+    own_client = Pixoo64("10.0.0.1", transport=transport)
+    async with PixooFleet(HOSTS[:2], transport=transport) as fleet:
+        fleet.add(own_client)
+        assert "10.0.0.1" in fleet
+        assert len(fleet) == 3
+        results = await fleet.gather(lambda device: device.sys_reboot(), hosts=["10.0.0.1"])
+    assert list(results) == ["10.0.0.1"]
+
+
+@pytest.mark.asyncio
+async def test_broadcast_takes_about_one_round_trip() -> None:
+    """Test that a broadcast to many devices takes close to one round trip."""
+    handler = _SlowDevices(dict.fromkeys(HOSTS, 0.05))
+    async with PixooFleet(HOSTS, transport=MemoryTransport(handler)) as fleet:
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        await fleet.gather(lambda device: device.set_brightness(10))
+        assert loop.time() - started < 0.05 * 3
+
+
+@pytest.mark.asyncio
+async def test_broadcast_command_patches_pic_ids() -> None:
+    """Test that a frame is sent to every device with its own PicID."""
+    transport = MemoryTransport(_SlowDevices())
+    command = FrameCommand(1, 64, 0, 1, 100, pic_data="base64data")
+    pic_ids = {host: index + 10 for index, host in enumerate(HOSTS)}
+    async with PixooFleet(HOSTS, transport=transport) as fleet:
+        results = [result async for result in fleet.broadcast_command(command, pic_ids=pic_ids)]
+    assert all(result.ok for result in results)
+    sent = {url.split("//", 1)[1].split(":", 1)[0]: payload for url, payload in transport.requests}
+    assert sent == {host: {**command.as_dict(), "PicID": pic_id} for host, pic_id in pic_ids.items()}
+
+
+@pytest.mark.asyncio
+async def test_broadcast_command_rejects_pic_id_for_other_commands() -> None:
+    """Test that a PicID cannot be patched into a command other than a frame."""
+    command = TextCommand(1, 0, 0, 0, 0, text_width=32, text_string="Hello", speed=100, color="#FF0000")
+    async with PixooFleet(HOSTS[:1], transport=MemoryTransport(_SlowDevices())) as fleet:
+        results = [result async for result in fleet.broadcast_command(command, pic_ids={HOSTS[0]: 2})]
+    assert isinstance(results[0].error, TypeError)
+
+
+@pytest.mark.asyncio
+async def test_snapshot_reads_every_device() -> None:
+    """Test that a snapshot holds the settings, channel and time of each device."""
+    transport = MemoryTransport(_SlowDevices())
+    async with PixooFleet(HOSTS[:3], transport=transport) as fleet:
+        results = [result async for result in fleet.snapshot()]
+    assert sorted(result.host for result in results) == sorted(HOSTS[:3])
+    snapshot = results[0].result
+    assert snapshot.settings["Payload"] == {"Command": "Channel/GetAllConf"}
+    assert snapshot.channel["Payload"] == {"Command": "Channel/GetIndex"}
+    assert snapshot.time["Payload"] == {"Command": "Device/GetDeviceTime"}
+    assert len(transport.requests) == 9
+
+
+@pytest.mark.asyncio
+async def test_snapshot_deadline_reports_stragglers() -> None:
+    """Test that devices missing the deadline are reported as timed out without waiting for them."""
+    handler = _SlowDevices(delays={HOSTS[0]: 5.0, HOSTS[1]: 5.0})
+    async with PixooFleet(HOSTS, transport=MemoryTransport(handler)) as fleet:
+        started = asyncio.get_running_loop().time()
+        results = [result async for result in fleet.snapshot(deadline=0.2)]
+        elapsed = asyncio.get_running_loop().time() - started
+    assert elapsed < 1.0
+    assert len(results) == len(HOSTS)
+    late = {result.host for result in results if isinstance(result.error, asyncio.TimeoutError)}
+    assert late == {HOSTS[0], HOSTS[1]}
+    assert all(result.ok for result in results if result.host not in late)
+    assert handler.running == 0
+
+
+@pytest.mark.asyncio
+async def test_play_synchronized_aligns_final_frames(virtual_clock: VirtualClock) -> None:
+    """Test that the final frame reaches devices with different latencies at the same time."""
+    delays = {HOSTS[0]: 0.01, HOSTS[1]: 0.08, HOSTS[2]: 0.2}
+    arrivals: dict[str, float] = {}
+
+    async def handler(url: str, payload: Any) -> dict:  # noqa: ANN401
+        host = url.split("//", 1)[1].split(":", 1)[0]
+        await virtual_clock.sleep(delays[host])
+        if payload["Command"] == "Draw/GetHttpGifId":
+            return {"error_code": 0, "PicId": 5}
+        if payload["PicOffset"] == payload["PicNum"] - 1:
+            arrivals[host] = virtual_clock.monotonic()
+        await virtual_clock.sleep(delays[host])
+        return {"error_code": 0}
+
+    frames = [FrameCommand(3, 64, offset, 1, 100, pic_data="base64data") for offset in range(3)]
+    transport = MemoryTransport(handler)
+    async with PixooFleet(HOSTS[:3], transport=transport) as fleet:
+        results = await fleet.play_synchronized(frames, clock=virtual_clock)
+    assert all(result.ok for result in results.values())
+    assert max(arrivals.values()) - min(arrivals.values()) == pytest.approx(0, abs=1e-6)
+    assert {payload.get("PicID") for _, payload in transport.requests} == {None, 5}
+
+
+@pytest.mark.asyncio
+async def test_play_synchronized_reports_failed_uploads() -> None:
+    """Test that a device failing during the upload is reported and not started."""
+    transport = MemoryTransport(_SlowDevices(failing=(HOSTS[1],)))
+    frames = [FrameCommand(2, 64, offset, 1, 100, pic_data="base64data") for offset in range(2)]
+    async with PixooFleet(HOSTS[:3], transport=transport) as fleet:
+        results = await fleet.play_synchronized(frames, pic_ids=dict.fromkeys(HOSTS[:3], 9))
+    assert isinstance(results[HOSTS[1]].error, PixooConnectionError)
+    assert results[HOSTS[0]].ok
+    assert results[HOSTS[2]].ok
+    assert len(transport.requests) == 5
+
+
+@pytest.mark.asyncio
+async def test_play_synchronized_rejects_incomplete_animation() -> None:
+    """Test that frames must form a complete animation."""
+    fleet = PixooFleet(HOSTS[:1], transport=MemoryTransport(_SlowDevices()))
+    frames = [FrameCommand(3, 64, offset, 1, 100, pic_data="base64data") for offset in range(2)]
+    with pytest.raises(ValueError, match="complete animation"):
+        await fleet.play_synchronized(frames)
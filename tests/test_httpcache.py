@@ -0,0 +1,126 @@
+# ruff: noqa: PLR2004, Magic value used in comparison
+# ruff: noqa: S101, Use of `assert` detected
+"""Unit tests for the Divoom response cache."""
+
+from __future__ import annotations
+
+import json
+from typing import Any
+
+import pytest
+from aioresponses import CallbackResult, aioresponses
+
+from aiopixooapi.divoom import Divoom
+from aiopixooapi.exceptions import PixooCommandError
+from aiopixooapi.httpcache import ResponseCache
+from aiopixooapi.transport import TransportResponse
+
+DIAL_TYPE_URL = "https://app.divoom-gz.com/Channel/GetDialType"
+DIAL_LIST_URL = "https://app.divoom-gz.com/Channel/GetDialList"
+
+
+class _Server:
+    """Callback answering with fixed headers and honouring If-None-Match."""
+
+    def __init__(self, headers: dict[str, str], payload: dict[str, Any] | None = None) -> None:
+        self.headers = headers
+        self.payload = payload or {"ReturnCode": 0, "DialTypeList": ["Social"]}
+        self.requests: list[dict[str, str]] = []
+
+    def __call__(self, _: Any, **kwargs: Any) -> CallbackResult:  # noqa: ANN401
+        request_headers = kwargs.get("headers") or {}
+        self.requests.append(dict(request_headers))
+        if "ETag" in self.headers and request_headers.get("If-None-Match") == self.headers["ETag"]:
+            return CallbackResult(status=304, headers=self.headers)
+        return CallbackResult(body=json.dumps(self.payload), headers=self.headers)
+
+
+@pytest.mark.asyncio
+async def test_max_age_serves_without_request() -> None:
+    """Test that a response with max-age is served from the cache while fresh."""
+    server = _Server({"Cache-Control": "max-age=60"})
+    cache = ResponseCache()
+    async with Divoom(cache=cache) as divoom:
+        with aioresponses() as mock:
+            mock.post(DIAL_TYPE_URL, callback=server, repeat=True)
+            first = await divoom.get_dial_type()
+            first["DialTypeList"].append("changed by the caller")
+            assert (await divoom.get_dial_type())["DialTypeList"] == ["Social"]
+    assert len(server.requests) == 1
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+@pytest.mark.asyncio
+async def test_etag_revalidation() -> None:
+    """Test that a stale response with an ETag is revalidated and reused on 304."""
+    server = _Server({"ETag": '"v1"', "Cache-Control": "no-cache"})
+    cache = ResponseCache()
+    async with Divoom(cache=cache) as divoom:
+        with aioresponses() as mock:
+            mock.post(DIAL_TYPE_URL, callback=server, repeat=True)
+            assert (await divoom.get_dial_type())["DialTypeList"] == ["Social"]
+            assert (await divoom.get_dial_type())["DialTypeList"] == ["Social"]
+    assert server.requests[0].get("If-None-Match") is None
+    assert server.requests[1]["If-None-Match"] == '"v1"'
+    assert (cache.revalidated, cache.misses) == (1, 1)
+
+
+@pytest.mark.asyncio
+async def test_endpoint_ttl_and_payload_keys() -> None:
+    """Test that per-endpoint TTLs apply without server freshness and that payloads are cached apart."""
+    server = _Server({}, {"ReturnCode": 0, "TotalNum": 1, "DialList": []})
+    cache = ResponseCache({"Channel/GetDialList": 60})
+    async with Divoom(cache=cache) as divoom:
+        with aioresponses() as mock:
+            mock.post(DIAL_LIST_URL, callback=server, repeat=True)
+            mock.post(DIAL_TYPE_URL, callback=_Server({}), repeat=True)
+            await divoom.get_dial_list("Social", 1)
+            await divoom.get_dial_list("Social", 1)
+            await divoom.get_dial_list("Social", 2)
+            await divoom.get_dial_type()
+            await divoom.get_dial_type()
+    assert len(server.requests) == 2
+    assert len(cache) == 2
+    assert cache.misses == 4
+
+
+@pytest.mark.asyncio
+async def test_shared_across_clients() -> None:
+    """Test that clients sharing a cache reuse each other's responses."""
+    server = _Server({"Cache-Control": "public, max-age=60"})
+    cache = ResponseCache()
+    with aioresponses() as mock:
+        mock.post(DIAL_TYPE_URL, callback=server, repeat=True)
+        async with Divoom(cache=cache) as first, Divoom(cache=cache) as second:
+            await first.get_dial_type()
+            await second.get_dial_type()
+    assert len(server.requests) == 1
+    assert ResponseCache.shared() is ResponseCache.shared()
+
+
+@pytest.mark.asyncio
+async def test_errors_and_no_store_are_not_cached() -> None:
+    """Test that API errors and no-store responses are never cached."""
+    cache = ResponseCache(default_ttl=60)
+    async with Divoom(cache=cache) as divoom:
+        with aioresponses() as mock:
+            mock.post(DIAL_TYPE_URL, callback=_Server({}, {"ReturnCode": 1, "ReturnMessage": "busy"}))
+            mock.post(DIAL_LIST_URL, callback=_Server({"Cache-Control": "no-store"}, {"ReturnCode": 0}))
+            await divoom.get_dial_type()
+            await divoom.get_dial_list("Social", 1)
+            mock.post(DIAL_TYPE_URL, payload={"error_code": 1})
+            with pytest.raises(PixooCommandError):
+                await divoom.get_dial_type()
+    assert len(cache) == 0
+
+
+def test_invalidate() -> None:
+    """Test that invalidate drops one endpoint or everything."""
+    cache = ResponseCache(default_ttl=60)
+    cache.store("a", b"", TransportResponse(200, {}, b"{}"))
+    cache.store("b", b"", TransportResponse(200, {}, b"{}"))
+    cache.invalidate("a")
+    assert cache.get("a", b"") is None
+    assert cache.get("b", b"") is not None
+    cache.invalidate()
+    assert len(cache) == 0
@@ -0,0 +1,108 @@
+# ruff: noqa: PLR2004, Magic value used in comparison
+# ruff: noqa: S101, Use of `assert` detected
+"""Unit tests for incremental JSON decoding."""
+
+from __future__ import annotations
+
+import json
+
+import pytest
+from aioresponses import aioresponses
+
+from aiopixooapi.divoom import Divoom
+from aiopixooapi.exceptions import PixooCommandError
+from aiopixooapi.jsonstream import ArrayItemParser
+from aiopixooapi.transport import MemoryTransport
+
+RESPONSE = {
+    "ReturnCode": 0,
+    "Meta": {"DialList": [0], "Note": "a [tricky], {value}"},
+    "DialList": [
+        {"ClockId": 1, "Name": 'quote " and backslash \\ and comma ,'},
+        {"ClockId": 2, "Name": "café ☃", "Tags": [[1, 2], {"a": "]"}]},
+        3,
+        "plain",
+        None,
+    ],
+    "TotalNum": 5,
+}
+
+
+def _parse(body: bytes, chunk_size: int) -> tuple[list, dict]:
+    parser = ArrayItemParser("DialList")
+    items = []
+    for start in range(0, len(body), chunk_size):
+        items.extend(parser.feed(body[start:start + chunk_size]))
+    return items, parser.close()
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 3, 7, 64, 100000])
+def test_items_across_chunk_boundaries(chunk_size: int) -> None:
+    """Test that items, strings, escapes and UTF-8 split across chunks decode exactly."""
+    body = json.dumps(RESPONSE, ensure_ascii=False).encode()
+    items, envelope = _parse(body, chunk_size)
+    assert items == RESPONSE["DialList"]
+    assert envelope == {**RESPONSE, "DialList": []}
+
+
+def test_whitespace_and_empty_array() -> None:
+    """Test pretty-printed responses and an empty array."""
+    items, envelope = _parse(json.dumps({"DialList": [], "TotalNum": 0}, indent=4).encode(), 5)
+    assert items == []
+    assert envelope == {"DialList": [], "TotalNum": 0}
+    items, _ = _parse(json.dumps({"DialList": [{"a": 1}, {"b": 2}]}, indent=2).encode(), 3)
+    assert items == [{"a": 1}, {"b": 2}]
+
+
+def test_buffer_bounded_by_one_item() -> None:
+    """Test that the parser keeps at most about one item buffered."""
+    dials = [{"ClockId": i, "Name": "x" * 200} for i in range(1000)]
+    body = json.dumps({"ReturnCode": 0, "DialList": dials}).encode()
+    parser = ArrayItemParser("DialList")
+    largest = 0
+    count = 0
+    for start in range(0, len(body), 512):
+        count += len(parser.feed(body[start:start + 512]))
+        largest = max(largest, len(parser._buffer))  # noqa: SLF001
+    assert count == 1000
+    assert largest < 2 * 512 + 300
+    assert parser.close() == {"ReturnCode": 0, "DialList": []}
+
+
+def test_incomplete_response() -> None:
+    """Test that a truncated response is reported on close."""
+    parser = ArrayItemParser("DialList")
+    assert parser.feed(b'{"DialList": [{"a": 1}, {"b"') == [{"a": 1}]
+    with pytest.raises(ValueError, match="Incomplete"):
+        parser.close()
+
+
+@pytest.mark.asyncio
+async def test_stream_dial_list_chunked() -> None:
+    """Test that stream_dial_list yields the dials of a response read in chunks."""
+    dials = [{"ClockId": i, "Name": f"dial {i}"} for i in range(30)]
+    async with Divoom() as divoom:
+        with aioresponses() as mock:
+            mock.post(
+                "https://app.divoom-gz.com/Channel/GetDialList",
+                body=json.dumps({"ReturnCode": 0, "TotalNum": 30, "DialList": dials}),
+            )
+            items = [dial async for dial in divoom.stream_dial_list("Social", 1)]
+    assert items == dials
+
+
+@pytest.mark.asyncio
+async def test_stream_over_transport_without_streaming() -> None:
+    """Test that transports without streaming support still stream, from one chunk, and errors are raised."""
+
+    def handler(url: str, payload: dict) -> dict:
+        if url.endswith("GetImgLikeList"):
+            return {"error_code": 1}
+        return {"ReturnCode": 0, "ImgList": [{"FileId": payload["Page"]}]}
+
+    async with Divoom(transport=MemoryTransport(handler)) as divoom:
+        assert [image async for image in divoom.stream_img_upload_list(1, "aa:bb", 4)] == [{"FileId": 4}]
+        with pytest.raises(PixooCommandError):
+            [image async for image in divoom.stream_img_like_list(1, "aa:bb")]
+        with pytest.raises(ValueError, match="DeviceMac"):
+            divoom.stream_img_like_list(1, "")
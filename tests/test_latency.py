@@ -0,0 +1,61 @@
+# ruff: noqa: PLR2004, Magic value used in comparison
+# ruff: noqa: S101, Use of `assert` detected
+"""Unit tests for the latency estimators."""
+
+import pytest
+
+from aiopixooapi.latency import LatencyTracker, RttEstimator
+
+
+def test_rtt_estimator_first_sample() -> None:
+    """Test that the first sample initializes SRTT and RTTVAR."""
+    estimator = RttEstimator()
+    assert estimator.rto is None
+    estimator.add_sample(0.1)
+    assert estimator.srtt == pytest.approx(0.1)
+    assert estimator.rttvar == pytest.approx(0.05)
+    assert estimator.rto == pytest.approx(0.3)
+
+
+def test_rtt_estimator_converges() -> None:
+    """Test that the estimate converges on a stable round-trip time."""
+    estimator = RttEstimator()
+    for _ in range(100):
+        estimator.add_sample(0.02)
+    assert estimator.srtt == pytest.approx(0.02)
+    assert estimator.rto == pytest.approx(0.03, abs=1e-3)
+
+
+def test_rtt_estimator_backoff() -> None:
+    """Test that timeouts double the derived timeout until the next sample."""
+    estimator = RttEstimator()
+    estimator.add_sample(0.1)
+    estimator.backoff()
+    estimator.backoff()
+    assert estimator.rto == pytest.approx(1.2)
+    estimator.add_sample(0.1)
+    assert estimator.rto < 0.3
+
+
+def test_latency_tracker_percentiles() -> None:
+    """Test nearest-rank percentiles of the samples."""
+    tracker = LatencyTracker()
+    assert tracker.percentile(95) is None
+    for latency in range(100, 0, -1):
+        tracker.add_sample(latency / 1000)
+    assert tracker.samples == 100
+    assert tracker.percentile(50) == pytest.approx(0.05)
+    assert tracker.percentile(95) == pytest.approx(0.095)
+    assert tracker.percentile(100) == pytest.approx(0.1)
+    assert tracker.percentile(0) == pytest.approx(0.001)
+
+
+def test_latency_tracker_window() -> None:
+    """Test that only the latest samples count once the window is full."""
+    tracker = LatencyTracker(window=10)
+    for _ in range(10):
+        tracker.add_sample(1.0)
+    for _ in range(10):
+        tracker.add_sample(0.1)
+    assert tracker.samples == 10
+    assert tracker.percentile(100) == pytest.approx(0.1)
@@ -0,0 +1,71 @@
+# ruff: noqa: PLR2004, Magic value used in comparison
+# ruff: noqa: S101, Use of `assert` detected
+"""Unit tests for the typed response models."""
+
+import pytest
+
+from aiopixooapi.models import AllSettings, Dial, DialListPage, FontList, ImageListPage, LocalDeviceList
+
+
+def test_all_settings() -> None:
+    """Test that settings keys map to attributes and missing keys read as None."""
+    settings = AllSettings.from_response({"error_code": 0, "Brightness": 100, "SingleGalleyTime": 5})
+    assert settings.brightness == 100
+    assert settings.single_gallery_time == 5
+    assert settings.mirror_flag is None
+
+
+def test_models_are_slotted() -> None:
+    """Test that models do not carry a per-instance dictionary."""
+    settings = AllSettings({"Brightness": 100})
+    assert not hasattr(settings, "__dict__")
+    with pytest.raises(AttributeError):
+        settings.unknown = 1
+
+
+def test_dial_list_is_decoded_lazily() -> None:
+    """Test that the dial list is decoded on first access and the raw list released."""
+    page = DialListPage({"TotalNum": 100, "DialList": [{"ClockId": 10, "Name": "Classic Digital Clock"}]})
+    assert page.total_num == 100
+    assert len(page) == 1
+    assert page._items is None  # noqa: SLF001
+    assert page.dials == (Dial({"ClockId": 10, "Name": "Classic Digital Clock"}),)
+    assert page.dials[0].name == "Classic Digital Clock"
+    assert page._raw_items is None  # noqa: SLF001
+    assert page.dials is page.dials
+    assert len(page) == 1
+
+
+def test_font_list() -> None:
+    """Test that fonts are decoded with their fields."""
+    fonts = FontList({"FontList": [{"id": 2, "name": "8*8", "width": "8", "high": "8", "charset": "", "type": 0}]})
+    assert fonts.fonts[0].id == 2
+    assert fonts.fonts[0].height == "8"
+
+
+def test_image_and_device_lists() -> None:
+    """Test that missing lists decode to empty tuples."""
+    assert ImageListPage({"ReturnCode": 0}).images == ()
+    devices = LocalDeviceList({"DeviceList": [{"DeviceName": "Pixoo64", "DevicePrivateIP": "192.168.1.100"}]})
+    assert devices.devices[0].device_private_ip == "192.168.1.100"
+
+
+def test_repr_and_equality() -> None:
+    """Test the model repr and field equality."""
+    dial = Dial({"ClockId": 10, "Name": "Clock"})
+    assert repr(dial) == "Dial(clock_id=10, name='Clock')"
+    assert dial == Dial({"ClockId": 10, "Name": "Clock"})
+    assert dial != Dial({"ClockId": 11, "Name": "Clock"})
+
+
+def test_list_equality_compares_items() -> None:
+    """Test that lists with the same fields but different items are not equal."""
+    fonts = FontList({"FontList": [{"id": 2, "name": "8*8"}]})
+    assert fonts == FontList({"FontList": [{"id": 2, "name": "8*8"}]})
+    assert fonts != FontList({"FontList": [{"id": 3, "name": "8*8"}]})
+    assert DialListPage({"TotalNum": 1, "DialList": [{"ClockId": 10}]}) != DialListPage(
+        {"TotalNum": 1, "DialList": [{"ClockId": 11}]},
+    )
+    assert repr(DialListPage({"TotalNum": 1, "DialList": [{"ClockId": 10, "Name": "Clock"}]})) == (
+        "DialListPage(total_num=1, dials=(Dial(clock_id=10, name='Clock'),))"
+    )
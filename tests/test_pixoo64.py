@@ -2,10 +2,25 @@
 # ruff: noqa: S101, Use of `assert` detected
 
 """Unit tests for the Pixoo64 device functionality."""
+import asyncio
+import json
+import re
+
+import aiohttp
 import pytest
 from aioresponses import aioresponses
+from aioresponses.core import RequestCall
+
+from aiopixooapi.base import BasePixoo
+from aiopixooapi.commands import Command, TextCommand
+from aiopixooapi.exceptions import PixooConnectionError
+from aiopixooapi.pixoo64 import ChannelSelectIndex, CloudChannelIndex, Pixoo64, PixooProfile, ProfileFieldResult
+from aiopixooapi.transport import MemoryTransport
 
-from aiopixooapi.pixoo64 import ChannelSelectIndex, CloudChannelIndex, Pixoo64
+
+def _sent_payload(call: RequestCall) -> dict:
+    """Return the JSON payload of a recorded request."""
+    return json.loads(call.kwargs["data"])
 
 
 @pytest.mark.asyncio
@@ -935,3 +950,343 @@ async def test_use_http_command_source_invalid() -> None:
     async with Pixoo64("192.168.1.100") as pixoo64:
         with pytest.raises(ValueError, match="CommandUrl must be provided."):
             await pixoo64.use_http_command_source("")
+
+
+@pytest.mark.asyncio
+async def test_track_state_skips_redundant_setter() -> None:
+    """Test that a tracked setter is only sent once for the same value."""
+    async with Pixoo64("192.168.1.100", track_state=True) as pixoo64:
+        with aioresponses() as mock:
+            mock.post(
+                "http://192.168.1.100:80/post",
+                payload={"error_code": 0},
+            )
+            await pixoo64.set_brightness(80)
+            response = await pixoo64.set_brightness(80)
+            assert response["error_code"] == 0
+            assert len(next(iter(mock.requests.values()))) == 1
+            assert pixoo64.state["Brightness"] == 80
+
+
+@pytest.mark.asyncio
+async def test_track_state_seeded_from_all_settings() -> None:
+    """Test that get_all_settings seeds the state used to skip setters."""
+    async with Pixoo64("192.168.1.100", track_state=True) as pixoo64:
+        with aioresponses() as mock:
+            mock.post(
+                "http://192.168.1.100:80/post",
+                payload={"error_code": 0, "Brightness": 50, "Time24Flag": 1, "MirrorFlag": 0},
+            )
+            await pixoo64.get_all_settings()
+            await pixoo64.set_brightness(50)
+            await pixoo64.set_hour_mode(1)
+            await pixoo64.set_mirror_mode(0)
+            assert len(next(iter(mock.requests.values()))) == 1
+
+
+@pytest.mark.asyncio
+async def test_track_state_sends_changed_value() -> None:
+    """Test that a tracked setter is sent when the value differs from the known state."""
+    async with Pixoo64("192.168.1.100", track_state=True) as pixoo64:
+        with aioresponses() as mock:
+            mock.post(
+                "http://192.168.1.100:80/post",
+                payload={"error_code": 0},
+                repeat=True,
+            )
+            await pixoo64.set_brightness(80)
+            await pixoo64.set_brightness(60)
+            assert len(next(iter(mock.requests.values()))) == 2
+            assert pixoo64.state["Brightness"] == 60
+
+
+@pytest.mark.asyncio
+async def test_track_state_discarded_by_command_list() -> None:
+    """Test that a setter is sent again after a command list, which may have changed the setting."""
+    async with Pixoo64("192.168.1.100", track_state=True) as pixoo64:
+        with aioresponses() as mock:
+            mock.post("http://192.168.1.100:80/post", payload={"error_code": 0}, repeat=True)
+            await pixoo64.set_brightness(80)
+            await pixoo64.run_command_list([{"Command": "Channel/SetBrightness", "Brightness": 20}])
+            assert pixoo64.state == {}
+            await pixoo64.set_brightness(80)
+            await pixoo64.send_command(Command("Channel/OnOffScreen", {"OnOff": 0}))
+            await pixoo64.set_brightness(80)
+            assert len(next(iter(mock.requests.values()))) == 5
+
+
+@pytest.mark.asyncio
+async def test_untracked_setter_always_sent() -> None:
+    """Test that setters are always sent when state tracking is disabled."""
+    async with Pixoo64("192.168.1.100") as pixoo64:
+        with aioresponses() as mock:
+            mock.post(
+                "http://192.168.1.100:80/post",
+                payload={"error_code": 0},
+                repeat=True,
+            )
+            await pixoo64.set_brightness(80)
+            await pixoo64.set_brightness(80)
+            assert len(next(iter(mock.requests.values()))) == 2
+
+
+@pytest.mark.asyncio
+async def test_resync() -> None:
+    """Test that resync replaces the known state with the device state."""
+    async with Pixoo64("192.168.1.100", track_state=True) as pixoo64:
+        with aioresponses() as mock:
+            mock.post("http://192.168.1.100:80/post", payload={"error_code": 0})
+            await pixoo64.set_white_balance(10, 20, 30)
+            mock.post("http://192.168.1.100:80/post", payload={"error_code": 0, "Brightness": 40})
+            mock.post("http://192.168.1.100:80/post", payload={"error_code": 0, "SelectIndex": 2})
+            state = await pixoo64.resync()
+            assert state == {"Brightness": 40, "SelectIndex": 2}
+
+
+@pytest.mark.asyncio
+async def test_apply_profile_batches_changes() -> None:
+    """Test that apply_profile sends only the changed fields in one command list."""
+    async with Pixoo64("192.168.1.100") as pixoo64:
+        with aioresponses() as mock:
+            mock.post(
+                "http://192.168.1.100:80/post",
+                payload={"error_code": 0, "Brightness": 80, "GyrateAngle": 0, "MirrorFlag": 0, "Time24Flag": 0},
+            )
+            mock.post("http://192.168.1.100:80/post", payload={"error_code": 0})
+            results = await pixoo64.apply_profile(
+                PixooProfile(brightness=80, rotation=2, mirror=0, hour_mode=1, time_zone="GMT+1"),
+            )
+            assert results == {
+                "brightness": ProfileFieldResult.UNCHANGED,
+                "rotation": ProfileFieldResult.APPLIED,
+                "mirror": ProfileFieldResult.UNCHANGED,
+                "hour_mode": ProfileFieldResult.APPLIED,
+                "time_zone": ProfileFieldResult.APPLIED,
+            }
+            requests = next(iter(mock.requests.values()))
+            assert len(requests) == 2
+            sent = _sent_payload(requests[1])
+            assert sent["Command"] == "Draw/CommandList"
+            assert [command["Command"] for command in sent["CommandList"]] == [
+                "Device/SetScreenRotationAngle",
+                "Device/SetTime24Flag",
+                "Sys/TimeZone",
+            ]
+            assert pixoo64.state["GyrateAngle"] == 2
+
+
+@pytest.mark.asyncio
+async def test_apply_profile_single_change() -> None:
+    """Test that a single changed field is sent as a plain command."""
+    async with Pixoo64("192.168.1.100") as pixoo64:
+        with aioresponses() as mock:
+            mock.post("http://192.168.1.100:80/post", payload={"error_code": 0, "Brightness": 10})
+            mock.post("http://192.168.1.100:80/post", payload={"error_code": 0})
+            results = await pixoo64.apply_profile(PixooProfile(brightness=90))
+            assert results == {"brightness": ProfileFieldResult.APPLIED}
+            requests = next(iter(mock.requests.values()))
+            sent = _sent_payload(requests[1])
+            assert sent == {"Brightness": 90, "Command": "Channel/SetBrightness"}
+
+
+@pytest.mark.asyncio
+async def test_apply_profile_failure() -> None:
+    """Test that a rejected batch marks the changed fields as failed."""
+    async with Pixoo64("192.168.1.100") as pixoo64:
+        with aioresponses() as mock:
+            mock.post("http://192.168.1.100:80/post", payload={"error_code": 0, "Brightness": 10})
+            mock.post("http://192.168.1.100:80/post", payload={"error_code": 1})
+            results = await pixoo64.apply_profile(PixooProfile(brightness=90, mirror=1))
+            assert results == {"brightness": ProfileFieldResult.FAILED, "mirror": ProfileFieldResult.FAILED}
+            assert pixoo64.state["Brightness"] == 10
+
+
+@pytest.mark.asyncio
+async def test_apply_profile_ignores_stale_state() -> None:
+    """Test that apply_profile sends write-only fields even when the remembered state matches."""
+    async with Pixoo64("192.168.1.100", track_state=True) as pixoo64:
+        with aioresponses() as mock:
+            mock.post("http://192.168.1.100:80/post", payload={"error_code": 0})
+            mock.post("http://192.168.1.100:80/post", payload={"error_code": 0, "Brightness": 80})
+            mock.post("http://192.168.1.100:80/post", payload={"error_code": 0})
+            await pixoo64.set_time_zone("GMT+1")
+            # The time zone may have been changed from elsewhere since it was last sent
+            results = await pixoo64.apply_profile(PixooProfile(brightness=80, time_zone="GMT+1"))
+            assert results == {
+                "brightness": ProfileFieldResult.UNCHANGED,
+                "time_zone": ProfileFieldResult.APPLIED,
+            }
+            requests = next(iter(mock.requests.values()))
+            assert _sent_payload(requests[2]) == {"TimeZoneValue": "GMT+1", "Command": "Sys/TimeZone"}
+
+
+def test_profile_invalid() -> None:
+    """Test that an invalid profile is rejected on construction."""
+    with pytest.raises(ValueError, match=re.escape("Invalid brightness value: 101. Must be between 0 and 100.")):
+        PixooProfile(brightness=101)
+    with pytest.raises(ValueError, match=re.escape("GValue must be between 0 and 100. Got: 200")):
+        PixooProfile(white_balance=(0, 200, 0))
+
+
+@pytest.mark.asyncio
+async def test_coalesced_setter_sends_latest_value() -> None:
+    """Test that a burst of coalesced setter calls sends only the latest value."""
+    async with Pixoo64("192.168.1.100", coalesce_interval=0.05) as pixoo64:
+        with aioresponses() as mock:
+            mock.post("http://192.168.1.100:80/post", payload={"error_code": 0}, repeat=True)
+            responses = await asyncio.gather(*(pixoo64.set_brightness(value) for value in (10, 20, 30)))
+            assert all(response["error_code"] == 0 for response in responses)
+            requests = next(iter(mock.requests.values()))
+            assert len(requests) == 1
+            assert _sent_payload(requests[0])["Brightness"] == 30
+            assert pixoo64.state["Brightness"] == 30
+
+
+@pytest.mark.asyncio
+async def test_timeout_profile_per_command() -> None:
+    """Test that a command uses its timeout profile and others use the default timeout."""
+    upload_timeout = aiohttp.ClientTimeout(total=30, sock_read=20)
+    async with Pixoo64("192.168.1.100", timeout=2, timeouts={"Draw/SendHttpGif": upload_timeout}) as pixoo64:
+        with aioresponses() as mock:
+            mock.post("http://192.168.1.100:80/post", payload={"error_code": 0}, repeat=True)
+            await pixoo64.send_animation_frame(1, 64, 0, 1, 100, "base64data")
+            await pixoo64.set_brightness(50)
+            requests = next(iter(mock.requests.values()))
+            assert requests[0].kwargs["timeout"] == upload_timeout
+            assert requests[1].kwargs["timeout"].total == 2
+
+
+@pytest.mark.asyncio
+async def test_adaptive_timeout() -> None:
+    """Test that adaptive timeouts follow the measured round-trip time."""
+    async with Pixoo64("192.168.1.100", adaptive_timeout=True) as pixoo64:
+        with aioresponses() as mock:
+            mock.post("http://192.168.1.100:80/post", payload={"error_code": 0}, repeat=True)
+            for _ in range(4):
+                await pixoo64.get_clock_info()
+            requests = next(iter(mock.requests.values()))
+            assert requests[0].kwargs["timeout"].total == 10
+            assert requests[3].kwargs["timeout"].total == pixoo64.min_timeout
+            assert pixoo64.rtt_estimators["Channel/GetClockInfo"].samples == 4
+
+
+@pytest.mark.asyncio
+async def test_retry_on_disconnect() -> None:
+    """Test that a request is retried once when the device dropped the connection."""
+    async with Pixoo64("192.168.1.100") as pixoo64:
+        with aioresponses() as mock:
+            mock.post("http://192.168.1.100:80/post", exception=aiohttp.ServerDisconnectedError())
+            mock.post("http://192.168.1.100:80/post", payload={"error_code": 0})
+            response = await pixoo64.set_brightness(50)
+            assert response["error_code"] == 0
+
+
+@pytest.mark.asyncio
+async def test_retry_on_disconnect_only_once() -> None:
+    """Test that a second disconnect is reported as a connection error."""
+    async with Pixoo64("192.168.1.100") as pixoo64:
+        with aioresponses() as mock:
+            mock.post("http://192.168.1.100:80/post", exception=aiohttp.ServerDisconnectedError(), repeat=True)
+            with pytest.raises(PixooConnectionError):
+                await pixoo64.set_brightness(50)
+            assert len(next(iter(mock.requests.values()))) == 2
+
+
+@pytest.mark.asyncio
+async def test_no_retry_on_disconnect_for_non_idempotent_command() -> None:
+    """Test that a command the device may have acted on is not replayed after a disconnect."""
+    async with Pixoo64("192.168.1.100") as pixoo64:
+        with aioresponses() as mock:
+            mock.post("http://192.168.1.100:80/post", exception=aiohttp.ServerDisconnectedError())
+            mock.post("http://192.168.1.100:80/post", payload={"error_code": 0})
+            with pytest.raises(PixooConnectionError):
+                await pixoo64.send_animation_frame(1, 64, 0, 1, 100, "base64data")
+            assert len(next(iter(mock.requests.values()))) == 1
+
+
+@pytest.mark.asyncio
+async def test_retry_on_disconnect_disabled() -> None:
+    """Test that disconnects are not retried when retrying is disabled."""
+    async with Pixoo64("192.168.1.100", retry_on_disconnect=False) as pixoo64:
+        with aioresponses() as mock:
+            mock.post("http://192.168.1.100:80/post", exception=aiohttp.ServerDisconnectedError())
+            mock.post("http://192.168.1.100:80/post", payload={"error_code": 0})
+            with pytest.raises(PixooConnectionError):
+                await pixoo64.set_brightness(50)
+
+
+@pytest.mark.asyncio
+async def test_warm_up_connections() -> None:
+    """Test that connect opens connections with concurrent pings."""
+    with aioresponses() as mock:
+        mock.post("http://192.168.1.100:80/post", payload={"error_code": 0, "Brightness": 70}, repeat=True)
+        async with Pixoo64("192.168.1.100", warm_up_connections=2) as pixoo64:
+            assert len(next(iter(mock.requests.values()))) == 2
+            assert pixoo64.state["Brightness"] == 70
+
+
+@pytest.mark.asyncio
+async def test_warm_up_failure_is_not_fatal() -> None:
+    """Test that an unreachable device does not make connect fail."""
+    with aioresponses() as mock:
+        mock.post("http://192.168.1.100:80/post", exception=aiohttp.ClientConnectionError())
+        async with Pixoo64("192.168.1.100") as pixoo64:
+            await pixoo64.connect(warm_up_connections=1)
+
+
+@pytest.mark.asyncio
+async def test_default_ping_opens_connection() -> None:
+    """Test that a client without its own ping warms up with a GET request to its base URL."""
+
+    class NoPing(BasePixoo):
+        pass
+
+    transport = MemoryTransport(lambda _url, _payload: {})
+    client = NoPing("http://192.168.1.100:80", transport=transport)
+    await client.connect(warm_up_connections=2)
+    assert await client.ping() == {}
+    assert [url for url, _ in transport.requests] == ["http://192.168.1.100:80"] * 3
+
+
+@pytest.mark.asyncio
+async def test_send_command() -> None:
+    """Test that a prebuilt command is sent with its cached body."""
+    command = TextCommand(1, 0, 0, 0, 1, text_width=32, text_string="Hello", speed=100, color="#FF0000")
+    async with Pixoo64("192.168.1.100") as pixoo64:
+        with aioresponses() as mock:
+            mock.post("http://192.168.1.100:80/post", payload={"error_code": 0}, repeat=True)
+            await pixoo64.send_command(command)
+            await pixoo64.send_command(command)
+            requests = next(iter(mock.requests.values()))
+            assert [call.kwargs["data"] for call in requests] == [command.body, command.body]
+
+
+@pytest.mark.asyncio
+async def test_run_command_list_with_commands() -> None:
+    """Test that prebuilt commands and dictionaries can be mixed in a command list."""
+    async with Pixoo64("192.168.1.100") as pixoo64:
+        with aioresponses() as mock:
+            mock.post("http://192.168.1.100:80/post", payload={"error_code": 0})
+            await pixoo64.run_command_list([
+                Command("Channel/SetBrightness", {"Brightness": 50}),
+                {"Command": "Draw/ClearHttpText"},
+            ])
+            sent = _sent_payload(next(iter(mock.requests.values()))[0])
+            assert sent == {
+                "CommandList": [
+                    {"Brightness": 50, "Command": "Channel/SetBrightness"},
+                    {"Command": "Draw/ClearHttpText"},
+                ],
+                "Command": "Draw/CommandList",
+            }
+
+
+@pytest.mark.asyncio
+async def test_display_list_payload_not_modified() -> None:
+    """Test that the caller's payload is not modified when a command is sent."""
+    item_list = [{"TextId": 1, "TextString": "Hello"}]
+    async with Pixoo64("192.168.1.100") as pixoo64:
+        with aioresponses() as mock:
+            mock.post("http://192.168.1.100:80/post", payload={"error_code": 0})
+            await pixoo64.send_display_list(item_list)
+    assert item_list == [{"TextId": 1, "TextString": "Hello"}]
@@ -0,0 +1,73 @@
+# ruff: noqa: PLR2004, Magic value used in comparison
+# ruff: noqa: S101, Use of `assert` detected
+"""Unit tests for the device registry."""
+
+from __future__ import annotations
+
+import pytest
+
+from aiopixooapi.registry import DeviceRegistry
+from aiopixooapi.transport import MemoryTransport
+
+
+def _registry() -> DeviceRegistry:
+    registry = DeviceRegistry(transport=MemoryTransport(lambda _url, _payload: {"error_code": 0}))
+    registry.add("192.168.1.1", location="hq", floor=1, group="lobby")
+    registry.add("192.168.1.2", location="hq", floor=2, group="lobby")
+    registry.add("192.168.1.3", 8080, location="hq", floor=2, group="office")
+    registry.add("192.168.2.1", location="branch", floor=1)
+    return registry
+
+
+def test_select_by_tags() -> None:
+    """Test that selection intersects the tags, with values compared as strings."""
+    registry = _registry()
+    assert registry.select(location="hq") == {"192.168.1.1", "192.168.1.2", "192.168.1.3"}
+    assert registry.select(location="hq", floor=2) == {"192.168.1.2", "192.168.1.3"}
+    assert registry.select(floor="1", group="lobby") == {"192.168.1.1"}
+    assert registry.select(location="nowhere", floor=1) == set()
+    assert len(registry.select()) == 4
+
+
+def test_readd_and_remove_update_index() -> None:
+    """Test that replacing and removing a device keeps the index consistent."""
+    registry = _registry()
+    registry.add("192.168.1.1", location="branch", floor=1)
+    assert registry.select(group="lobby") == {"192.168.1.2"}
+    assert registry.select(location="branch") == {"192.168.1.1", "192.168.2.1"}
+
+    registry.remove("192.168.2.1")
+    assert "192.168.2.1" not in registry
+    assert registry.select(location="branch") == {"192.168.1.1"}
+    assert len(registry) == 3
+
+
+def test_record_tags() -> None:
+    """Test that a record keeps its connection details and tags."""
+    record = _registry()["192.168.1.3"]
+    assert record.port == 8080
+    assert record.tag("floor") == "2"
+    assert record.tag("model") is None
+
+
+def test_handles_are_created_lazily() -> None:
+    """Test that a client is only created for an addressed device and then reused."""
+    registry = _registry()
+    assert not registry._handles  # noqa: SLF001
+    pixoo = registry.handle("192.168.1.3")
+    assert pixoo.base_url == "http://192.168.1.3:8080"
+    assert pixoo.transport is registry.transport
+    assert registry.handle("192.168.1.3") is pixoo
+    assert len(registry._handles) == 1  # noqa: SLF001
+
+
+@pytest.mark.asyncio
+async def test_fleet_of_selection() -> None:
+    """Test that a fleet built from a selection only reaches the matching devices."""
+    registry = _registry()
+    fleet = registry.fleet(location="hq", floor=2)
+    results = await fleet.gather(lambda pixoo: pixoo.set_brightness(10))
+    assert set(results) == {"192.168.1.2", "192.168.1.3"}
+    assert all(result.ok for result in results.values())
+    assert len(registry.transport.requests) == 2
+    await registry.close()
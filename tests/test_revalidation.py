@@ -0,0 +1,66 @@
+# ruff: noqa: S101, Use of `assert` detected
+"""Unit tests for the background revalidation bookkeeping."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+
+import pytest
+
+from aiopixooapi.exceptions import PixooCommandError
+from aiopixooapi.revalidation import Revalidations
+
+
+@pytest.mark.asyncio
+async def test_schedule_runs_once_per_key() -> None:
+    """Test that a key is not revalidated again while its revalidation is in progress."""
+    revalidations = Revalidations(logging.getLogger(__name__))
+    calls = []
+
+    async def revalidate() -> None:
+        calls.append(1)
+        await asyncio.sleep(0)
+
+    assert revalidations.schedule("key", revalidate)
+    assert not revalidations.schedule("key", revalidate)
+    assert "key" in revalidations
+    assert len(revalidations) == 1
+    await revalidations.join()
+    assert calls == [1]
+    assert "key" not in revalidations
+
+
+@pytest.mark.asyncio
+async def test_failure_is_logged(caplog: pytest.LogCaptureFixture) -> None:
+    """Test that a failed revalidation is logged and forgotten."""
+    revalidations = Revalidations(logging.getLogger(__name__))
+
+    async def revalidate() -> None:
+        msg = "Server busy"
+        raise PixooCommandError(msg)
+
+    revalidations.schedule("key", revalidate)
+    await revalidations.join()
+    assert "Failed to revalidate key: Server busy" in caplog.text
+    assert len(revalidations) == 0
+
+
+@pytest.mark.asyncio
+async def test_close_cancels_revalidations() -> None:
+    """Test that close cancels the revalidations in progress."""
+    revalidations = Revalidations(logging.getLogger(__name__))
+    cancelled = asyncio.Event()
+
+    async def revalidate() -> None:
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    revalidations.schedule("key", revalidate)
+    await asyncio.sleep(0)
+    await revalidations.close()
+    assert cancelled.is_set()
+    assert len(revalidations) == 0
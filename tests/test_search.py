@@ -0,0 +1,76 @@
+# ruff: noqa: PLR2004, Magic value used in comparison
+# ruff: noqa: S101, Use of `assert` detected
+"""Unit tests for the catalog search index."""
+
+from __future__ import annotations
+
+from aiopixooapi.search import CatalogIndex, tokenize
+
+
+def _index() -> CatalogIndex:
+    index = CatalogIndex()
+    index.add_dial_list("Social", {"DialList": [
+        {"ClockId": 1, "Name": "Big Clock"},
+        {"ClockId": 2, "Name": "Weather & Clock"},
+        {"ClockId": 3, "Name": "YouTube Subscribers"},
+    ]})
+    index.add_dial_list("Game", {"DialList": [{"ClockId": 4, "Name": "Clockwork Game"}]})
+    index.add_img_list({"ImgList": [{"FileId": "a", "FileName": "big cat"}]}, source="like")
+    return index
+
+
+def test_tokenize() -> None:
+    """Test that names are split into lowercase words."""
+    assert tokenize("Weather & Clock-2") == ["weather", "clock", "2"]
+
+
+def test_search_words_and_prefix() -> None:
+    """Test that every word must match and the last one matches as a prefix."""
+    index = _index()
+    assert [entry.id for entry in index.search("clock", prefix=False)] == [1, 2]
+    assert [entry.id for entry in index.search("clock")] == [1, 2, 4]
+    assert [entry.id for entry in index.search("big cl")] == [1]
+    assert [entry.id for entry in index.search("BIG")] == [1, "a"]
+    assert index.search("nothing") == []
+
+
+def test_search_filters_and_limit() -> None:
+    """Test filtering on dial type, kind and source, and limiting results."""
+    index = _index()
+    assert [entry.id for entry in index.search("clock", dial_type="Game")] == [4]
+    assert [entry.id for entry in index.search("big", kind="image")] == ["a"]
+    assert [entry.id for entry in index.search(source="like")] == ["a"]
+    assert [entry.id for entry in index.search(limit=2)] == [1, 2]
+    assert len(index.search(kind="dial")) == 4
+
+
+def test_incremental_update_replaces_entries() -> None:
+    """Test that re-adding an entry reindexes it and drops words no longer used."""
+    index = _index()
+    index.add_dial("Social", {"ClockId": 3, "Name": "Follower Count"})
+    assert index.search("youtube") == []
+    assert [entry.id for entry in index.search("follow")] == [3]
+    assert index.search("yo") == []
+    assert len(index) == 5
+
+
+def test_limit_returns_first_matches() -> None:
+    """Test that limited queries return the first matches in order, whichever way they are found."""
+    index = CatalogIndex()
+    for clock_id in range(200):
+        name = f"{'weather' if clock_id % 3 else 'news'} clock{clock_id % 7} dial"
+        index.add_dial("Game" if clock_id % 5 else "Social", {"ClockId": clock_id, "Name": name})
+    index.add_dial("Game", {"ClockId": 0, "Name": "weather clock3"})
+    queries = [
+        {"query": "clock"},
+        {"query": "clock3"},
+        {"query": "weather clo"},
+        {"query": "weather clock6", "dial_type": "Social"},
+        {"query": "news dial", "prefix": False},
+        {"query": "missing clo"},
+        {"dial_type": "Social"},
+    ]
+    for query in queries:
+        expected = [entry.id for entry in index.search(**query)]
+        for limit in (0, 1, 5, 1000):
+            assert [entry.id for entry in index.search(**query, limit=limit)] == expected[:limit]
@@ -0,0 +1,130 @@
+# ruff: noqa: PLR2004, Magic value used in comparison
+# ruff: noqa: S101, Use of `assert` detected
+"""Unit tests for the multi-process fleet."""
+
+from __future__ import annotations
+
+import base64
+import os
+from multiprocessing import shared_memory
+from typing import TYPE_CHECKING, Any
+
+import pytest
+from aiohttp import web
+
+from aiopixooapi.commands import FrameCommand
+from aiopixooapi.sharding import SHARED_MEMORY_THRESHOLD, HashRing, ShardedFleet
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator
+
+HOSTS = [f"127.0.0.{i}" for i in range(1, 9)]
+
+
+@pytest.fixture
+async def server() -> AsyncIterator[tuple[int, list]]:
+    """Run a local HTTP server standing in for every device; yield its port and received requests."""
+    received = []
+
+    async def post(request: web.Request) -> web.Response:
+        payload = await request.json()
+        host = request.transport.get_extra_info("sockname")[0]
+        received.append((host, payload))
+        if host == HOSTS[-1]:
+            return web.json_response({"error_code": 1})
+        return web.json_response({"error_code": 0, "Host": host})
+
+    app = web.Application(client_max_size=1024 * 1024)
+    app.router.add_post("/post", post)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "0.0.0.0", 0)  # noqa: S104, Devices are reached on several loopback addresses
+    try:
+        await site.start()
+        yield site._server.sockets[0].getsockname()[1], received  # noqa: SLF001
+    finally:
+        await runner.cleanup()
+
+
+def test_hash_ring_is_stable_and_balanced() -> None:
+    """Test that keys keep their node, spread evenly, and mostly stay put when a node is added."""
+    keys = [f"10.0.{i // 256}.{i % 256}" for i in range(4000)]
+    ring = HashRing(range(4))
+    assignment = {key: ring.node_for(key) for key in keys}
+    assert assignment == {key: HashRing(range(4)).node_for(key) for key in keys}
+    counts = [list(assignment.values()).count(node) for node in range(4)]
+    assert min(counts) > 600
+
+    grown = HashRing(range(5))
+    moved = [key for key in keys if grown.node_for(key) != assignment[key]]
+    assert all(grown.node_for(key) == 4 for key in moved)
+    assert len(moved) < 1200
+
+
+@pytest.mark.asyncio
+async def test_broadcast_across_workers(server: tuple[int, list]) -> None:
+    """Test that a method call reaches every device and results and metrics come back."""
+    port, received = server
+    async with ShardedFleet(HOSTS, workers=2, port=port, timeout=5) as fleet:
+        results = await fleet.gather("set_brightness", 40)
+        assert set(results) == set(HOSTS)
+        assert [host for host, result in results.items() if not result.ok] == [HOSTS[-1]]
+        assert results[HOSTS[0]].result == {"error_code": 0, "Host": HOSTS[0]}
+        assert sum(metrics.requests for metrics in fleet.metrics) == len(HOSTS)
+        assert sum(metrics.devices for metrics in fleet.metrics) == len(HOSTS)
+        assert sum(metrics.errors for metrics in fleet.metrics) == 1
+    assert sorted(host for host, _ in received) == sorted(HOSTS)
+    assert all(payload == {"Brightness": 40, "Command": "Channel/SetBrightness"} for _, payload in received)
+
+
+@pytest.mark.asyncio
+async def test_broadcast_frame_through_shared_memory(server: tuple[int, list]) -> None:
+    """Test that a large frame is sent to a subset of devices with per-device PicIDs."""
+    port, received = server
+    frame = FrameCommand(1, 64, 0, 1, 100, pic_data=base64.b64encode(os.urandom(64 * 64 * 3)).decode())
+    assert len(frame.body) >= SHARED_MEMORY_THRESHOLD
+    hosts = HOSTS[:4]
+    pic_ids = {host: index + 2 for index, host in enumerate(hosts)}
+    async with ShardedFleet(HOSTS, workers=2, port=port, timeout=5) as fleet:
+        results = [result async for result in fleet.broadcast_command(frame, hosts, pic_ids)]
+    assert all(result.ok for result in results)
+    assert dict(received) == {
+        host: {**frame.as_dict(), "PicID": pic_id} for host, pic_id in pic_ids.items()
+    }
+
+
+@pytest.mark.asyncio
+async def test_shared_memory_released_when_iteration_stops(
+        server: tuple[int, list],
+        monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Test that the shared memory of a frame is unlinked when the caller stops iterating early."""
+    port, _ = server
+    created = []
+
+    class RecordingSharedMemory(shared_memory.SharedMemory):
+        def __init__(self, *args: Any, **kwargs: Any) -> None:  # noqa: ANN401
+            super().__init__(*args, **kwargs)
+            created.append(self.name)
+
+    monkeypatch.setattr(shared_memory, "SharedMemory", RecordingSharedMemory)
+    frame = FrameCommand(1, 64, 0, 1, 100, pic_data=base64.b64encode(os.urandom(64 * 64 * 3)).decode())
+    async with ShardedFleet(HOSTS, workers=2, port=port, timeout=5) as fleet:
+        results = fleet.broadcast_command(frame)
+        async for _ in results:
+            break
+        await results.aclose()
+    monkeypatch.undo()
+    assert len(created) == 1
+    with pytest.raises(FileNotFoundError):
+        shared_memory.SharedMemory(created[0])
+
+
+@pytest.mark.asyncio
+async def test_worker_error_is_raised(server: tuple[int, list]) -> None:
+    """Test that a failing request on a worker is raised in the parent."""
+    port, _ = server
+    async with ShardedFleet(HOSTS[:2], workers=1, port=port) as fleet:
+        with pytest.raises(KeyError):
+            await fleet.gather("set_brightness", 40, hosts=["127.0.0.99"])
+        assert len(await fleet.gather("get_all_settings")) == 2
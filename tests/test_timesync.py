@@ -0,0 +1,75 @@
+# ruff: noqa: PLR2004, Magic value used in comparison
+# ruff: noqa: S101, Use of `assert` detected
+"""Unit tests for clock synchronization."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+import pytest
+
+from aiopixooapi.fleet import PixooFleet
+from aiopixooapi.pixoo64 import Pixoo64
+from aiopixooapi.timesync import measure_offset, sync_clock
+from aiopixooapi.transport import MemoryTransport
+
+if TYPE_CHECKING:
+    from .conftest import VirtualClock
+
+
+class _Clocks:
+    """Handler simulating device clocks with whole-second readings and a one-way delay per host."""
+
+    def __init__(self, clock: VirtualClock, offsets: dict[str, float], one_way: float = 0.02) -> None:
+        self.clock = clock
+        self.offsets = offsets
+        self.one_way = one_way
+
+    async def __call__(self, url: str, payload: Any) -> dict:  # noqa: ANN401
+        host = url.split("//", 1)[1].split(":", 1)[0]
+        await self.clock.sleep(self.one_way)
+        if payload["Command"] == "Device/SetUTC":
+            self.offsets[host] = payload["Utc"] - self.clock.time()
+            response = {"error_code": 0}
+        else:
+            response = {"error_code": 0, "UTCTime": int(self.clock.time() + self.offsets[host])}
+        await self.clock.sleep(self.one_way)
+        return response
+
+
+@pytest.mark.asyncio
+async def test_measure_offset(virtual_clock: VirtualClock) -> None:
+    """Test that the offset is found well below the one-second resolution of the device clock."""
+    clocks = _Clocks(virtual_clock, {"192.168.1.1": -42.6})
+    async with Pixoo64("192.168.1.1", transport=MemoryTransport(clocks)) as pixoo:
+        estimate = await measure_offset(pixoo, samples=4, clock=virtual_clock)
+    assert estimate.offset - estimate.uncertainty <= -42.6 <= estimate.offset + estimate.uncertainty
+    assert estimate.uncertainty < 0.5
+    assert estimate.rtt == pytest.approx(0.04)
+
+
+@pytest.mark.asyncio
+async def test_sync_clock_compensates_latency(virtual_clock: VirtualClock) -> None:
+    """Test that the clock is set so it reads the local time once the request has arrived."""
+    clocks = _Clocks(virtual_clock, {"192.168.1.1": 100.4}, one_way=0.05)
+    async with Pixoo64("192.168.1.1", transport=MemoryTransport(clocks)) as pixoo:
+        result = await sync_clock(pixoo, samples=2, clock=virtual_clock)
+    assert abs(result.before.offset - 100.4) <= result.before.uncertainty
+    assert clocks.offsets["192.168.1.1"] == pytest.approx(0, abs=1e-6)
+    assert abs(result.residual_skew) <= result.after.uncertainty
+
+
+@pytest.mark.asyncio
+async def test_fleet_sync_clocks(virtual_clock: VirtualClock) -> None:
+    """Test that every device of a fleet is synchronized concurrently."""
+    hosts = ["192.168.1.1", "192.168.1.2", "192.168.1.3"]
+    clocks = _Clocks(virtual_clock, {"192.168.1.1": 3.2, "192.168.1.2": -7.9, "192.168.1.3": 0.5})
+    async with PixooFleet(hosts, transport=MemoryTransport(clocks)) as fleet:
+        started = virtual_clock.monotonic()
+        results = {result.host: result async for result in fleet.sync_clocks(samples=2, clock=virtual_clock)}
+        elapsed = virtual_clock.monotonic() - started
+    assert set(results) == set(hosts)
+    assert all(result.ok for result in results.values())
+    assert all(offset == pytest.approx(0, abs=1e-6) for offset in clocks.offsets.values())
+    # Synchronizing the devices one after another would take about three times as long
+    assert elapsed < 3
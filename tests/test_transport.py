@@ -0,0 +1,238 @@
+# ruff: noqa: PLR2004, Magic value used in comparison
+# ruff: noqa: S101, Use of `assert` detected
+"""Unit tests for the transports."""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import re
+import socket
+import struct
+from typing import TYPE_CHECKING
+
+import aiohttp
+import pytest
+from aiohttp import web
+
+from aiopixooapi.exceptions import PixooConnectionError
+from aiopixooapi.pixoo64 import Pixoo64
+from aiopixooapi.transport import MemoryTransport, StaleConnectionError, StreamTransport, TransportResponse
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator
+
+TIMEOUT = aiohttp.ClientTimeout(total=5)
+_OK = b'HTTP/1.1 200 OK\r\nContent-Type: application/json\r\nContent-Length: 16\r\n\r\n{"error_code":0}'
+
+
+@contextlib.asynccontextmanager
+async def _raw_server(answered: int, *, reset: bool = False) -> AsyncIterator[tuple[int, list]]:
+    """Run a server answering the first requests of each connection, then dropping it on the next one.
+
+    Yields the port and the number of requests received per connection. With `reset`, the connection
+    is reset rather than closed.
+    """
+    received: list[int] = []
+
+    async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        received.append(0)
+        try:
+            while True:
+                head = await reader.readuntil(b"\r\n\r\n")
+                await reader.readexactly(int(re.search(rb"Content-Length: (\d+)", head)[1]))
+                received[-1] += 1
+                if received[-1] > answered:
+                    break
+                writer.write(_OK)
+                await writer.drain()
+        except asyncio.IncompleteReadError:
+            pass
+        if reset:
+            writer.get_extra_info("socket").setsockopt(socket.SOL_SOCKET, socket.SO_LINGER, struct.pack("ii", 1, 0))
+        writer.close()
+
+    server = await asyncio.start_server(handle, "127.0.0.1", 0)
+    try:
+        yield server.sockets[0].getsockname()[1], received
+    finally:
+        server.close()
+        await server.wait_closed()
+
+
+@pytest.fixture
+async def server() -> AsyncIterator[tuple[str, list]]:
+    """Run a local HTTP server standing in for a device; yield its base URL and received payloads."""
+    received = []
+
+    async def post(request: web.Request) -> web.StreamResponse:
+        payload = await request.json()
+        received.append((payload, request.transport.get_extra_info("peername")))
+        if payload.get("Command") == "Chunked":
+            response = web.StreamResponse()
+            response.enable_chunked_encoding()
+            await response.prepare(request)
+            await response.write(b'{"error_code":')
+            await response.write(b"0}")
+            await response.write_eof()
+            return response
+        if payload.get("Command") == "Fail":
+            raise web.HTTPInternalServerError
+        return web.json_response({"error_code": 0, "Echo": payload})
+
+    app = web.Application()
+    app.router.add_post("/post", post)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]  # noqa: SLF001
+    yield f"http://127.0.0.1:{port}", received
+    await runner.cleanup()
+
+
+@pytest.mark.asyncio
+async def test_stream_transport_post(server: tuple[str, list]) -> None:
+    """Test a request and response over the stream transport."""
+    base_url, _ = server
+    transport = StreamTransport()
+    response = await transport.post(f"{base_url}/post", b'{"Command":"Test"}', timeout=TIMEOUT)
+    assert response.status == 200
+    assert response.headers["Content-Type"].startswith("application/json")
+    assert b'"Echo"' in response.body
+    await transport.close()
+
+
+@pytest.mark.asyncio
+async def test_stream_transport_reuses_connection(server: tuple[str, list]) -> None:
+    """Test that consecutive requests reuse the same connection."""
+    base_url, received = server
+    transport = StreamTransport()
+    for _ in range(3):
+        await transport.post(f"{base_url}/post", b'{"Command":"Test"}', timeout=TIMEOUT)
+    assert len({peer for _, peer in received}) == 1
+    await transport.close()
+
+
+@pytest.mark.asyncio
+async def test_stream_transport_discards_idle_connection(server: tuple[str, list]) -> None:
+    """Test that connections idle for longer than the idle timeout are not reused."""
+    base_url, received = server
+    transport = StreamTransport(idle_timeout=0)
+    for _ in range(2):
+        await transport.post(f"{base_url}/post", b'{"Command":"Test"}', timeout=TIMEOUT)
+    assert len({peer for _, peer in received}) == 2
+    await transport.close()
+
+
+@pytest.mark.asyncio
+async def test_stream_transport_chunked(server: tuple[str, list]) -> None:
+    """Test that chunked responses are decoded."""
+    base_url, _ = server
+    transport = StreamTransport()
+    response = await transport.post(f"{base_url}/post", b'{"Command":"Chunked"}', timeout=TIMEOUT)
+    assert response.body == b'{"error_code":0}'
+    await transport.close()
+
+
+@pytest.mark.asyncio
+async def test_stream_transport_error_status(server: tuple[str, list]) -> None:
+    """Test that error statuses are raised like an aiohttp session with raise_for_status."""
+    base_url, _ = server
+    transport = StreamTransport()
+    with pytest.raises(aiohttp.ClientResponseError) as excinfo:
+        await transport.post(f"{base_url}/post", b'{"Command":"Fail"}', timeout=TIMEOUT)
+    assert excinfo.value.status == 500
+    await transport.close()
+
+
+@pytest.mark.asyncio
+async def test_stream_transport_connection_refused() -> None:
+    """Test that refused connections are raised as aiohttp connection errors."""
+    transport = StreamTransport()
+    with pytest.raises(aiohttp.ClientConnectionError):
+        await transport.post("http://127.0.0.1:1/post", b"{}", timeout=TIMEOUT)
+
+
+@pytest.mark.asyncio
+async def test_pixoo64_with_stream_transport(server: tuple[str, list]) -> None:
+    """Test that Pixoo64 works over the stream transport."""
+    base_url, received = server
+    port = int(base_url.rsplit(":", 1)[1])
+    async with Pixoo64("127.0.0.1", port, transport=StreamTransport()) as pixoo64:
+        response = await pixoo64.set_brightness(50)
+        assert response["Echo"] == {"Brightness": 50, "Command": "Channel/SetBrightness"}
+    assert len(received) == 1
+
+
+@pytest.mark.asyncio
+async def test_stale_connection_retried() -> None:
+    """Test that a command is sent again when a reused connection was closed before it arrived."""
+    async with _raw_server(1) as (port, received), Pixoo64(
+        "127.0.0.1", port, transport=StreamTransport(),
+    ) as pixoo64:
+        await pixoo64.clear_text()
+        response = await pixoo64.clear_text()
+        assert response == {"error_code": 0}
+    assert received == [2, 1]
+
+
+@pytest.mark.asyncio
+async def test_fresh_connection_disconnect_not_retried() -> None:
+    """Test that a command is not sent again when a new connection was closed after it was sent."""
+    async with _raw_server(0) as (port, received), Pixoo64(
+        "127.0.0.1", port, transport=StreamTransport(),
+    ) as pixoo64:
+        with pytest.raises(PixooConnectionError) as excinfo:
+            await pixoo64.clear_text()
+        assert isinstance(excinfo.value.__cause__, aiohttp.ServerDisconnectedError)
+        assert not isinstance(excinfo.value.__cause__, StaleConnectionError)
+    assert received == [1]
+
+
+@pytest.mark.asyncio
+async def test_connection_reset() -> None:
+    """Test that a reset connection is raised as a connection error, and retried if it was reused."""
+    async with _raw_server(1, reset=True) as (port, received), Pixoo64(
+        "127.0.0.1", port, transport=StreamTransport(),
+    ) as pixoo64:
+        await pixoo64.clear_text()
+        await pixoo64.clear_text()
+        assert received == [2, 1]
+
+    async with _raw_server(0, reset=True) as (port, received), Pixoo64(
+        "127.0.0.1", port, transport=StreamTransport(),
+    ) as pixoo64:
+        with pytest.raises(PixooConnectionError) as excinfo:
+            await pixoo64.set_brightness(50)
+        assert isinstance(excinfo.value.__cause__, aiohttp.ClientOSError)
+
+
+@pytest.mark.asyncio
+async def test_memory_transport() -> None:
+    """Test that the memory transport answers with the handler and records requests."""
+    transport = MemoryTransport(lambda _url, payload: {"error_code": 0, "Brightness": payload.get("Brightness")})
+    async with Pixoo64("192.168.1.100", transport=transport) as pixoo64:
+        response = await pixoo64.set_brightness(30)
+        assert response["Brightness"] == 30
+    assert transport.requests == [
+        ("http://192.168.1.100:80/post", {"Brightness": 30, "Command": "Channel/SetBrightness"}),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_memory_transport_error_status() -> None:
+    """Test that error statuses from the handler surface as connection errors."""
+    transport = MemoryTransport(lambda _url, _payload: TransportResponse(503, {}, b""))
+    async with Pixoo64("192.168.1.100", transport=transport) as pixoo64:
+        with pytest.raises(PixooConnectionError):
+            await pixoo64.get_all_settings()
+
+
+@pytest.mark.asyncio
+async def test_shared_transport_is_not_closed() -> None:
+    """Test that a transport given on construction outlives the client."""
+    transport = MemoryTransport(lambda _url, _payload: {"error_code": 0})
+    async with Pixoo64("192.168.1.100", transport=transport) as pixoo64:
+        await pixoo64.sys_reboot()
+    assert pixoo64.transport is transport
@@ -0,0 +1,135 @@
+# ruff: noqa: PLR2004, Magic value used in comparison
+# ruff: noqa: S101, Use of `assert` detected
+"""Unit tests for warm-start persistence."""
+
+from __future__ import annotations
+
+import asyncio
+from typing import TYPE_CHECKING, Any
+
+import pytest
+
+from aiopixooapi.fleet import PixooFleet
+from aiopixooapi.pixoo64 import Pixoo64
+from aiopixooapi.transport import MemoryTransport
+from aiopixooapi.warmstart import DeviceStateStore, WarmStart
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+HOSTS = ["10.0.0.1", "10.0.0.2", "10.0.0.3"]
+
+
+class _Devices:
+    """Handler answering the state reads, optionally after a delay, and failing for one host."""
+
+    def __init__(self, brightness: int = 60, delay: float = 0, failing: str | None = None) -> None:
+        self.brightness = brightness
+        self.delay = delay
+        self.failing = failing
+
+    async def __call__(self, url: str, payload: Any) -> dict:  # noqa: ANN401
+        await asyncio.sleep(self.delay)
+        if self.failing and self.failing in url:
+            return {"error_code": 1}
+        command = payload["Command"]
+        if command == "Channel/GetAllConf":
+            return {"error_code": 0, "Brightness": self.brightness, "RotationFlag": 1}
+        if command == "Channel/GetClockInfo":
+            return {"error_code": 0, "ClockId": 182, "Brightness": self.brightness}
+        if command == "Channel/GetIndex":
+            return {"error_code": 0, "SelectIndex": 3}
+        return {"error_code": 0}
+
+
+def _fleet(handler: _Devices) -> tuple[PixooFleet, MemoryTransport]:
+    transport = MemoryTransport(handler)
+    return PixooFleet((Pixoo64(host, transport=transport) for host in HOSTS), transport=transport), transport
+
+
+@pytest.mark.asyncio
+async def test_restart_serves_saved_state(tmp_path: Path) -> None:
+    """Test that a restarted fleet has its state and latency profile before any request."""
+    store = DeviceStateStore(tmp_path / "devices.db")
+    fleet, _ = _fleet(_Devices(brightness=60))
+    warm = WarmStart(store)
+    assert warm.restore(fleet) == 0
+    await warm.join()
+    store.close()
+
+    store = DeviceStateStore(tmp_path / "devices.db")
+    fleet, transport = _fleet(_Devices(brightness=80, delay=0.05))
+    warm = WarmStart(store)
+    assert warm.restore(fleet) == 3
+    pixoo = fleet["10.0.0.2"]
+    assert pixoo.state == {"Brightness": 60, "RotationFlag": 1, "CurClockId": 182, "SelectIndex": 3}
+    assert pixoo.rtt_estimators["Channel/GetAllConf"].samples == 1
+    assert transport.requests == []
+
+    await warm.join()
+    assert pixoo.state["Brightness"] == 80
+    assert store.get("10.0.0.2").state["Brightness"] == 80
+    assert store.get("10.0.0.2").latency["Channel/GetAllConf"].samples == 2
+
+
+@pytest.mark.asyncio
+async def test_write_only_settings_are_not_restored() -> None:
+    """Test that a setter the device cannot confirm is still sent after a warm start."""
+    store = DeviceStateStore()
+    transport = MemoryTransport(_Devices())
+    pixoo = Pixoo64(HOSTS[0], transport=transport, track_state=True)
+    await pixoo.set_brightness(40)
+    await pixoo.set_white_balance(100, 90, 80)
+    WarmStart(store).save([pixoo])
+    assert "RValue" not in store.get(HOSTS[0]).state
+
+    restarted = Pixoo64(HOSTS[0], transport=transport, track_state=True)
+    restarted.seed_state(pixoo.state)
+    assert restarted.state == {"Brightness": 40}
+    WarmStart(store).restore([restarted], revalidate=False)
+    transport.requests.clear()
+    await restarted.set_brightness(40)
+    await restarted.set_white_balance(100, 90, 80)
+    assert [payload["Command"] for _, payload in transport.requests] == ["Device/SetWhiteBalance"]
+
+
+@pytest.mark.asyncio
+async def test_fresh_devices_skip_revalidation() -> None:
+    """Test that devices saved within max_age are not read again."""
+    store = DeviceStateStore()
+    fleet, transport = _fleet(_Devices())
+    WarmStart(store).save(fleet)
+    warm = WarmStart(store, max_age=60)
+    assert warm.restore(fleet) == 3
+    await warm.join()
+    assert transport.requests == []
+
+
+@pytest.mark.asyncio
+async def test_revalidation_failures_and_concurrency() -> None:
+    """Test that a failing device keeps its saved state and revalidations respect the concurrency limit."""
+    store = DeviceStateStore()
+    fleet, transport = _fleet(_Devices(brightness=70))
+    fleet["10.0.0.3"].seed_state({"Brightness": 10})
+    WarmStart(store).save(fleet)
+
+    fleet, transport = _fleet(_Devices(brightness=90, delay=0.02, failing="10.0.0.3"))
+    warm = WarmStart(store, concurrency=1)
+    warm.restore(fleet)
+    await asyncio.sleep(0.03)
+    assert len(transport.requests) <= 2
+    await warm.join()
+    assert fleet["10.0.0.1"].state["Brightness"] == 90
+    assert fleet["10.0.0.3"].state == {"Brightness": 10}
+    assert store.get("10.0.0.3").state == {"Brightness": 10}
+
+
+@pytest.mark.asyncio
+async def test_close_cancels_revalidations() -> None:
+    """Test that close cancels revalidations in progress."""
+    fleet, _ = _fleet(_Devices(delay=10))
+    warm = WarmStart(DeviceStateStore())
+    warm.restore(fleet)
+    await asyncio.sleep(0)
+    await warm.close()
+    await warm.join()